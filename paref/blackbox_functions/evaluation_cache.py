@@ -0,0 +1,204 @@
+from typing import List, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from paref.blackbox_functions.evaluation_store import EvaluationStore
+
+
+class EvaluationCache:
+    """Cache of the evaluations of a blackbox function keyed on the inputs
+
+    A point is a duplicate of a cached input if they differ by at most tolerance in each component (i.e. in the
+    maximum norm). Duplicates are detected by a hash of the input quantized to a grid of width tolerance (a hit of the
+    hash is always a duplicate) and, if the hash misses, by a nearest neighbor query of a KD-tree of the cached inputs.
+    If the tolerance is zero, only exact duplicates are detected by the hash.
+
+    The KD-tree is rebuilt lazily, i.e. recently cached inputs are searched by brute force until their number
+    exceeds a quarter of the size of the tree.
+
+    Each cached evaluation remembers the index at which it is stored in the evaluations of the blackbox function.
+    Hence, a duplicate of an evaluation which is not stored anymore (e.g. since the evaluations were truncated) is
+    stored again (with the cached value) instead of being skipped.
+
+    Examples
+    --------
+    >>> cache = EvaluationCache(tolerance=1e-6)
+    >>> cache.add(np.zeros((1, 2)), np.ones((1, 3)))
+    >>> cache.lookup(np.array([[1e-7, 0], [1, 1]]))
+    [array([1., 1., 1.]), None]
+    >>> cache.hits, cache.misses
+    (1, 1)
+
+    """
+
+    def __init__(self, tolerance: float = 0., record_duplicates: bool = False):
+        """
+
+        Parameters
+        ----------
+        tolerance : float default 0.
+            maximal componentwise difference of duplicates
+
+        record_duplicates : bool default False
+            store an evaluation of the blackbox function whenever a duplicate is looked up (with the cached value)
+        """
+        if tolerance < 0:
+            raise ValueError(f'Tolerance must be non-negative! Tolerance is {tolerance}.')
+        self.tolerance = tolerance
+        self.record_duplicates = record_duplicates
+        self.hits = 0
+        self.misses = 0
+        self._keys = {}
+        self._x = []
+        self._y = []
+        self._store_indices = []
+        self._tree = None
+        self._tree_size = 0
+
+    def _key(self, x: np.ndarray) -> bytes:
+        if self.tolerance == 0:
+            return x.tobytes()
+        return np.floor(x / self.tolerance).astype(np.int64).tobytes()
+
+    def add(self, x: np.ndarray, y: np.ndarray, store_indices: Optional[np.ndarray] = None) -> None:
+        """Cache evaluations
+
+        Parameters
+        ----------
+        x : np.ndarray
+            inputs stored in 2-dimensional array with first dimension corresponding to the evaluations
+
+        y : np.ndarray
+            outputs with first dimension corresponding to the evaluations
+
+        store_indices : Optional[np.ndarray] default None
+            indices of the evaluations in the evaluations of the blackbox function (None: not stored)
+
+        """
+        x = np.asarray(x, dtype=float)
+        if store_indices is None:
+            store_indices = [None] * len(x)
+        for point, value, store_index in zip(x, np.asarray(y), store_indices):
+            self._keys.setdefault(self._key(point), len(self._x))
+            self._x.append(point.copy())
+            self._y.append(np.array(value))
+            self._store_indices.append(store_index)
+
+    def _nearest(self, point: np.ndarray) -> Optional[int]:
+        # index of a cached input within the tolerance of the point (None if there is none)
+        index = self._keys.get(self._key(point))
+        if index is not None or self.tolerance == 0:
+            return index
+
+        if len(self._x) - self._tree_size > max(self._tree_size // 4, 32):
+            self._tree, self._tree_size = cKDTree(np.array(self._x)), len(self._x)
+        if self._tree is not None:
+            # the upper bound of the query is strict, whereas the tolerance is inclusive (as for the recent inputs)
+            distance, index = self._tree.query(point, p=np.inf,
+                                               distance_upper_bound=np.nextafter(self.tolerance, np.inf))
+            if np.isfinite(distance):
+                return int(index)
+        recent = np.array(self._x[self._tree_size:]).reshape(-1, len(point))
+        distances = np.max(np.abs(recent - point), axis=1, initial=0.)
+        if len(recent) != 0 and np.min(distances) <= self.tolerance:
+            return self._tree_size + int(np.argmin(distances))
+        return None
+
+    def lookup_entries(self, x: np.ndarray) -> List[Optional[int]]:
+        """Cached entries of points and count hits and misses
+
+        Parameters
+        ----------
+        x : np.ndarray
+            points stored in 2-dimensional array with first dimension corresponding to the points
+
+        Returns
+        -------
+        List[Optional[int]]
+            entry of each point (None if the point is not a duplicate of a cached input)
+
+        """
+        entries = [self._nearest(point) for point in np.asarray(x, dtype=float)]
+        number_hits = sum(entry is not None for entry in entries)
+        self.hits += number_hits
+        self.misses += len(entries) - number_hits
+        return entries
+
+    def lookup(self, x: np.ndarray) -> List[Optional[np.ndarray]]:
+        """Cached values of points and count hits and misses
+
+        Parameters
+        ----------
+        x : np.ndarray
+            points stored in 2-dimensional array with first dimension corresponding to the points
+
+        Returns
+        -------
+        List[Optional[np.ndarray]]
+            cached value of each point (None if the point is not a duplicate of a cached input)
+
+        """
+        return [None if entry is None else self.value(entry) for entry in self.lookup_entries(x)]
+
+    def value(self, entry: int) -> np.ndarray:
+        """Cached value of an entry
+
+        Parameters
+        ----------
+        entry : int
+            entry returned by lookup_entries
+
+        Returns
+        -------
+        np.ndarray
+            copy of the cached value
+
+        """
+        return self._y[entry].copy()
+
+    def is_stored(self, entry: int, evaluations: EvaluationStore) -> bool:
+        """Check if the evaluation of an entry is (still) stored in the evaluations of the blackbox function
+
+        Parameters
+        ----------
+        entry : int
+            entry returned by lookup_entries
+
+        evaluations : EvaluationStore
+            evaluations of the blackbox function
+
+        Returns
+        -------
+        bool
+            true if the evaluation is stored at the remembered index
+
+        """
+        index = self._store_indices[entry]
+        return (index is not None and index < len(evaluations)
+                and np.array_equal(np.reshape(evaluations.x[index], -1), self._x[entry]))
+
+    def set_store_index(self, entry: int, index: int) -> None:
+        """Remember the index at which the evaluation of an entry is stored
+
+        Parameters
+        ----------
+        entry : int
+            entry returned by lookup_entries
+
+        index : int
+            index of the evaluation in the evaluations of the blackbox function
+
+        """
+        self._store_indices[entry] = index
+
+    def clear(self) -> None:
+        """Clear the cache and reset the counters
+        """
+        self.__init__(tolerance=self.tolerance, record_duplicates=self.record_duplicates)
+
+    def __len__(self) -> int:
+        return len(self._x)
+
+    def __repr__(self) -> str:
+        return f'EvaluationCache(number_evaluations={len(self)}, hits={self.hits}, misses={self.misses})'
@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+_MAGIC = b'PAREFEJ1'
+_HEADER_SIZE = len(_MAGIC) + 2 * 8
+_DTYPE = np.dtype('<f8')
+
+
+class EvaluationJournal:
+    """Append-only binary log of the evaluations of a blackbox function on disk
+
+    Each evaluation is appended as a record of the (flattened) input and output in double precision to a binary file
+    with a small header (a magic number and the dimensions of the inputs and outputs). Hence, the evaluations can be
+    loaded by memory-mapping the file instead of reading it.
+
+    Every record is passed to the operating system immediately, i.e. the evaluations survive a crash of the process.
+    In order to survive a crash of the machine as well, the file is synchronized to the disk (fsync) after sync_every
+    records or if the last synchronization is more than sync_interval seconds ago, whatever comes first.
+
+    If the process crashed while a record was written, the incomplete record is discarded when the journal is read or
+    reopened.
+
+    Examples
+    --------
+    >>> with EvaluationJournal('evaluations.journal', sync_every=1) as journal:
+    >>>     journal.append(np.zeros(2), np.ones(3))
+    >>> x, y = EvaluationJournal.read('evaluations.journal')
+
+    """
+
+    def __init__(self, path: str, sync_every: int = 64, sync_interval: Optional[float] = 1.):
+        """
+
+        Parameters
+        ----------
+        path : str
+            path to the journal file (the records are appended if the file exists)
+
+        sync_every : int default 64
+            maximum number of records written without synchronizing the file to the disk
+
+        sync_interval : Optional[float] default 1.
+            a record is synchronized immediately if the last synchronization is more than sync_interval seconds ago
+            (None: synchronize by the number of records only)
+        """
+        if sync_every < 1:
+            raise ValueError(f'sync_every must be at least 1! sync_every is {sync_every}.')
+        self._path = path
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._dimensions, self._length = self._read_header(path)
+        if os.path.exists(path):
+            # discard an incomplete header or record (written during a crash)
+            os.truncate(path, 0 if self._dimensions is None else _HEADER_SIZE + self._length * self._record_size)
+        self._file = open(path, 'ab')
+        self._number_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @staticmethod
+    def _read_header(path: str) -> Tuple[Optional[Tuple[int, int]], int]:
+        # dimensions of inputs and outputs (None if no header was written yet) and number of complete records
+        if not os.path.exists(path) or os.path.getsize(path) < _HEADER_SIZE:
+            return None, 0
+        with open(path, 'rb') as file:
+            header = file.read(_HEADER_SIZE)
+        if header[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f'{path} is not an evaluation journal!')
+        dimensions = tuple(int(d) for d in np.frombuffer(header[len(_MAGIC):], dtype='<u8'))
+        record_size = sum(dimensions) * _DTYPE.itemsize
+        return dimensions, (os.path.getsize(path) - _HEADER_SIZE) // record_size
+
+    @property
+    def _record_size(self) -> int:
+        return sum(self._dimensions) * _DTYPE.itemsize
+
+    @classmethod
+    def read(cls, path: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Memory-map the evaluations of a journal
+
+        Parameters
+        ----------
+        path : str
+            path to the journal file
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            read-only arrays (memory-mapped) of the inputs and outputs with first dimension corresponding to the
+            evaluations
+
+        """
+        dimensions, length = cls._read_header(path)
+        if dimensions is None:
+            raise ValueError(f'Journal {path} does not contain any evaluation!')
+        if length == 0:
+            return np.empty((0, dimensions[0])), np.empty((0, dimensions[1]))
+        records = np.memmap(path, dtype=_DTYPE, mode='r', offset=_HEADER_SIZE, shape=(length, sum(dimensions)))
+        return records[:, :dimensions[0]], records[:, dimensions[0]:]
+
+    @staticmethod
+    def is_journal(path: str) -> bool:
+        """Check if a file is an evaluation journal
+
+        Parameters
+        ----------
+        path : str
+            path to file
+
+        Returns
+        -------
+        bool
+            true if the file starts with the header of a journal
+
+        """
+        with open(path, 'rb') as file:
+            return file.read(len(_MAGIC)) == _MAGIC
+
+    def append(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Append a single evaluation
+
+        Parameters
+        ----------
+        x : np.ndarray
+            input of the evaluation
+
+        y : np.ndarray
+            output of the blackbox function at the input
+
+        """
+        self.extend(np.reshape(x, (1, -1)), np.reshape(y, (1, -1)))
+
+    def extend(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Append several evaluations
+
+        Parameters
+        ----------
+        x : np.ndarray
+            inputs with first dimension corresponding to the evaluations
+
+        y : np.ndarray
+            outputs with first dimension corresponding to the evaluations
+
+        """
+        x, y = np.asarray(x, dtype=_DTYPE).reshape(len(x), -1), np.asarray(y, dtype=_DTYPE).reshape(len(y), -1)
+        if len(x) == 0:
+            return
+        with self._lock:
+            if self._dimensions is None:
+                self._dimensions = (x.shape[1], y.shape[1])
+                self._file.write(_MAGIC + np.array(self._dimensions, dtype='<u8').tobytes())
+            elif (x.shape[1], y.shape[1]) != self._dimensions:
+                raise ValueError(f'Dimensions of inputs and outputs ({x.shape[1]}, {y.shape[1]}) do not match the '
+                                 f'dimensions of the journal {self._dimensions}!')
+            self._file.write(np.concatenate((x, y), axis=1).tobytes())
+            self._file.flush()
+            self._length += len(x)
+            self._number_unsynced += len(x)
+            if (self._number_unsynced >= self._sync_every
+                    or (self._sync_interval is not None and time.monotonic() - self._last_sync >= self._sync_interval)):
+                self.sync()
+
+    def truncate(self, length: int) -> None:
+        """Discard all evaluations after the first ``length`` ones
+
+        Parameters
+        ----------
+        length : int
+            number of evaluations to keep
+
+        """
+        with self._lock:
+            length = min(max(int(length), 0), self._length)
+            if length == self._length:
+                return
+            self._file.flush()
+            self._file.truncate(_HEADER_SIZE + length * self._record_size)
+            self._length = length
+            self.sync()
+
+    def sync(self) -> None:
+        """Synchronize the file to the disk
+        """
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._number_unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Synchronize and close the file
+        """
+        with self._lock:
+            if not self._file.closed:
+                self.sync()
+                self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __enter__(self) -> 'EvaluationJournal':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f'EvaluationJournal(path={self._path!r}, number_evaluations={self._length})'
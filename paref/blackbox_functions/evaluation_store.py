@@ -0,0 +1,490 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from paref.pareto_dominance.pareto_archive import ParetoArchive
+
+
+class EvaluationStore:
+    """Columnar storage for the evaluations of a blackbox function
+
+    The inputs and outputs of all evaluations are stored in two preallocated, contiguous numpy arrays which grow
+    geometrically whenever their capacity is exhausted. Appending an evaluation is therefore amortized O(1) and
+    the arrays of inputs and outputs can be accessed as (read-only) views without copying.
+
+    For backward compatibility, the store behaves like the list of evaluations used before, i.e. each element is of
+    the form [input,value of blackbox function at input].
+
+    In addition, the store keeps an incrementally updated
+    :py:class:`Pareto archive <paref.pareto_dominance.pareto_archive.ParetoArchive>` of the outputs, such that the
+    Pareto front of the evaluations can be read in O(|Pareto front|).
+
+    Storing and discarding evaluations is thread-safe, i.e. a blackbox function can be evaluated by several threads
+    in parallel.
+
+    The outputs mapped by a Pareto reflection (e.g. the evaluations of a composition of the blackbox function with a
+    Pareto reflection) are computed lazily by :meth:`reflected
+    <paref.blackbox_functions.evaluation_store.EvaluationStore.reflected>` and cached for each Pareto reflection.
+
+    Each evaluation can be tagged (e.g. by 'search' or 'proposal') in order to distinguish evaluations of different
+    origin. Untagged evaluations have the tag None.
+
+    Examples
+    --------
+    >>> store = EvaluationStore()
+    >>> store.append(np.zeros(2), np.ones(3))
+    >>> store.y
+    array([[1., 1., 1.]])
+    >>> x, y = store[-1]
+
+    """
+
+    # number of Pareto reflections whose mapped outputs are cached
+    _maximal_number_reflected = 16
+
+    def __init__(self, initial_capacity: int = 64):
+        """
+
+        Parameters
+        ----------
+        initial_capacity : int default 64
+            number of evaluations for which memory is allocated when the first evaluation is stored
+        """
+        self._initial_capacity = max(int(initial_capacity), 1)
+        self._x = None
+        self._y = None
+        self._tags = None
+        self._size = 0
+        self._pareto_archive = ParetoArchive()
+        self._pareto_archive_is_valid = True
+        self._lock = threading.RLock()
+        self._version = 0
+        self._number_rewrites = 0
+        self._reflected = OrderedDict()
+
+    def __getstate__(self) -> dict:
+        # the lock can not be pickled (and the Pareto reflections of the cache need not be picklable)
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_reflected'] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_arrays(cls, x: np.ndarray, y: np.ndarray, tags: Optional[Sequence] = None) -> 'EvaluationStore':
+        """Initialize a store from arrays of inputs and outputs
+
+        Parameters
+        ----------
+        x : np.ndarray
+            inputs with first dimension corresponding to the evaluations
+
+        y : np.ndarray
+            outputs with first dimension corresponding to the evaluations
+
+        tags : Optional[Sequence] default None
+            tag of each evaluation (None: untagged)
+
+        Returns
+        -------
+        EvaluationStore
+            store containing the evaluations
+
+        """
+        store = cls(initial_capacity=len(x))
+        store.extend(x, y, tags)
+        return store
+
+    @classmethod
+    def from_list(cls, evaluations: List) -> 'EvaluationStore':
+        """Initialize a store from a list of evaluations
+
+        Parameters
+        ----------
+        evaluations : List
+            list of evaluations, each of the form [input,value of blackbox function at input]
+
+        Returns
+        -------
+        EvaluationStore
+            store containing the evaluations
+
+        """
+        if isinstance(evaluations, EvaluationStore):
+            return evaluations.copy()
+
+        store = cls(initial_capacity=len(evaluations))
+        for x, y in evaluations:
+            store.append(x, y)
+        return store
+
+    def _allocate(self, x: np.ndarray, y: np.ndarray, capacity: int) -> None:
+        self._x = np.empty((capacity,) + x.shape, dtype=np.result_type(x, float))
+        self._y = np.empty((capacity,) + y.shape, dtype=np.result_type(y, float))
+        self._tags = np.full(capacity, None, dtype=object)
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._x):
+            return
+        new_capacity = max(capacity, 2 * len(self._x))
+        x = np.empty((new_capacity,) + self._x.shape[1:], dtype=self._x.dtype)
+        y = np.empty((new_capacity,) + self._y.shape[1:], dtype=self._y.dtype)
+        tags = np.full(new_capacity, None, dtype=object)
+        x[:self._size] = self._x[:self._size]
+        y[:self._size] = self._y[:self._size]
+        tags[:self._size] = self._tags[:self._size]
+        self._x, self._y, self._tags = x, y, tags
+
+    def append(self,
+               x: Union[np.ndarray, list],
+               y: Optional[Union[np.ndarray, float]] = None,
+               tag: Optional[str] = None, ) -> None:
+        """Store a single evaluation
+
+        .. note::
+            As for the list of evaluations, an evaluation of the form [input,value of blackbox function at input]
+            can be passed as single argument.
+
+        Parameters
+        ----------
+        x : Union[np.ndarray, list]
+            input of the evaluation
+
+        y : Optional[Union[np.ndarray, float]]
+            output of the blackbox function at the input
+
+        tag : Optional[str] default None
+            tag of the evaluation
+
+        """
+        if y is None:
+            x, y = x
+        x, y = np.asarray(x), np.asarray(y)
+        with self._lock:
+            if self._x is None:
+                self._allocate(x, y, self._initial_capacity)
+            self._reserve(self._size + 1)
+            self._x[self._size] = x
+            self._y[self._size] = y
+            self._tags[self._size] = tag
+            self._size += 1
+            self._version += 1
+            if self._pareto_archive_is_valid:
+                self._pareto_archive.add(self._size - 1, self._y[self._size - 1])
+
+    def extend(self, x: np.ndarray, y: np.ndarray, tags: Optional[Union[str, Sequence]] = None) -> None:
+        """Store several evaluations at once
+
+        Parameters
+        ----------
+        x : np.ndarray
+            inputs with first dimension corresponding to the evaluations
+
+        y : np.ndarray
+            outputs with first dimension corresponding to the evaluations
+
+        tags : Optional[Union[str, Sequence]] default None
+            tag of all evaluations or of each evaluation
+
+        """
+        x, y = np.asarray(x), np.asarray(y)
+        if len(x) != len(y):
+            raise ValueError(f'Number of inputs ({len(x)}) and outputs ({len(y)}) must match!')
+        if len(x) == 0:
+            return
+        with self._lock:
+            if self._x is None:
+                self._allocate(x[0], y[0], max(self._initial_capacity, len(x)))
+            self._reserve(self._size + len(x))
+            start = self._size
+            self._x[start:start + len(x)] = x
+            self._y[start:start + len(y)] = y
+            self._tags[start:start + len(x)] = tags if tags is None or isinstance(tags, str) else list(tags)
+            self._size += len(x)
+            self._version += 1
+            if self._pareto_archive_is_valid:
+                self._pareto_archive.extend(np.arange(start, self._size), self._y[start:self._size])
+
+    def truncate(self, length: int) -> None:
+        """Discard all evaluations after the first ``length`` ones
+
+        Parameters
+        ----------
+        length : int
+            number of evaluations to keep
+
+        """
+        with self._lock:
+            length = min(max(int(length), 0), self._size)
+            if length < self._size:
+                # removed points might have dominated remaining ones
+                self._pareto_archive_is_valid = False
+                self._rewritten()
+            self._size = length
+
+    def clear(self) -> None:
+        """Discard all evaluations (the allocated memory is kept)
+        """
+        with self._lock:
+            self._size = 0
+            self._rewritten()
+            self._pareto_archive.clear()
+            self._pareto_archive_is_valid = True
+
+    def copy(self) -> 'EvaluationStore':
+        """Copy of the store
+
+        Returns
+        -------
+        EvaluationStore
+            independent copy of the store
+
+        """
+        store = EvaluationStore(initial_capacity=self._initial_capacity)
+        if self._x is not None:
+            store._allocate(self._x[0], self._y[0], max(self._size, 1))
+            store.extend(self.x, self.y, self.tags)
+        return store
+
+    def to_list(self) -> List:
+        """Convert the store to a list of evaluations
+
+        Returns
+        -------
+        List
+            list of evaluations, each of the form [input,value of blackbox function at input]
+
+        """
+        return [[self._x[i].copy(), self._y[i].copy()] for i in range(self._size)]
+
+    @property
+    def tags(self) -> np.ndarray:
+        """Read-only view of the tags of all evaluations
+
+        Returns
+        -------
+        np.ndarray
+            array of tags (None if untagged) of all evaluations
+
+        """
+        if self._tags is None:
+            return np.empty(0, dtype=object)
+        return self._read_only(self._tags[:self._size])
+
+    def tag(self, indices: Union[int, Sequence[int], np.ndarray], tag: Optional[str]) -> None:
+        """Tag evaluations (replacing their previous tags)
+
+        Parameters
+        ----------
+        indices : Union[int, Sequence[int], np.ndarray]
+            indices of the evaluations
+
+        tag : Optional[str]
+            new tag
+
+        """
+        with self._lock:
+            self._tags[:self._size][indices] = tag
+
+    def indices_with_tag(self, tag: Optional[str]) -> np.ndarray:
+        """Indices of the evaluations with a tag
+
+        Parameters
+        ----------
+        tag : Optional[str]
+            tag
+
+        Returns
+        -------
+        np.ndarray
+            ascending indices of the evaluations with the tag
+
+        """
+        return np.flatnonzero(np.array([evaluation_tag == tag for evaluation_tag in self.tags], dtype=bool))
+
+    @staticmethod
+    def _read_only(array: np.ndarray) -> np.ndarray:
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def x(self) -> np.ndarray:
+        """Read-only view of the inputs of all evaluations
+
+        .. warning::
+
+            The view shares memory with the store. Truncating the store and storing new evaluations afterwards
+            may change the content of previously obtained views.
+
+        Returns
+        -------
+        np.ndarray
+            array of inputs of all evaluations
+
+        """
+        if self._x is None:
+            return np.empty(0)
+        return self._read_only(self._x[:self._size])
+
+    @x.setter
+    def x(self, value: np.ndarray):
+        self._x[:self._size] = value
+        self._rewritten()
+
+    @property
+    def y(self) -> np.ndarray:
+        """Read-only view of the outputs of all evaluations
+
+        .. warning::
+
+            The view shares memory with the store. Truncating the store and storing new evaluations afterwards
+            may change the content of previously obtained views.
+
+        Returns
+        -------
+        np.ndarray
+            array of outputs of all evaluations
+
+        """
+        if self._y is None:
+            return np.empty(0)
+        return self._read_only(self._y[:self._size])
+
+    @y.setter
+    def y(self, value: np.ndarray):
+        self._y[:self._size] = value
+        self._pareto_archive_is_valid = False
+        self._rewritten()
+
+    def _rewritten(self) -> None:
+        # evaluations were changed or discarded (instead of only stored)
+        self._version += 1
+        self._number_rewrites += 1
+
+    @property
+    def version(self) -> int:
+        """Counter of the changes of the store
+
+        Returns
+        -------
+        int
+            number which increases whenever evaluations are stored, changed or discarded
+
+        """
+        return self._version
+
+    def reflected(self, pareto_reflection) -> 'EvaluationStore':
+        """Store of the evaluations whose outputs are mapped by a Pareto reflection
+
+        The store is cached for each Pareto reflection (equal Pareto reflections share the cache). When evaluations
+        are stored, only the new outputs are mapped (in one batch call). If evaluations are changed or discarded or
+        a parameter of the Pareto reflection is set (see its parameter version), the store is computed again.
+        Unhashable Pareto reflections are not cached, i.e. the store is computed at each call.
+
+        Parameters
+        ----------
+        pareto_reflection : ParetoReflection
+            Pareto reflection applied to the outputs
+
+        Returns
+        -------
+        EvaluationStore
+            store of the inputs and the mapped outputs (must not be changed)
+
+        """
+        with self._lock:
+            try:
+                hash(pareto_reflection)
+            except TypeError:
+                reflected = EvaluationStore(initial_capacity=max(self._size, 1))
+                if self._size != 0:
+                    reflected.extend(self.x, pareto_reflection.batch_call(self.y))
+                return reflected
+
+            number_rewrites, parameter_version, reflected = self._reflected.pop(pareto_reflection, (None, None, None))
+            if (number_rewrites != self._number_rewrites
+                    or parameter_version != getattr(pareto_reflection, 'parameter_version', None)):
+                reflected = EvaluationStore(initial_capacity=max(self._size, 1))
+            if len(reflected) < self._size:
+                reflected.extend(self.x[len(reflected):], pareto_reflection.batch_call(self.y[len(reflected):]))
+
+            # the version is read after mapping, since Pareto reflections may set attributes lazily when called
+            self._reflected[pareto_reflection] = (self._number_rewrites,
+                                                  getattr(pareto_reflection, 'parameter_version', None), reflected)
+            if len(self._reflected) > self._maximal_number_reflected:
+                self._reflected.popitem(last=False)
+            return reflected
+
+    @property
+    def pareto_archive(self) -> ParetoArchive:
+        """Archive of the evaluations whose outputs are non-dominated among all outputs
+
+        Returns
+        -------
+        ParetoArchive
+            (up-to-date) Pareto archive of the outputs
+
+        """
+        if not self._pareto_archive_is_valid:
+            self._pareto_archive.clear()
+            self._pareto_archive.extend(np.arange(self._size), self.y)
+            self._pareto_archive_is_valid = True
+        return self._pareto_archive
+
+    @property
+    def pareto_front_indices(self) -> np.ndarray:
+        """Ascending indices of the evaluations whose outputs form the Pareto front of all outputs
+
+        Returns
+        -------
+        np.ndarray
+            indices of the Pareto optimal evaluations
+
+        """
+        return self.pareto_archive.indices
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        x, y = self.x, self.y
+        for i in range(self._size):
+            yield [x[i], y[i]]
+
+    def __getitem__(self, index: Union[int, slice]) -> List:
+        if isinstance(index, slice):
+            # a list of evaluations (as if the evaluations were stored in a list)
+            return [[self.x[position], self.y[position]] for position in range(self._size)[index]]
+
+        position = range(self._size)[index]
+        return [self.x[position], self.y[position]]
+
+    def __repr__(self) -> str:
+        return f'EvaluationStore(number_evaluations={self._size})'
+
+
+def as_evaluation_store(evaluations: Optional[Union[List, EvaluationStore]]) -> EvaluationStore:
+    """Convert a list of evaluations to an evaluation store
+
+    Parameters
+    ----------
+    evaluations : Optional[Union[List, EvaluationStore]]
+        list of evaluations (each of the form [input,value of blackbox function at input]) or store
+
+    Returns
+    -------
+    EvaluationStore
+        the store itself if evaluations is a store and a new store containing the evaluations otherwise
+
+    """
+    if evaluations is None:
+        return EvaluationStore()
+    if isinstance(evaluations, EvaluationStore):
+        return evaluations
+    return EvaluationStore.from_list(evaluations)
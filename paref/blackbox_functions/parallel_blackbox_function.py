@@ -0,0 +1,265 @@
+import inspect
+import os
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Executor, FIRST_COMPLETED, Future, ProcessPoolExecutor, \
+    ThreadPoolExecutor, TimeoutError, wait
+from typing import List, Optional, Union
+
+import numpy as np
+
+from paref.blackbox_functions.design_space.bounds import Bounds
+from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
+
+
+def evaluate_without_storing(blackbox_function: BlackboxFunction, x: np.ndarray) -> np.ndarray:
+    """Evaluate a blackbox function at several points without storing the evaluations
+
+    Parameters
+    ----------
+    blackbox_function : BlackboxFunction
+        blackbox function
+
+    x : np.ndarray
+        points stored in 2-dimensional array with first dimension corresponding to the points
+
+    Returns
+    -------
+    np.ndarray
+        values of the blackbox function with first dimension corresponding to the points
+
+    """
+    call = inspect.unwrap(type(blackbox_function).__call__)
+    if blackbox_function.allow_batch_evaluation:
+        return np.asarray(call(blackbox_function, x, batch_evaluation=True)).reshape(len(x), -1)
+    return np.array([call(blackbox_function, point) for point in x]).reshape(len(x), -1)
+
+
+class ParallelBlackboxFunction(BlackboxFunction):
+    """Evaluate a blackbox function at several points in parallel by a pool of processes or threads
+
+    The wrapper allows batch evaluation of any blackbox function, i.e.
+    :meth:`perform_lhc <paref.interfaces.moo_algorithms.blackbox_function.BlackboxFunction.perform_lhc>` and
+    batches of proposals evaluate the points in parallel.
+    The points of a batch are split into chunks of chunk_size points and each chunk is evaluated by one task of the
+    pool. The values are returned (and stored) in the order of the points.
+
+    If a task raises an exception or does not finish within timeout seconds, it is submitted again up to retries
+    times before the exception is raised. At most one task per worker is submitted at once, such that the timeout of
+    each task starts when it is submitted (and not when its result is awaited).
+
+    .. note::
+        The evaluations are stored by the wrapper only, i.e. not by the wrapped blackbox function.
+        A process pool requires the wrapped blackbox function to be picklable.
+
+    .. warning::
+        A running task can not be interrupted. Hence, a task exceeding the timeout keeps its worker busy until it
+        finishes. The pool is replaced by a new one then, i.e. the retries are not queued behind timed out tasks.
+
+    Examples
+    --------
+    >>> with ParallelBlackboxFunction(blackbox_function, max_workers=4, executor='process') as parallel_function:
+    >>>     parallel_function.perform_lhc(20)
+
+    """
+
+    def __init__(self,
+                 blackbox_function: BlackboxFunction,
+                 max_workers: Optional[int] = None,
+                 executor: str = 'process',
+                 chunk_size: int = 1,
+                 timeout: Optional[float] = None,
+                 retries: int = 0, ):
+        """
+
+        Parameters
+        ----------
+        blackbox_function : BlackboxFunction
+            blackbox function which is evaluated in parallel
+
+        max_workers : Optional[int] default None
+            number of workers of the pool (None: default of concurrent.futures)
+
+        executor : str default 'process'
+            pool of the workers, either 'process' or 'thread'
+
+        chunk_size : int default 1
+            number of points evaluated by each task
+
+        timeout : Optional[float] default None
+            maximal number of seconds a task may take from its submission (None: no limit)
+
+        retries : int default 0
+            number of times a failed or timed out task is submitted again
+        """
+        if executor not in ('process', 'thread'):
+            raise ValueError(f"Executor must be either 'process' or 'thread'! Executor is {executor}.")
+        if chunk_size < 1:
+            raise ValueError(f'Chunk size must be at least 1! Chunk size is {chunk_size}.')
+        if retries < 0:
+            raise ValueError(f'Number of retries must be non-negative! Number of retries is {retries}.')
+        self._blackbox_function = blackbox_function
+        self._max_workers = max_workers
+        self._executor_type = executor
+        self._chunk_size = chunk_size
+        self._timeout = timeout
+        self._retries = retries
+        self._executor = None
+
+    def __getstate__(self) -> dict:
+        # the pool can not be pickled
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
+
+    def __enter__(self) -> 'ParallelBlackboxFunction':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> Executor:
+        """Pool of the workers (started at the first batch evaluation)
+
+        Returns
+        -------
+        Executor
+            pool of processes or threads
+
+        """
+        if self._executor is None:
+            self._executor = (ProcessPoolExecutor if self._executor_type == 'process'
+                              else ThreadPoolExecutor)(max_workers=self._max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the pool of the workers
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __call__(self, x: Union[np.ndarray, list], batch_evaluation: bool = False) -> np.ndarray:
+        """Evaluate the blackbox function at a point or (in parallel) at a batch of points
+
+        Parameters
+        ----------
+        x : Union[np.ndarray, list]
+            point or, if batch_evaluation is true, points stored in 2-dimensional array with first dimension
+            corresponding to the points
+
+        batch_evaluation : bool default False
+            evaluate a batch of points in parallel
+
+        Returns
+        -------
+        np.ndarray
+            value at the point or values with first dimension corresponding to the points
+
+        """
+        if not batch_evaluation:
+            return self._evaluate([np.asarray(x, dtype=float).reshape(1, -1)])[0][0]
+
+        x = np.asarray(x, dtype=float).reshape(-1, self.dimension_design_space)
+        chunks = [x[i:i + self._chunk_size] for i in range(0, len(x), self._chunk_size)]
+        return np.concatenate(self._evaluate(chunks)) if len(chunks) != 0 \
+            else np.empty((0, self.dimension_target_space))
+
+    @property
+    def _number_workers(self) -> int:
+        # number of workers of the pool (the defaults of concurrent.futures)
+        if self._max_workers is not None:
+            return self._max_workers
+        if self._executor_type == 'process':
+            return os.cpu_count() or 1
+        return min(32, (os.cpu_count() or 1) + 4)
+
+    def _submit(self, chunk: np.ndarray) -> Future:
+        return self.executor.submit(evaluate_without_storing, self._blackbox_function, chunk)
+
+    def _replace_executor(self) -> None:
+        # the workers of timed out tasks stay busy, hence the pool is abandoned (its running tasks still complete)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _evaluate(self, chunks: List[np.ndarray]) -> List[np.ndarray]:
+        # evaluate the chunks and submit the chunks of failed or timed out tasks again
+        #
+        # At most one task per worker is submitted at once, such that the timeout of each task starts (roughly) when
+        # it starts running. Timed out tasks keep their workers busy, hence the pool is replaced before the chunks
+        # are submitted again.
+        values = [None] * len(chunks)
+        attempts = [0] * len(chunks)
+        pending = deque(range(len(chunks)))
+        running = {}
+        try:
+            while len(pending) != 0 or len(running) != 0:
+                while len(pending) != 0 and len(running) < self._number_workers:
+                    i = pending.popleft()
+                    running[self._submit(chunks[i])] = (
+                        i, None if self._timeout is None else time.monotonic() + self._timeout)
+
+                deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                done, _ = wait(running, return_when=FIRST_COMPLETED,
+                               timeout=max(min(deadlines) - time.monotonic(), 0) if len(deadlines) != 0 else None)
+                for future in done:
+                    i, _ = running.pop(future)
+                    try:
+                        values[i] = future.result()
+                    except CancelledError:
+                        # cancelled by replacing the pool before it started
+                        pending.append(i)
+                    except Exception:
+                        if attempts[i] == self._retries:
+                            raise
+                        attempts[i] += 1
+                        pending.append(i)
+
+                now = time.monotonic()
+                timed_out = [future for future, (_, deadline) in running.items()
+                             if deadline is not None and deadline <= now]
+                for future in timed_out:
+                    i, _ = running.pop(future)
+                    future.cancel()
+                    if attempts[i] == self._retries:
+                        raise TimeoutError(f'Evaluation of {len(chunks[i])} point(s) did not finish within '
+                                           f'{self._timeout} seconds in {self._retries + 1} attempt(s)!')
+                    attempts[i] += 1
+                    pending.append(i)
+                if len(timed_out) != 0:
+                    self._replace_executor()
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+        return values
+
+    @property
+    def allow_batch_evaluation(self) -> bool:
+        return True
+
+    @property
+    def blackbox_function(self) -> BlackboxFunction:
+        """
+
+        Returns
+        -------
+        BlackboxFunction
+            wrapped blackbox function
+
+        """
+        return self._blackbox_function
+
+    @property
+    def dimension_design_space(self) -> int:
+        return self._blackbox_function.dimension_design_space
+
+    @property
+    def dimension_target_space(self) -> int:
+        return self._blackbox_function.dimension_target_space
+
+    @property
+    def design_space(self) -> Union[Bounds]:
+        return self._blackbox_function.design_space
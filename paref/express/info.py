@@ -1,9 +1,12 @@
+from typing import Callable, Optional
+
 import numpy as np
 import scipy as sp
 from scipy.stats import qmc
 
 from paref.blackbox_functions.design_space.bounds import Bounds
 from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
+from paref.interfaces.surrogates.surrogate import Surrogate
 from paref.moo_algorithms.minimizer.differential_evolution_minimizer import DifferentialEvolutionMinimizer
 from paref.moo_algorithms.minimizer.surrogates.gpr import GPR
 from paref.moo_algorithms.stopping_criteria.max_iterations_reached import MaxIterationsReached
@@ -21,11 +24,15 @@ class GprBbf(BlackboxFunction):
 
     """
 
-    def __init__(self, bbf: BlackboxFunction, training_iter=2000, learning_rate=0.05):
+    def __init__(self, bbf: BlackboxFunction, training_iter=2000, learning_rate=0.05,
+                 surrogate_factory: Optional[Callable[[], Surrogate]] = None):
         self._bbf = bbf
         self._evaluations = bbf.evaluations.copy()
-        self._gpr = GPR(training_iter=training_iter, learning_rate=learning_rate)
-        self._gpr.train(train_x=bbf.x, train_y=bbf.y)
+        if surrogate_factory is None:
+            self._gpr = GPR(training_iter=training_iter, learning_rate=learning_rate)
+        else:
+            self._gpr = surrogate_factory()
+        self._gpr.fit(bbf.x, bbf.y)
 
     def __call__(self, x: np.ndarray) -> np.ndarray:
         return self._gpr(x)
@@ -65,7 +72,8 @@ class Info:
 
     """
 
-    def __init__(self, blackbox_function: BlackboxFunction, training_iter=2000, learning_rate=0.05):
+    def __init__(self, blackbox_function: BlackboxFunction, training_iter=2000, learning_rate=0.05,
+                 surrogate_factory: Optional[Callable[[], Surrogate]] = None):
         """
 
         Parameters
@@ -76,6 +84,9 @@ class Info:
             number of training iterations for the underlying approximate of the bbf (GPR)
         learning_rate : float default 0.01
             learning rate for the underlying approximate of the bbf (GPR)
+        surrogate_factory : Optional[Callable[[], Surrogate]] default None
+            function returning a new (unfitted) surrogate which is used as underlying approximate of the bbf
+            instead of the GPR (the model fitness is only available for the GPR)
         """
         if not isinstance(blackbox_function.design_space, Bounds):
             raise ValueError('Design space property of blackbox function must be an instance of Bounds!')
@@ -83,6 +94,7 @@ class Info:
         self._minimizer = DifferentialEvolutionMinimizer()
         self._training_iter = training_iter
         self._learning_rate = learning_rate
+        self._surrogate_factory = surrogate_factory
         self.update()
 
     def update(self):
@@ -94,15 +106,17 @@ class Info:
             raise ValueError('You must evaluate the blackbox function at least once before obtaining information!')
 
         print('Obtaining information about the approximate Pareto front...')
-        self._surrogate = GprBbf(self._blackbox_function, self._training_iter, self._learning_rate)
+        self._surrogate = GprBbf(self._blackbox_function, self._training_iter, self._learning_rate,
+                                 self._surrogate_factory)
 
         # mean of std
-        self.percent_mean_std = np.mean([self._surrogate._gpr.std(x) / self._surrogate._gpr(x) * 100 for x in qmc.scale(
+        mean, std = self._surrogate._gpr.predict(qmc.scale(
             qmc.LatinHypercube(d=self._blackbox_function.dimension_design_space).random(
                 n=1000),
             self._blackbox_function.design_space.lower_bounds,
             self._blackbox_function.design_space.upper_bounds,
-        )], axis=0)
+        ))
+        self.percent_mean_std = np.mean(std / mean * 100, axis=0)
 
         # Search for minima in components
         minima_sequence = Find1ParetoPointsForAllComponentsSequence()
@@ -112,12 +126,11 @@ class Info:
                                           stopping_criteria=MaxIterationsReached(
                                               max_iterations=self._blackbox_function.dimension_target_space))
         self._minima_pareto_points = minima_sequence.best_fits(self._surrogate.y)
-        self._minima_pareto_points_std = [self._surrogate._gpr.std(x) for i, x in
-                                          enumerate(
-                                              self._surrogate.x[-self._blackbox_function.dimension_target_space:])]
+        _, minima_std = self._surrogate._gpr.predict(
+            self._surrogate.x[-self._blackbox_function.dimension_target_space:])
+        self._minima_pareto_points_std = list(minima_std)
         self._minima = np.min(minima_sequence.best_fits(self._surrogate.y), axis=0)
-        self._minima_std = [self._surrogate._gpr.std(x)[i] for i, x in
-                            enumerate(self._surrogate.x[-self._blackbox_function.dimension_target_space:])]
+        self._minima_std = list(np.diag(minima_std))
 
         # Search for maximal Pareto point
         maximal_pareto_point_reflection = FindMaximalParetoPoint(blackbox_function=self._surrogate)
@@ -396,12 +409,12 @@ class Info:
         return i / len(self._blackbox_function.y) * 100  # in percent
 
     @property
-    def model(self) -> GPR:
+    def model(self) -> Surrogate:
         """The underlying model of the blackbox function
 
         Returns
         -------
-        GPR
-            underlying surrogate (GPR) of the blackbox function
+        Surrogate
+            underlying surrogate (by default GPR) of the blackbox function
         """
         return self._surrogate._gpr
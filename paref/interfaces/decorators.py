@@ -1,26 +1,141 @@
-from typing import List
+from functools import wraps
+from typing import List, Optional
+
+import numpy as np
+
+from paref.blackbox_functions.evaluation_store import EvaluationStore, as_evaluation_store
 
 
 def initialize_empty_evaluations(func):
     def wrapper(*args, **kwargs):
         """Initialize storage for evaluations of the blackbox function
         """
-        args[0]._evaluations = []
+        args[0]._evaluations = EvaluationStore()
+        args[0]._journal = None
+        args[0]._cache = None
         func(*args, **kwargs)
 
     return wrapper
 
 
+# evaluations with these tags are not recorded in the journal (e.g. the many evaluations of a search which are
+# discarded or kept only for seeding later searches)
+_UNJOURNALED_TAGS = ('search',)
+
+
+def _is_journaled(tags: np.ndarray) -> np.ndarray:
+    # mask of the evaluations (given by their tags) which are recorded in the journal
+    return np.array([tag not in _UNJOURNALED_TAGS for tag in tags], dtype=bool)
+
+
+def _store_evaluation(blackbox_function, x, result, batch_evaluation: bool = False) -> None:
+    if not isinstance(blackbox_function._evaluations, EvaluationStore):
+        # evaluations were overwritten by a list of evaluations
+        blackbox_function._evaluations = as_evaluation_store(blackbox_function._evaluations)
+    tag = getattr(blackbox_function, '_evaluation_tag', None)
+    journal = getattr(blackbox_function, '_journal', None) if tag not in _UNJOURNALED_TAGS else None
+    # the journal records the journaled evaluations in the same order as the store
+    with blackbox_function._evaluations._lock:
+        if batch_evaluation:
+            blackbox_function._evaluations.extend(x, result, tag)
+            if journal is not None:
+                journal.extend(x, result)
+        else:
+            blackbox_function._evaluations.append(x, result, tag)
+            if journal is not None:
+                journal.append(x, result)
+
+
+def _cached_entries(blackbox_function, x, batch_evaluation: bool = False) -> Optional[List]:
+    # cached entry of each point (None if the blackbox function has no cache)
+    cache = getattr(blackbox_function, '_cache', None)
+    if cache is None:
+        return None
+    return cache.lookup_entries(np.reshape(x, (len(x), -1)) if batch_evaluation else np.reshape(x, (1, -1)))
+
+
+def _store_cached_evaluation(blackbox_function, x, entries: List, computed, batch_evaluation: bool = False):
+    # cache and store the computed values of the points which were not cached and return the values of all points
+    cache = blackbox_function._cache
+    if not isinstance(blackbox_function._evaluations, EvaluationStore):
+        blackbox_function._evaluations = as_evaluation_store(blackbox_function._evaluations)
+    evaluations = blackbox_function._evaluations
+    points = np.reshape(x, (len(entries), -1))
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    values = [None if entry is None else cache.value(entry) for entry in entries]
+    if len(missing) != 0:
+        for i, value in zip(missing, np.reshape(computed, (len(missing), -1))):
+            values[i] = value
+
+    with evaluations._lock:
+        # computed values, duplicates of evaluations which are not stored anymore (e.g. discarded search
+        # evaluations) and, if requested, all duplicates are stored
+        recorded = [i for i, entry in enumerate(entries)
+                    if entry is None or cache.record_duplicates or not cache.is_stored(entry, evaluations)]
+        store_indices = dict(zip(recorded, range(len(evaluations), len(evaluations) + len(recorded))))
+        if len(missing) != 0:
+            cache.add(points[missing], np.array([values[i] for i in missing]), [store_indices[i] for i in missing])
+        for i in recorded:
+            if entries[i] is not None:
+                cache.set_store_index(entries[i], store_indices[i])
+
+        if not batch_evaluation:
+            result = computed if len(missing) != 0 else values[0]
+            if len(recorded) != 0:
+                _store_evaluation(blackbox_function, x, result)
+            return result
+
+        result = np.array(values)
+        if len(recorded) != 0:
+            _store_evaluation(blackbox_function, np.asarray(x)[recorded], result[recorded], batch_evaluation=True)
+        return result
+
+
+def _missing_args(args, entries: List, batch_evaluation: bool = False):
+    # arguments of the evaluation at the points which are not cached (None if all points are cached)
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    if len(missing) == 0:
+        return None
+    if not batch_evaluation:
+        return args
+    return (args[0], np.asarray(args[1])[missing]) + args[2:]
+
+
 def store_evaluation_bbf(func):
+    # the undecorated function remains accessible as __wrapped__ (e.g. for evaluations without storing)
+    @wraps(func)
     def wrapper(*args, **kwargs):
-        """Store evaluation of the blackbox function
+        """Store evaluation of the blackbox function (and skip the evaluation of cached points)
         """
-        result = func(*args, **kwargs)
-        if kwargs.get('batch_evaluation', False):
-            args[0]._evaluations.extend([[x, y] for x, y in zip(args[1], result)])
-        else:
-            args[0]._evaluations.append([args[1], result])
-        return result
+        batch_evaluation = kwargs.get('batch_evaluation', False)
+        entries = _cached_entries(args[0], args[1], batch_evaluation)
+        if entries is None:
+            result = func(*args, **kwargs)
+            _store_evaluation(args[0], args[1], result, batch_evaluation)
+            return result
+
+        missing_args = _missing_args(args, entries, batch_evaluation)
+        computed = func(*missing_args, **kwargs) if missing_args is not None else []
+        return _store_cached_evaluation(args[0], args[1], entries, computed, batch_evaluation)
+
+    return wrapper
+
+
+def store_evaluation_async_bbf(func):
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        """Store evaluation of the asynchronous blackbox function once it completed (and skip cached points)
+        """
+        batch_evaluation = kwargs.get('batch_evaluation', False)
+        entries = _cached_entries(args[0], args[1], batch_evaluation)
+        if entries is None:
+            result = await func(*args, **kwargs)
+            _store_evaluation(args[0], args[1], result, batch_evaluation)
+            return result
+
+        missing_args = _missing_args(args, entries, batch_evaluation)
+        computed = await func(*missing_args, **kwargs) if missing_args is not None else []
+        return _store_cached_evaluation(args[0], args[1], entries, computed, batch_evaluation)
 
     return wrapper
 
@@ -0,0 +1,100 @@
+import asyncio
+import inspect
+from abc import abstractmethod
+from typing import Union
+
+import numpy as np
+
+from paref.interfaces.decorators import store_evaluation_async_bbf
+from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
+
+
+class AsyncBlackboxFunction(BlackboxFunction):
+    """Generic interface for blackbox functions which are evaluated asynchronously
+
+    Implement this interface instead of the
+    :py:class:`blackbox function <paref.interfaces.moo_algorithms.blackbox_function.BlackboxFunction>` if the blackbox
+    function is e.g. a remote solver behind a job queue. Instead of __call__, the coroutine evaluate is implemented
+    and its evaluations are stored (as for __call__) once they complete.
+    Then, :meth:`apply to sequence async <paref.interfaces.moo_algorithms.paref_moo.ParefMOO.apply_to_sequence_async>`
+    keeps several evaluations in flight and proposes new points as results arrive.
+
+    Calling the blackbox function evaluates it synchronously (a batch of points concurrently), e.g. for
+    :meth:`perform_lhc <paref.interfaces.moo_algorithms.blackbox_function.BlackboxFunction.perform_lhc>`.
+
+    .. warning::
+        Calling the blackbox function synchronously runs its own event loop, i.e. this is not possible
+        within a running event loop (await evaluate instead).
+
+    Examples
+    --------
+    >>> class RemoteBlackboxFunction(AsyncBlackboxFunction):
+    >>>     async def evaluate(self, x: np.ndarray) -> np.ndarray:
+    >>>         job = await submit_to_queue(x)
+    >>>         return await job.result()
+    >>>
+    >>>     @property
+    >>>     def dimension_design_space(self) -> int:
+    >>>         return 2
+    >>>
+    >>>     @property
+    >>>     def dimension_target_space(self) -> int:
+    >>>         return 2
+
+    """
+
+    def __init_subclass__(cls):
+        """Ensure storing of asynchronous evaluations in every subclass
+        """
+        super().__init_subclass__()
+        if 'evaluate' in cls.__dict__:
+            cls.evaluate = store_evaluation_async_bbf(cls.evaluate)
+
+    @abstractmethod
+    async def evaluate(self, x: np.ndarray) -> np.ndarray:
+        """Evaluate the blackbox function asynchronously and store the tuple (input,output) in self._evaluations
+
+        Parameters
+        ----------
+        x : np.ndarray
+            input to which the blackbox function is applied
+
+        Returns
+        -------
+        np.ndarray
+            output of blackbox function applied to input
+
+        """
+        raise NotImplementedError
+
+    def __call__(self, x: Union[np.ndarray, list], batch_evaluation: bool = False) -> np.ndarray:
+        """Evaluate the blackbox function synchronously
+
+        Parameters
+        ----------
+        x : Union[np.ndarray, list]
+            input or, if batch_evaluation is true, inputs stored in 2-dimensional array with first dimension
+            corresponding to the points (evaluated concurrently)
+
+        batch_evaluation : bool default False
+            evaluate a batch of inputs
+
+        Returns
+        -------
+        np.ndarray
+            output or outputs with first dimension corresponding to the points
+
+        """
+        # the evaluations are stored by the decorator of __call__, i.e. evaluate without storing
+        evaluate = inspect.unwrap(type(self).evaluate)
+
+        async def evaluate_all():
+            return await asyncio.gather(*(evaluate(self, point) for point in x))
+
+        if batch_evaluation:
+            return np.array(asyncio.run(evaluate_all())).reshape(len(x), -1)
+        return asyncio.run(evaluate(self, x))
+
+    @property
+    def allow_batch_evaluation(self) -> bool:
+        return True
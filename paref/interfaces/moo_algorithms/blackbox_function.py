@@ -1,12 +1,17 @@
 import warnings
 from abc import abstractmethod
-from typing import Union, List
+from contextlib import contextmanager
+from typing import Union, List, Optional
 
 import numpy as np
 from scipy.stats import qmc
 
 from paref.blackbox_functions.design_space.bounds import Bounds
-from paref.interfaces.decorators import initialize_empty_evaluations, store_evaluation_bbf
+from paref.blackbox_functions.evaluation_cache import EvaluationCache
+from paref.blackbox_functions.evaluation_journal import EvaluationJournal
+from paref.blackbox_functions.evaluation_store import EvaluationStore, as_evaluation_store
+from paref.interfaces.decorators import initialize_empty_evaluations, store_evaluation_bbf, _is_journaled, \
+    _store_evaluation
 
 
 class BlackboxFunction:
@@ -64,13 +69,25 @@ class BlackboxFunction:
 
     """
 
+    # blackbox functions which do not store their evaluations themselves (e.g. since the underlying blackbox function
+    # stores them) set this to False
+    _store_evaluations = True
+
     def __init_subclass__(cls):
         """Ensure storing of evaluations in every subclass
         and initialize empty evaluations list in subclasses
         """
         super().__init_subclass__()
         cls.__init__ = initialize_empty_evaluations(cls.__init__)
-        cls.__call__ = store_evaluation_bbf(cls.__call__)
+        if '__call__' in cls.__dict__ and cls._store_evaluations:
+            # an inherited __call__ already stores the evaluations
+            cls.__call__ = store_evaluation_bbf(cls.__call__)
+
+    def __getstate__(self) -> dict:
+        # the journal belongs to the process which opened it
+        state = self.__dict__.copy()
+        state['_journal'] = None
+        return state
 
     @abstractmethod
     def __call__(self, x: Union[np.ndarray, list]) -> np.ndarray:
@@ -138,20 +155,22 @@ class BlackboxFunction:
         raise NotImplementedError
 
     @property
-    def evaluations(self) -> List:
+    def evaluations(self) -> EvaluationStore:
         """
 
         Returns
         -------
-        np.ndarray
-            numpy array of evaluations: each element of the form [input,value of blackbox function at input]
+        EvaluationStore
+            store of evaluations: behaves like a list where each element is of the form
+            [input,value of blackbox function at input] (indexing returns a new list, i.e. assigning to its
+            elements does not change the stored evaluation)
 
 
         """
         return self._evaluations
 
     @evaluations.setter
-    def evaluations(self, evaluations: List):
+    def evaluations(self, evaluations: Union[List, EvaluationStore]):
         """Set list of evaluations
 
         .. warning::
@@ -160,54 +179,225 @@ class BlackboxFunction:
 
         Parameters
         ----------
-        evaluations : List
-            set the list of evaluations
+        evaluations : Union[List, EvaluationStore]
+            set the list (or store) of evaluations
 
         """
-        self._evaluations = evaluations
+        self._evaluations = as_evaluation_store(evaluations)
+        if self.journal is not None:
+            # rewrite the journal
+            self.journal.truncate(0)
+            self._journal_evaluations(self.journal)
 
     @property
     def x(self) -> np.ndarray:
         """Numpy array of inputs of all evaluations
 
+        .. note::
+            The returned array is a read-only view of the stored inputs, i.e. no copy is made. The view shares memory
+            with the store, i.e. it may change if evaluations are truncated and new evaluations are stored afterwards.
+
         Returns
         -------
         np.ndarray
             array of inputs of all evaluations
 
         """
-        return np.array([evaluation[0] for evaluation in self._evaluations])
+        return self._evaluations.x
 
     @x.setter
     def x(self, value):
         # TBA: needed?
-        for index, evaluation in enumerate(self._evaluations):
-            evaluation[0] = value[index]
+        self._evaluations.x = value
 
     @property
     def y(self) -> np.ndarray:
         """Numpy array of outputs of all evaluations
 
+        .. note::
+            The returned array is a read-only view of the stored outputs, i.e. no copy is made. The view shares memory
+            with the store, i.e. it may change if evaluations are truncated and new evaluations are stored afterwards.
+
         Returns
         -------
         np.ndarray
             array of outputs of all evaluations
 
         """
-        return np.array([evaluation[1] for evaluation in self._evaluations])
+        return self._evaluations.y
 
     @y.setter
     def y(self, value):
         # TBA: needed?
-        for index, evaluation in enumerate(self._evaluations):
-            evaluation[1] = value[index]
+        self._evaluations.y = value
 
     def clear_evaluations(self) -> None:
         """Clear all evaluations
 
-        I.e. set self._evaluations to empty list.
+        I.e. set self._evaluations to an empty store (and clear the journal).
+        """
+        self._evaluations = EvaluationStore()
+        if self.journal is not None:
+            self.journal.truncate(0)
+
+    @contextmanager
+    def tag_evaluations(self, tag: Optional[str]):
+        """Tag all evaluations stored within the context
+
+        Examples
+        --------
+        >>> with blackbox_function.tag_evaluations('search'):
+        >>>     blackbox_function(x)
+        >>> blackbox_function.evaluations.indices_with_tag('search')
+
+        Parameters
+        ----------
+        tag : Optional[str]
+            tag of the evaluations (see :py:class:`evaluation store
+            <paref.blackbox_functions.evaluation_store.EvaluationStore>`)
+
+        """
+        previous_tag = getattr(self, '_evaluation_tag', None)
+        self._evaluation_tag = tag
+        try:
+            yield
+        finally:
+            self._evaluation_tag = previous_tag
+
+    def truncate_evaluations(self, length: int) -> None:
+        """Discard all evaluations (in the store and the journal) after the first ``length`` ones
+
+        Parameters
+        ----------
+        length : int
+            number of evaluations to keep
+
+        """
+        with self._evaluations._lock:
+            if self.journal is not None:
+                self.journal.truncate(int(np.count_nonzero(_is_journaled(self._evaluations.tags[:length]))))
+            self._evaluations.truncate(length)
+
+    def store_evaluations(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Store evaluations which were computed without calling the blackbox function (e.g. by other processes)
+
+        The evaluations are stored as if the blackbox function was called, i.e. they are tagged, journaled and cached.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            inputs stored in 2-dimensional array with first dimension corresponding to the evaluations
+
+        y : np.ndarray
+            outputs with first dimension corresponding to the evaluations
+
         """
-        self._evaluations = []
+        x, y = np.asarray(x), np.asarray(y)
+        if len(x) == 0:
+            return
+        with self._evaluations._lock:
+            length = len(self._evaluations)
+            _store_evaluation(self, x, y, batch_evaluation=True)
+            if self.cache is not None:
+                self.cache.add(x, y, np.arange(length, length + len(x)))
+
+    @property
+    def cache(self) -> Optional[EvaluationCache]:
+        """Cache of the evaluations (None if no cache was enabled)
+
+        Returns
+        -------
+        Optional[EvaluationCache]
+            evaluation cache (with counters of hits and misses)
+
+        """
+        return getattr(self, '_cache', None)
+
+    def enable_cache(self, tolerance: float = 0., record_duplicates: bool = False) -> None:
+        """Skip the evaluation of the blackbox function at duplicates of previously evaluated points
+
+        If the blackbox function is called at a point which differs from a previously evaluated (or stored) point by
+        at most tolerance in each component, the value at the previous point is returned instead of evaluating
+        the blackbox function again (see :py:class:`evaluation cache
+        <paref.blackbox_functions.evaluation_cache.EvaluationCache>`).
+        The cache is initialized with the current evaluations and keeps evaluations which are discarded later
+        (a duplicate of a discarded evaluation is stored again with the cached value, but not evaluated).
+
+        Parameters
+        ----------
+        tolerance : float default 0.
+            maximal componentwise difference of duplicates (0: only exact duplicates)
+
+        record_duplicates : bool default False
+            store the evaluation (with the cached value) whenever a duplicate is called
+
+        """
+        cache = EvaluationCache(tolerance=tolerance, record_duplicates=record_duplicates)
+        if len(self._evaluations) != 0:
+            cache.add(self.x, self.y, np.arange(len(self._evaluations)))
+        self._cache = cache
+
+    def disable_cache(self) -> None:
+        """Evaluate the blackbox function at every call again
+        """
+        self._cache = None
+
+    @property
+    def journal(self) -> Optional[EvaluationJournal]:
+        """Journal to which every evaluation is appended (None if no journal was opened)
+
+        Returns
+        -------
+        Optional[EvaluationJournal]
+            evaluation journal
+
+        """
+        return getattr(self, '_journal', None)
+
+    def open_journal(self, path: str, sync_every: int = 64, sync_interval: Optional[float] = 1.) -> None:
+        """Record all evaluations in an append-only :py:class:`evaluation journal
+        <paref.blackbox_functions.evaluation_journal.EvaluationJournal>` on disk
+
+        The current evaluations are written to the journal and every subsequent evaluation is appended as it is
+        stored. After a crash, the evaluations are recovered by :meth:`load(path, resume=True)
+        <paref.interfaces.moo_algorithms.blackbox_function.BlackboxFunction.load>`.
+        Evaluations tagged 'search' (see :meth:`tag_evaluations
+        <paref.interfaces.moo_algorithms.blackbox_function.BlackboxFunction.tag_evaluations>`) are not recorded.
+
+        Parameters
+        ----------
+        path : str
+            path to the journal file (must not contain evaluations yet)
+
+        sync_every : int default 64
+            maximum number of evaluations written without synchronizing the journal to the disk
+
+        sync_interval : Optional[float] default 1.
+            an evaluation is synchronized immediately if the last synchronization is more than sync_interval seconds
+            ago (None: synchronize by the number of evaluations only)
+
+        """
+        journal = EvaluationJournal(path, sync_every=sync_every, sync_interval=sync_interval)
+        if len(journal) != 0:
+            journal.close()
+            raise ValueError(f'Journal {path} contains evaluations already! Resume by load(path, resume=True).')
+        self.close_journal()
+        with self._evaluations._lock:
+            self._journal_evaluations(journal)
+            self._journal = journal
+
+    def _journal_evaluations(self, journal: EvaluationJournal) -> None:
+        # record the current evaluations (except the unjournaled ones, e.g. of searches) in the journal
+        journaled = _is_journaled(self._evaluations.tags)
+        if np.any(journaled):
+            journal.extend(self.x[journaled], self.y[journaled])
+
+    def close_journal(self) -> None:
+        """Synchronize and close the journal (if any)
+        """
+        if self.journal is not None:
+            self.journal.close()
+            self._journal = None
 
     @property
     def allow_batch_evaluation(self) -> bool:
@@ -227,6 +417,9 @@ class BlackboxFunction:
         The `latin hypercube sampling <https://en.wikipedia.org/wiki/Latin_hypercube_samplingL>`_ (LHC) is
         a stratified (random) sampling method.
         It is often used as a powerful initial sampling method in order to explore the design space.
+        If batch evaluation is allowed, all samples are evaluated in one call (e.g. in parallel by a
+        :py:class:`parallel blackbox function
+        <paref.blackbox_functions.parallel_blackbox_function.ParallelBlackboxFunction>`).
 
 
         Parameters
@@ -269,23 +462,64 @@ class BlackboxFunction:
         """
         np.save(path, np.concatenate((self.x, self.y), axis=1))
 
-    def load(self, path: str) -> None:
-        """Load evaluations from npy-file
+    def load(self, path: str, resume: bool = False, sync_every: int = 64, sync_interval: Optional[float] = 1.) -> None:
+        """Load evaluations from npy-file or from an evaluation journal
+
+        A npy-file is memory-mapped and its evaluations are copied into the (in-memory) evaluation store, i.e. the
+        file is not read into a temporary array first.
 
         Parameters
         ----------
         path : str
             path to file
 
+        resume : bool default False
+            if the file is an :py:class:`evaluation journal
+            <paref.blackbox_functions.evaluation_journal.EvaluationJournal>`, continue recording the evaluations in it
+
+        sync_every : int default 64
+            see :meth:`open_journal <paref.interfaces.moo_algorithms.blackbox_function.BlackboxFunction.open_journal>`
+
+        sync_interval : Optional[float] default 1.
+            see :meth:`open_journal <paref.interfaces.moo_algorithms.blackbox_function.BlackboxFunction.open_journal>`
+
         """
-        evals = np.load(path)
+        if EvaluationJournal.is_journal(path):
+            x, y = EvaluationJournal.read(path)
+            if x.shape[1] != self.dimension_design_space or y.shape[1] != self.dimension_target_space:
+                raise ValueError(f'Loaded evaluations do not match target resp. design space dimension'
+                                 f'({self.dimension_design_space} resp. {self.dimension_target_space})!')
+            self.close_journal()
+            self._evaluations = EvaluationStore.from_arrays(x, y)
+            del x, y
+            if resume:
+                self._journal = EvaluationJournal(path, sync_every=sync_every, sync_interval=sync_interval)
+            return
+
+        if resume:
+            raise ValueError(f'Only evaluation journals can be resumed! {path} is not an evaluation journal.')
+        evals = np.load(path, mmap_mode='r')
         if evals.shape[1] != self.dimension_design_space + self.dimension_target_space:
             raise ValueError(f'Loaded evaluations do not match target resp. design space dimension'
                              f'({self.dimension_design_space} resp. {self.dimension_target_space})!')
 
         else:
-            self.evaluations = [[evaluation[:self.dimension_design_space], evaluation[self.dimension_design_space:]] for
-                                evaluation in evals]
+            self.evaluations = EvaluationStore.from_arrays(evals[:, :self.dimension_design_space],
+                                                           evals[:, self.dimension_design_space:])
+
+    @property
+    def pareto_front_indices(self) -> np.ndarray:
+        """Return indices of the evaluations which are Pareto optimal among all evaluations
+
+        The indices are read from the Pareto archive which is updated incrementally whenever an evaluation is stored.
+
+        Returns
+        -------
+        np.ndarray
+            ascending indices of the evaluations whose target vectors form the Pareto front
+
+        """
+        return self._evaluations.pareto_front_indices
 
     @property
     def pareto_front(self) -> np.ndarray:
@@ -297,16 +531,4 @@ class BlackboxFunction:
             Pareto front of target vectors of evaluations
 
         """
-        array = self.y
-        pareto_points = []
-        for i, point in enumerate(array):
-            is_pareto = True
-            for j, other in enumerate(array):
-                if i == j:
-                    continue
-                if np.all(point >= other) and np.any(point > other):
-                    is_pareto = False
-                    break
-            if is_pareto:
-                pareto_points.append(point)
-        return np.array(pareto_points)
+        return self.y[self.pareto_front_indices]
@@ -1,14 +1,21 @@
+import asyncio
+import inspect
 from abc import abstractmethod
-from typing import Optional, List, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Tuple, Union
 
 import numpy as np
 
 from paref.blackbox_functions.design_space.bounds import Bounds
+from paref.blackbox_functions.evaluation_store import EvaluationStore
+from paref.interfaces.decorators import _cached_entries, _store_cached_evaluation
+from paref.interfaces.moo_algorithms.async_blackbox_function import AsyncBlackboxFunction
 from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
 from paref.interfaces.moo_algorithms.stopping_criteria import StoppingCriteria
 from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
 from paref.interfaces.sequences_pareto_reflections.sequence_pareto_reflections import \
     SequenceParetoReflections
+from paref.pareto_reflections.operations.compose_reflections import ComposeReflections
 from paref.pareto_reflections.operations.compose_sequences import ComposeSequences
 
 
@@ -88,6 +95,46 @@ class ParefMOO:
         """
         raise NotImplementedError
 
+    def propose(self, blackbox_function: BlackboxFunction) -> np.ndarray:
+        """Optional: Determine a (potential) Pareto point without evaluating the blackbox function
+
+        Implement this method (together with :meth:`apply_moo_operation
+        <paref.interfaces.moo_algorithms.paref_moo.ParefMOO.apply_moo_operation>`) in order to enable the batch mode
+        of :meth:`apply to sequence <paref.interfaces.moo_algorithms.paref_moo.ParefMOO.apply_to_sequence>` and
+        :meth:`apply to sequence async <paref.interfaces.moo_algorithms.paref_moo.ParefMOO.apply_to_sequence_async>`.
+
+        Parameters
+        ----------
+        blackbox_function : BlackboxFunction
+            blackbox function to which the MOO operation is applied
+
+        Returns
+        -------
+        np.ndarray
+            proposed input of the (underlying) blackbox function
+
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support proposals, i.e. the batch mode!')
+
+    def propose_batch(self, blackbox_functions: List[BlackboxFunction]) -> List[np.ndarray]:
+        """Determine several (potential) Pareto points at once without evaluating the blackbox function
+
+        By default, each point is proposed independently. Overwrite this method in order to make the proposals
+        aware of each other (e.g. by fantasizing the evaluations of the previously proposed points).
+
+        Parameters
+        ----------
+        blackbox_functions : List[BlackboxFunction]
+            compositions of the same blackbox function with (possibly different) Pareto reflections
+
+        Returns
+        -------
+        List[np.ndarray]
+            proposed inputs of the (underlying) blackbox function
+
+        """
+        return [self.propose(blackbox_function) for blackbox_function in blackbox_functions]
+
     # TBA: how to supported domain? Or needed?
     @property
     @abstractmethod
@@ -154,6 +201,8 @@ class ParefMOO:
                           sequence_pareto_reflections: Union[SequenceParetoReflections, ParetoReflection],
                           stopping_criteria: StoppingCriteria,
                           with_underlying_sequence: bool = True,
+                          batch_size: int = 1,
+                          workers: Optional[int] = None,
                           ):
         """Apply the algorithm to the composition of a blackbox function with a (sequence of) Pareto reflection(s)
 
@@ -161,6 +210,12 @@ class ParefMOO:
         (if a single Pareto reflection is provided) and with the next Pareto reflection obtained by the sequence (if a
         sequence of Pareto reflection is provided).
 
+        If the batch size is greater than one, in each iteration batch_size Pareto reflections are drawn from the
+        sequence, for each composition a point is :meth:`proposed
+        <paref.interfaces.moo_algorithms.paref_moo.ParefMOO.propose_batch>` and the blackbox function is evaluated
+        at all proposed points concurrently on a thread pool. The evaluations are stored as they complete
+        (the blackbox function must be thread-safe then).
+
         Parameters
         ----------
         blackbox_function : BlackboxFunction
@@ -170,52 +225,190 @@ class ParefMOO:
             sequence or single Pareto reflection to compose with blackbox function
 
         stopping_criteria : StoppingCriteria
-            indicator when the algorthm terminates
+            indicator when the algorthm terminates (checked once per batch)
 
         with_underlying_sequence : bool default False
             decide whether sequence should be composed with implemented sequence of algorithm
 
+        batch_size : int default 1
+            number of points proposed and evaluated in each iteration
+
+        workers : Optional[int] default None
+            maximum number of concurrent evaluations of the blackbox function (None: batch size)
+
         Returns
         -------
 
         """
-        if with_underlying_sequence:
-            moo_sequence_of_pareto_reflections = self.sequence_of_pareto_reflections
+        if batch_size < 1:
+            raise ValueError(f'Batch size must be at least 1! Batch size is {batch_size}.')
 
-        else:
-            moo_sequence_of_pareto_reflections = None
-
-        if moo_sequence_of_pareto_reflections is not None:
-            sequence_pareto_reflections = ComposeSequences(sequence_pareto_reflections,
-                                                           moo_sequence_of_pareto_reflections)
+        sequence_pareto_reflections = self._with_underlying_sequence(sequence_pareto_reflections,
+                                                                     with_underlying_sequence)
 
         while not stopping_criteria(blackbox_function):
             number_evaluations = len(blackbox_function.evaluations)
-            if isinstance(sequence_pareto_reflections, SequenceParetoReflections):
-                # compose: caution what if one returns None
-                pareto_reflection = sequence_pareto_reflections.next(blackbox_function)
-                if pareto_reflection is None:
-                    print('End of sequence reached. Algorithm stopped.')
+            compositions = []
+            for _ in range(batch_size):
+                composition_function = self._next_composition(blackbox_function, sequence_pareto_reflections)
+                if composition_function is None:
                     break
-                else:
-                    composition_function = CompositionWithParetoReflection(blackbox_function=blackbox_function,
-                                                                           pareto_reflection=pareto_reflection)
+                compositions.append(composition_function)
 
-            elif isinstance(sequence_pareto_reflections, ParetoReflection):
-                composition_function = CompositionWithParetoReflection(blackbox_function=blackbox_function,
-                                                                       pareto_reflection=sequence_pareto_reflections)
+            if len(compositions) == 0:
+                print('End of sequence reached. Algorithm stopped.')
+                break
 
+            if batch_size == 1:
+                self.apply_moo_operation(compositions[0])
             else:
-                raise ValueError(
-                    'sequence_pareto_reflections must be an instance of sequence '
-                    'of Pareto reflections or a single Pareto reflection!')
-            self.apply_moo_operation(composition_function)
+                self._evaluate_concurrently(blackbox_function, self.propose_batch(compositions), workers)
             if len(blackbox_function.evaluations) == number_evaluations:
                 print('WARNING: algorithm did not evaluate or store the evaluation of the blackbox function!')
 
+            if len(compositions) < batch_size:
+                print('End of sequence reached. Algorithm stopped.')
+                break
+
         self._evaluated_sequence = sequence_pareto_reflections
         self._best_fits = self.evaluated_sequence.best_fits(blackbox_function.y)
 
+    async def apply_to_sequence_async(self,
+                                      blackbox_function: AsyncBlackboxFunction,
+                                      sequence_pareto_reflections: Union[SequenceParetoReflections, ParetoReflection],
+                                      stopping_criteria: StoppingCriteria,
+                                      with_underlying_sequence: bool = True,
+                                      max_in_flight: int = 4,
+                                      ):
+        """Apply the algorithm to an asynchronous blackbox function keeping several evaluations in flight
+
+        As :meth:`apply to sequence <paref.interfaces.moo_algorithms.paref_moo.ParefMOO.apply_to_sequence>`, however,
+        the points are :meth:`proposed <paref.interfaces.moo_algorithms.paref_moo.ParefMOO.propose>` (in a thread,
+        i.e. without blocking the event loop) and the blackbox function is evaluated asynchronously.
+        Up to max_in_flight evaluations are in flight and a new point is proposed whenever an evaluation completed.
+        The stopping criteria is checked before each proposal. Once it is met or the sequence ended, the evaluations
+        in flight are awaited.
+
+        .. note::
+            The proposals do not take the evaluations in flight into account. Completed evaluations are stored
+            (and cached) between the proposals, i.e. the evaluations do not change while a point is proposed.
+            If the cache of the blackbox function is enabled, duplicates of cached evaluations are not evaluated.
+
+        Examples
+        --------
+        >>> asyncio.run(moo.apply_to_sequence_async(blackbox_function, sequence, MaxIterationsReached(10)))
+
+        Parameters
+        ----------
+        blackbox_function : AsyncBlackboxFunction
+            underlying asynchronous blackbox function
+
+        sequence_pareto_reflections : SequenceParetoReflections
+            sequence or single Pareto reflection to compose with blackbox function
+
+        stopping_criteria : StoppingCriteria
+            indicator when the algorthm terminates
+
+        with_underlying_sequence : bool default True
+            decide whether sequence should be composed with implemented sequence of algorithm
+
+        max_in_flight : int default 4
+            maximum number of evaluations in flight
+
+        """
+        if max_in_flight < 1:
+            raise ValueError(f'Number of evaluations in flight must be at least 1! Number is {max_in_flight}.')
+
+        sequence_pareto_reflections = self._with_underlying_sequence(sequence_pareto_reflections,
+                                                                     with_underlying_sequence)
+        in_flight = set()
+        stopped = False
+        while True:
+            while not stopped and len(in_flight) < max_in_flight:
+                if stopping_criteria(blackbox_function):
+                    stopped = True
+                    break
+                composition_function = self._next_composition(blackbox_function, sequence_pareto_reflections)
+                if composition_function is None:
+                    print('End of sequence reached. Algorithm stopped.')
+                    stopped = True
+                    break
+                x = await asyncio.to_thread(self.propose, composition_function)
+                entries = _cached_entries(blackbox_function, x)
+                if entries is not None and entries[0] is not None:
+                    # duplicates of cached evaluations are not evaluated again (as if the blackbox function was called)
+                    _store_cached_evaluation(blackbox_function, x, entries, [])
+                    continue
+                in_flight.add(asyncio.ensure_future(self._evaluate_without_storing(blackbox_function, x)))
+
+            if len(in_flight) == 0:
+                break
+            # the completed evaluations are stored here, i.e. never while a proposal reads the evaluations
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for evaluation in done:
+                x, y = evaluation.result()
+                blackbox_function.store_evaluations(np.reshape(x, (1, -1)), np.reshape(y, (1, -1)))
+
+        self._evaluated_sequence = sequence_pareto_reflections
+        self._best_fits = self.evaluated_sequence.best_fits(blackbox_function.y)
+
+    @staticmethod
+    async def _evaluate_without_storing(blackbox_function: AsyncBlackboxFunction, x: np.ndarray):
+        # evaluate asynchronously and return the evaluation instead of storing it
+        return x, await inspect.unwrap(type(blackbox_function).evaluate)(blackbox_function, x)
+
+    def _with_underlying_sequence(self,
+                                  sequence_pareto_reflections: Union[SequenceParetoReflections, ParetoReflection],
+                                  with_underlying_sequence: bool,
+                                  ) -> Union[SequenceParetoReflections, ParetoReflection]:
+        # compose the sequence with the implemented sequence of the algorithm (if any)
+        if with_underlying_sequence:
+            moo_sequence_of_pareto_reflections = self.sequence_of_pareto_reflections
+
+        else:
+            moo_sequence_of_pareto_reflections = None
+
+        if moo_sequence_of_pareto_reflections is not None:
+            return ComposeSequences(sequence_pareto_reflections, moo_sequence_of_pareto_reflections)
+        return sequence_pareto_reflections
+
+    @staticmethod
+    def _next_composition(blackbox_function: BlackboxFunction,
+                          sequence_pareto_reflections: Union[SequenceParetoReflections, ParetoReflection],
+                          ) -> Optional['CompositionWithParetoReflection']:
+        # composition with the next Pareto reflection (None if the end of the sequence is reached)
+        if isinstance(sequence_pareto_reflections, SequenceParetoReflections):
+            # compose: caution what if one returns None
+            pareto_reflection = sequence_pareto_reflections.next(blackbox_function)
+            if pareto_reflection is None:
+                return None
+            return CompositionWithParetoReflection(blackbox_function=blackbox_function,
+                                                   pareto_reflection=pareto_reflection)
+
+        elif isinstance(sequence_pareto_reflections, ParetoReflection):
+            return CompositionWithParetoReflection(blackbox_function=blackbox_function,
+                                                   pareto_reflection=sequence_pareto_reflections)
+
+        raise ValueError(
+            'sequence_pareto_reflections must be an instance of sequence '
+            'of Pareto reflections or a single Pareto reflection!')
+
+    @staticmethod
+    def _evaluate_concurrently(blackbox_function: BlackboxFunction,
+                               points: List[np.ndarray],
+                               workers: Optional[int] = None) -> None:
+        # the evaluations are stored (by the blackbox function) as they complete
+        print(f'\nEvaluating blackbox function at {len(points)} points...')
+        if blackbox_function.allow_batch_evaluation:
+            # the blackbox function parallelizes the evaluation itself
+            blackbox_function(np.array(points), batch_evaluation=True)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers or len(points)) as executor:
+            futures = [executor.submit(blackbox_function, point) for point in points]
+            for future in as_completed(futures):
+                future.result()
+
     @property
     def sequence_of_pareto_reflections(self) -> Union[SequenceParetoReflections, ParetoReflection, None]:
         """Optional: Underlying sequence of MOO algorithm
@@ -277,6 +470,13 @@ class CompositionWithParetoReflection(BlackboxFunction):
     In particular, its design space is given by the design space of the underlying blackbox function and its target
     space dimension is given by the dimension of the codomain dimension of the Pareto reflection.
 
+    The evaluations of the composition are not stored but computed lazily from the evaluations of the underlying
+    blackbox function (see :meth:`reflected <paref.blackbox_functions.evaluation_store.EvaluationStore.reflected>`),
+    i.e. the Pareto reflection is applied (in one batch call) only to evaluations which are new since the last access.
+
+    Composing a composition with a Pareto reflection collapses into one composition of the underlying blackbox
+    function with the chain of Pareto reflections.
+
     .. note::
 
         Calling this blackbox function will call the underlying blackbox function. In particular, this means that
@@ -284,6 +484,8 @@ class CompositionWithParetoReflection(BlackboxFunction):
 
     """
 
+    _store_evaluations = False
+
     def __init__(self, blackbox_function: BlackboxFunction, pareto_reflection: ParetoReflection):
         """Initilize blackbox function and Pareto reflection to be composed
 
@@ -300,10 +502,14 @@ class CompositionWithParetoReflection(BlackboxFunction):
             raise ValueError(
                 f'Dimension of target space ({blackbox_function.dimension_target_space}) of blackbox function and '
                 f'domain ({pareto_reflection.dimension_domain}) of Pareto reflection must match!')
-        self._blackbox_function = blackbox_function
-        self._pareto_reflection = pareto_reflection
-        self._evaluations = [[evaluation[0], pareto_reflection(evaluation[1])] for evaluation in
-                             blackbox_function._evaluations]
+        if isinstance(blackbox_function, CompositionWithParetoReflection):
+            self._pareto_reflections = (pareto_reflection,) + blackbox_function.pareto_reflections
+            self._blackbox_function = blackbox_function.blackbox_function
+            self._pareto_reflection = ComposeReflections(blackbox_function.pareto_reflection, pareto_reflection)
+        else:
+            self._pareto_reflections = (pareto_reflection,)
+            self._blackbox_function = blackbox_function
+            self._pareto_reflection = pareto_reflection
 
     def __call__(self, x: np.ndarray) -> np.ndarray:
         """Apply the composition to an input
@@ -323,6 +529,66 @@ class CompositionWithParetoReflection(BlackboxFunction):
         """
         return self._pareto_reflection(self._blackbox_function(x))
 
+    @property
+    def blackbox_function(self) -> BlackboxFunction:
+        """Underlying blackbox function
+
+        Returns
+        -------
+        BlackboxFunction
+            blackbox function (which is not a composition)
+
+        """
+        return self._blackbox_function
+
+    @property
+    def pareto_reflection(self) -> ParetoReflection:
+        """Pareto reflection composed with the underlying blackbox function
+
+        Returns
+        -------
+        ParetoReflection
+            (composition of the chain of) Pareto reflection(s)
+
+        """
+        return self._pareto_reflection
+
+    @property
+    def pareto_reflections(self) -> Tuple[ParetoReflection, ...]:
+        """Chain of Pareto reflections composed with the underlying blackbox function
+
+        Returns
+        -------
+        Tuple[ParetoReflection, ...]
+            Pareto reflections where the outermost (i.e. the last applied) comes first
+
+        """
+        return self._pareto_reflections
+
+    @property
+    def evaluations(self) -> EvaluationStore:
+        """
+
+        Returns
+        -------
+        EvaluationStore
+            (lazily computed, read-only) store of the evaluations of the composition
+
+        """
+        return self._blackbox_function.evaluations.reflected(self._pareto_reflection)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._blackbox_function.x
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.evaluations.y
+
+    @property
+    def pareto_front_indices(self) -> np.ndarray:
+        return self.evaluations.pareto_front_indices
+
     @property
     def dimension_design_space(self) -> int:
         """Dimension of design space
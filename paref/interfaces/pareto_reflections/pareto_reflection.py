@@ -2,6 +2,8 @@ from abc import abstractmethod
 
 import numpy as np
 
+from paref.pareto_dominance.non_dominated_sorting import non_dominated_indices
+
 
 class ParetoReflection:
     """Interface for Pareto reflections
@@ -15,6 +17,28 @@ class ParetoReflection:
     with this interface.
     """
 
+    def __setattr__(self, name: str, value) -> None:
+        # count the changes of the parameters (e.g. in order to invalidate values mapped by the Pareto reflection)
+        super().__setattr__(name, value)
+        if name != '_parameter_version':
+            super().__setattr__('_parameter_version', getattr(self, '_parameter_version', 0) + 1)
+
+    @property
+    def parameter_version(self) -> int:
+        """Counter of the changes of the parameters of the Pareto reflection
+
+        .. note::
+
+            Only assignments of attributes are counted (not changes of arrays in place).
+
+        Returns
+        -------
+        int
+            number which increases whenever an attribute of the Pareto reflection is set
+
+        """
+        return getattr(self, '_parameter_version', 0)
+
     @abstractmethod
     def __call__(self, x: np.ndarray) -> np.ndarray:
         """Call Pareto reflection to input
@@ -31,6 +55,28 @@ class ParetoReflection:
         """
         raise NotImplementedError
 
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        """Call Pareto reflection to several inputs at once
+
+        .. note::
+
+            By default, the Pareto reflection is called to each input separately.
+            Overwrite this method with a vectorized implementation if possible.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            inputs stored in 2-dimensional array with first dimension corresponding to the inputs
+
+        Returns
+        -------
+        np.ndarray
+            outputs of Pareto reflection applied to the inputs with first dimension corresponding to the inputs
+            (1-dimensional array if the codomain is 1-dimensional)
+
+        """
+        return np.array([self(point) for point in x])
+
     @property
     @abstractmethod
     def dimension_codomain(self) -> int:
@@ -71,16 +117,9 @@ class ParetoReflection:
             (Pareto) points of Pareto reflection restricted to points array
 
         """
-        array = [self(point) for point in points]
-        pareto_points_indices = []
-        for i, point in enumerate(array):
-            is_pareto = True
-            for j, other in enumerate(array):
-                if i == j:
-                    continue
-                if np.all(point >= other) and np.any(point > other):
-                    is_pareto = False
-                    break
-            if is_pareto:
-                pareto_points_indices.append(i)
-        return np.unique(np.array([points[i] for i in pareto_points_indices]), axis=0)
+        points = np.asarray(points)
+        if len(points) == 0:
+            return np.unique(points, axis=0)
+
+        pareto_points_indices = non_dominated_indices(self.batch_call(points))
+        return np.unique(points[pareto_points_indices], axis=0)
@@ -8,6 +8,22 @@ from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
 from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
 
 
+def _distinct(pareto_reflections: List[ParetoReflection]) -> List[ParetoReflection]:
+    # distinct Pareto reflections in their order (unhashable Pareto reflections are compared by identity)
+    distinct, hashable, identities = [], set(), set()
+    for pareto_reflection in pareto_reflections:
+        try:
+            if pareto_reflection in hashable:
+                continue
+            hashable.add(pareto_reflection)
+        except TypeError:
+            if id(pareto_reflection) in identities:
+                continue
+            identities.add(id(pareto_reflection))
+        distinct.append(pareto_reflection)
+    return distinct
+
+
 class SequenceParetoReflections:
     """Interface for pareto_reflections of Pareto reflections
 
@@ -57,6 +73,7 @@ class SequenceParetoReflections:
     def best_fits(self, points: np.ndarray) -> np.ndarray:
         """Return the Pareto points of Pareto reflections with respect to the variable points
 
+        Each distinct Pareto reflection is applied only once, even if it was used several times in the sequence.
 
         Parameters
         ----------
@@ -69,8 +86,11 @@ class SequenceParetoReflections:
             (Pareto) points of Pareto reflections restricted to points array
 
         """
-        best_fits = []
-        for pareto_reflection in self.used_pareto_reflections:
-            if pareto_reflection is not None:
-                best_fits += pareto_reflection.best_fits(points).tolist()
-        return np.unique(best_fits, axis=0)
+        # remove repeatedly used Pareto reflections (keeping the order)
+        pareto_reflections = _distinct([pareto_reflection for pareto_reflection in self.used_pareto_reflections
+                                        if pareto_reflection is not None])
+        best_fits = [pareto_reflection.best_fits(points) for pareto_reflection in pareto_reflections]
+        best_fits = [best_fit for best_fit in best_fits if len(best_fit) != 0]
+        if len(best_fits) == 0:
+            return np.unique(np.array([]), axis=0)
+        return np.unique(np.concatenate(best_fits), axis=0)
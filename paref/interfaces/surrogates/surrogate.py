@@ -0,0 +1,130 @@
+from abc import abstractmethod
+from typing import Union, Tuple
+
+import numpy as np
+
+
+class Surrogate:
+    """Interface for surrogates (models) of blackbox functions
+
+    A surrogate approximates the (vector valued) blackbox function on the basis of its evaluations and predicts
+    its value together with the uncertainty of the prediction (standard deviation) at any input.
+    Implement a surrogate with this interface in order to use it in the surrogate based minimizers, e.g. the
+    :py:class:`GPRMinimizer <paref.moo_algorithms.minimizer.gpr_minimizer.GPRMinimizer>`.
+    """
+
+    @abstractmethod
+    def fit(self, x: np.ndarray, y: np.ndarray, warm_start: bool = False) -> None:
+        """Fit the surrogate to evaluations
+
+        Parameters
+        ----------
+        x : np.ndarray
+            inputs stored in 2-dimensional array with first dimension corresponding to the evaluations
+
+        y : np.ndarray
+            outputs stored in 2-dimensional array with first dimension corresponding to the evaluations
+
+        warm_start : bool default False
+            if true and the surrogate was already fitted, the fit may start from the previous one
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def partial_fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Add evaluations to the fitted surrogate (without refitting its hyperparameters)
+
+        Parameters
+        ----------
+        x : np.ndarray
+            new inputs stored in 2-dimensional array with first dimension corresponding to the evaluations
+
+        y : np.ndarray
+            new outputs stored in 2-dimensional array with first dimension corresponding to the evaluations
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def predict(self, x: np.ndarray, return_std: bool = True) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Predict mean and standard deviation at several inputs at once
+
+        Parameters
+        ----------
+        x : np.ndarray
+            inputs stored in 2-dimensional array with first dimension corresponding to the inputs
+
+        return_std : bool default True
+            return the standard deviation as well
+
+        Returns
+        -------
+        Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+            mean (and standard deviation) of shape (number of inputs, number of outputs)
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, path: str) -> None:
+        """Save the fitted surrogate to a file
+
+        Parameters
+        ----------
+        path : str
+            path to file
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def load(self, path: str) -> None:
+        """Load a fitted surrogate from a file
+
+        Parameters
+        ----------
+        path : str
+            path to file
+
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def number_training_points(self) -> int:
+        """Number of evaluations the surrogate is fitted to
+
+        Returns
+        -------
+        int
+            number of evaluations the surrogate is fitted to
+
+        """
+        raise NotImplementedError
+
+    @property
+    def model_convergence(self) -> np.ndarray:
+        """Measure of the convergence of the fit of each output (0 if converged)
+
+        Returns
+        -------
+        np.ndarray
+            convergence of the fit of each output (values above 0.1 indicate that the fit has not converged)
+
+        """
+        return np.zeros(1)
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """Predict the mean at one input (1-dimensional array) or several inputs (2-dimensional array)
+        """
+        if x.ndim == 1:
+            return self.predict(x, return_std=False)[0]
+        return self.predict(x, return_std=False)
+
+    def std(self, x: np.ndarray) -> np.ndarray:
+        """Predict the standard deviation at one input (1-dimensional array) or several inputs (2-dimensional array)
+        """
+        if x.ndim == 1:
+            return self.predict(x)[1][0]
+        return self.predict(x)[1]
@@ -1,68 +1,239 @@
-from typing import List
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Callable, List, Optional
+
+import numpy as np
 
 from paref.blackbox_functions.design_space.bounds import Bounds
+from paref.blackbox_functions.evaluation_store import EvaluationStore
+from paref.blackbox_functions.parallel_blackbox_function import evaluate_without_storing
 from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
 from paref.interfaces.moo_algorithms.paref_moo import ParefMOO, CompositionWithParetoReflection
+from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
 from paref.moo_algorithms.minimizer.gpr_minimizer import DifferentialEvolution
-from paref.moo_algorithms.multi_dimensional.min_g import calculate_optimal_scaling_x, calculate_optimal_scaling_g
+from paref.moo_algorithms.minimizer.optimal_scaling import OptimalScaling
 from paref.pareto_reflections.minimize_g import MinGParetoReflection
+from paref.pareto_reflections.operations.compile_reflection import compile_reflection
 from paref.pareto_reflections.operations.compose_reflections import ComposeReflections
 
 
+class ReflectedFunction:
+    """Composition of a function with a Pareto reflection
+
+    In contrast to a lambda, the composition can be pickled (e.g. in order to be evaluated by several processes) if
+    the function and the Pareto reflection can be pickled.
+    """
+
+    def __init__(self, function: Callable, pareto_reflection: ParetoReflection):
+        self.function = function
+        self.pareto_reflection = pareto_reflection
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return self.pareto_reflection(self.function(x))
+
+
+class ParallelSearchObjective:
+    """Vectorized objective evaluating each population on the workers of the minimizer and storing the evaluations
+
+    The workers evaluate the blackbox function without storing (in the copies of the blackbox function of the
+    processes). Instead, the evaluations are collected and stored in the blackbox function of the calling process.
+    """
+
+    def __init__(self,
+                 blackbox_function: BlackboxFunction,
+                 pareto_reflection: Optional[ParetoReflection],
+                 map_function: Callable):
+        # the workers only need the blackbox function itself (not its evaluations)
+        self.blackbox_function = blackbox_function
+        self.task_function = copy.copy(blackbox_function)
+        self.task_function._evaluations = EvaluationStore()
+        self.task_function._cache, self.task_function._journal = None, None
+        self.pareto_reflection = pareto_reflection
+        self.map_function = map_function
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        y = np.concatenate(list(self.map_function(partial(evaluate_without_storing, self.task_function),
+                                                  [point[np.newaxis] for point in x])))
+        self.blackbox_function.store_evaluations(x, y)
+        return y if self.pareto_reflection is None else self.pareto_reflection.batch_call(y)
+
+
 class DifferentialEvolutionMinimizer(ParefMOO):
-    def __init__(self):
-        self._minimizer = DifferentialEvolution()
-        self._scaling_x = None
+    def __init__(self,
+                 workers: int = 1,
+                 minimizer: Optional[DifferentialEvolution] = None,
+                 seed_with_pareto_set: bool = False,
+                 keep_search_evaluations: bool = False, ):
+        """
 
-    def apply_moo_operation(self, blackbox_function: BlackboxFunction) -> None:
+        Parameters
+        ----------
+        workers : int default 1
+            number of threads on which the blackbox function is evaluated in parallel during the search for the
+            optimal scalings of the Pareto reflections (the blackbox function must be thread-safe then)
+
+        minimizer : Optional[DifferentialEvolution] default None
+            configured differential evolution, e.g. DifferentialEvolution(workers=-1) in order to evaluate the
+            population of each generation on all cores (None: default differential evolution)
+
+        seed_with_pareto_set : bool default False
+            seed the initial population with the inputs of the Pareto optimal evaluations of the blackbox function
+
+        keep_search_evaluations : bool default False
+            keep the evaluations of the blackbox function during the searches (tagged 'search') instead of
+            discarding them. The evaluation at the minimizer is reused (tagged 'proposal') instead of evaluating the
+            blackbox function again and all previous evaluations seed the searches of later iterations (and are
+            used by any surrogate trained on the evaluations). If the minimizer has several workers, each population
+            is evaluated by the workers and the evaluations are collected in this process. The evaluations of the
+            searches are not recorded in the journal of the blackbox function
+        """
+        self._minimizer = DifferentialEvolution() if minimizer is None else minimizer
+        self._optimal_scaling = OptimalScaling(workers=workers)
+        self._seed_with_pareto_set = seed_with_pareto_set
+        self._keep_search_evaluations = keep_search_evaluations
+        self._proposal_index = None
+
+    def propose(self, blackbox_function: BlackboxFunction) -> np.ndarray:
+        """Minimize the composition of the blackbox function with the Pareto reflection(s)
+
+        The evaluations of the blackbox function during the search are discarded (unless keep_search_evaluations).
+
+        Parameters
+        ----------
+        blackbox_function : BlackboxFunction
+            blackbox function to which algorithm is applied
+
+        Returns
+        -------
+        np.ndarray
+            proposed (potential) Pareto point
+
+        """
         if not isinstance(blackbox_function.design_space, Bounds):
             raise ValueError('Design space property of blackbox function must be an instance of Bounds!')
 
         base_blackbox_function = blackbox_function
-        length_evaluations = len(base_blackbox_function.evaluations)
+        self._proposal_index = None
 
         #####
         # extract Pareto reflections
         pareto_reflections = []
-        while isinstance(base_blackbox_function, CompositionWithParetoReflection):
-            pareto_reflections.append(base_blackbox_function._pareto_reflection)
-            base_blackbox_function = base_blackbox_function._blackbox_function
-
-        # compute optimal scaling whenever MinGParetoReflection is used
-
-        if isinstance(pareto_reflections[0], MinGParetoReflection):
-            print('Calculating optimal scaling...')
-            if len(pareto_reflections) > 1:
-                pareto_reflection = pareto_reflections[1]
-                for reflection in pareto_reflections[2:]:
-                    pareto_reflection = ComposeReflections(reflection, pareto_reflection)
-                base_fun = lambda x: pareto_reflection(base_blackbox_function(x))
-            else:
-                base_fun = lambda x: base_blackbox_function(x)
+        if isinstance(base_blackbox_function, CompositionWithParetoReflection):
+            pareto_reflections = list(base_blackbox_function.pareto_reflections)
+            base_blackbox_function = base_blackbox_function.blackbox_function
+        length_evaluations = len(base_blackbox_function.evaluations)
 
-            if self._scaling_x is None:
-                self._scaling_x = calculate_optimal_scaling_x(base_fun, blackbox_function)
-            pareto_reflections[0].g.scaling_x = self._scaling_x
-            pareto_reflections[0].g.scaling_g = calculate_optimal_scaling_g(base_fun, pareto_reflections[0].g,
-                                                                            blackbox_function)
-            fun = lambda x: pareto_reflections[0](base_fun(x))
+        # evaluations before the blackbox function is evaluated by the search for the optimal scalings
+        archive_x, archive_y = np.array(base_blackbox_function.x), np.array(base_blackbox_function.y)
+        init = None
+        if self._seed_with_pareto_set and length_evaluations != 0:
+            init = base_blackbox_function.x[base_blackbox_function.pareto_front_indices]
+        use_archive = self._keep_search_evaluations and length_evaluations != 0
 
-        else:
-            fun = blackbox_function
+        # the evaluations of the search are tagged (and hence not recorded in the journal) even if they are discarded
+        with base_blackbox_function.tag_evaluations('search'):
+            # compute optimal scaling whenever MinGParetoReflection is used
+
+            if len(pareto_reflections) != 0 and isinstance(pareto_reflections[0], MinGParetoReflection):
+                print('Calculating optimal scaling...')
+                pareto_reflection = None
+                archive_values = archive_y
+                if len(pareto_reflections) > 1:
+                    pareto_reflection = pareto_reflections[1]
+                    for reflection in pareto_reflections[2:]:
+                        pareto_reflection = ComposeReflections(reflection, pareto_reflection)
+                    base_fun = ReflectedFunction(base_blackbox_function, compile_reflection(pareto_reflection))
+                    if use_archive:
+                        archive_values = pareto_reflection.batch_call(archive_y)
+                else:
+                    base_fun = base_blackbox_function
+
+                # the scalings are cached for each reflection as long as no evaluation is stored (e.g. for the
+                # proposals of a batch), since the evaluations seed the searches
+                pareto_reflections[0].scaling_x, pareto_reflections[0].scaling_g = self._optimal_scaling(
+                    base_fun,
+                    pareto_reflections[0].g,
+                    upper_bounds=blackbox_function.design_space.upper_bounds,
+                    lower_bounds=blackbox_function.design_space.lower_bounds,
+                    surrogate_version=length_evaluations,
+                    key=(pareto_reflections[0], pareto_reflection),
+                    init=(archive_x, archive_values) if use_archive else None)
+                fun = ReflectedFunction(base_fun, pareto_reflections[0])
+
+            elif len(pareto_reflections) != 0:
+                # the chain of Pareto reflections is applied by a single compiled pipeline
+                fun = ReflectedFunction(base_blackbox_function, compile_reflection(blackbox_function.pareto_reflection))
+
+            else:
+                fun = blackbox_function
+
+            if use_archive:
+                init = self._best_evaluations(archive_x, archive_y, pareto_reflections,
+                                              len(blackbox_function.design_space.lower_bounds))
 
-        if isinstance(blackbox_function.design_space, Bounds):
             print('Starting optimization...')
-            res = self._minimizer(
-                function=lambda x: fun(x),
-                upper_bounds=blackbox_function.design_space.upper_bounds,
-                lower_bounds=blackbox_function.design_space.lower_bounds,
-            )
-        else:
-            raise ValueError('Design space property of blackbox function must be an instance of Bounds!')
+            vectorized, executor = False, None
+            if self._keep_search_evaluations and self._minimizer.workers != 1:
+                # the evaluations of worker processes would be lost, hence the populations are distributed here
+                if isinstance(self._minimizer.workers, int):
+                    executor = ProcessPoolExecutor(
+                        max_workers=None if self._minimizer.workers == -1 else self._minimizer.workers)
+                fun = ParallelSearchObjective(
+                    base_blackbox_function,
+                    compile_reflection(blackbox_function.pareto_reflection) if len(pareto_reflections) != 0 else None,
+                    self._minimizer.workers if executor is None else executor.map)
+                vectorized = True
+            try:
+                res = self._minimizer(
+                    function=fun,
+                    upper_bounds=blackbox_function.design_space.upper_bounds,
+                    lower_bounds=blackbox_function.design_space.lower_bounds,
+                    vectorized=vectorized,
+                    init=init,
+                )
+            finally:
+                if executor is not None:
+                    executor.shutdown()
 
         print('finished!')
-        base_blackbox_function.evaluations = base_blackbox_function.evaluations[:length_evaluations]
-        base_blackbox_function(res)
+        if not self._keep_search_evaluations:
+            base_blackbox_function.truncate_evaluations(length_evaluations)
+            return res
+
+        # reuse the evaluation at the minimizer
+        matches = np.flatnonzero(np.all(base_blackbox_function.x[length_evaluations:] == res, axis=1))
+        if len(matches) != 0:
+            self._proposal_index = length_evaluations + matches[-1]
+            with base_blackbox_function.evaluations._lock:
+                base_blackbox_function.evaluations.tag(self._proposal_index, 'proposal')
+                if base_blackbox_function.journal is not None:
+                    # the proposal is the only journaled evaluation of the search (i.e. it is the last one journaled)
+                    base_blackbox_function.journal.append(*base_blackbox_function.evaluations[self._proposal_index])
+        return res
+
+    def _best_evaluations(self,
+                          x: np.ndarray,
+                          y: np.ndarray,
+                          pareto_reflections: List[ParetoReflection],
+                          dimension: int) -> np.ndarray:
+        # the inputs of the evaluations minimizing the composition (filling half of the population)
+        values = y
+        for pareto_reflection in reversed(pareto_reflections):
+            values = pareto_reflection.batch_call(values)
+        number_seeds = self._minimizer.population_size(dimension) // 2
+        return x[np.argsort(np.asarray(values).reshape(len(x)))[:number_seeds]]
+
+    def apply_moo_operation(self, blackbox_function: BlackboxFunction) -> None:
+        res = self.propose(blackbox_function)
+        base_blackbox_function = blackbox_function
+        if isinstance(base_blackbox_function, CompositionWithParetoReflection):
+            base_blackbox_function = base_blackbox_function.blackbox_function
+        if self._proposal_index is None:
+            with base_blackbox_function.tag_evaluations('proposal') if self._keep_search_evaluations \
+                    else nullcontext():
+                base_blackbox_function(res)
         # print('Value of blackbox: ', base_blackbox_function.y[-1])
 
     @property
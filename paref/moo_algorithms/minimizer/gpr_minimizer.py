@@ -1,40 +1,163 @@
+import pickle
 from time import sleep
-from typing import Callable
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 from scipy.optimize import differential_evolution
+from scipy.stats import qmc
 from warnings import warn
 
 from paref.blackbox_functions.design_space.bounds import Bounds
 from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
 from paref.interfaces.moo_algorithms.paref_moo import ParefMOO, CompositionWithParetoReflection
+from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
+from paref.interfaces.surrogates.surrogate import Surrogate
+from paref.moo_algorithms.minimizer.optimal_scaling import OptimalScaling
 from paref.moo_algorithms.minimizer.surrogates.gpr import GPR
 from paref.pareto_reflections.minimize_g import MinGParetoReflection
+from paref.pareto_reflections.operations.compile_reflection import compile_reflection
 from paref.pareto_reflections.operations.compose_reflections import ComposeReflections
 
 
+class VectorizedObjective:
+    """Objective passed to scipy if the function is vectorized
+
+    scipy passes populations of shape (dimension, number of points) and single points when polishing.
+    The objective can be pickled (e.g. in order to be evaluated by several processes) if the function can be pickled.
+    """
+
+    def __init__(self, function: Callable):
+        self.function = function
+
+    def __call__(self, x: np.ndarray):
+        values = np.asarray(self.function(np.atleast_2d(x.T))).reshape(-1)
+        return values if x.ndim == 2 else values[0]
+
+
 class DifferentialEvolution:
-    def __init__(self, display=False):
+    def __init__(self,
+                 display=False,
+                 tol: float = 1e-5,
+                 popsize: int = 15,
+                 polish: bool = True,
+                 workers: Union[int, Callable] = 1,
+                 callback: Optional[Callable] = None,
+                 seed: Optional[int] = None, ):
+        """
+
+        Parameters
+        ----------
+        display : bool default False
+            display the progress of the optimization
+
+        tol : float default 1e-5
+            relative tolerance of the convergence
+
+        popsize : int default 15
+            the size of the population is popsize times the dimension of the design space
+
+        polish : bool default True
+            polish the best member of the population by L-BFGS-B at the end
+
+        workers : Union[int, Callable] default 1
+            evaluate the population on workers processes (-1: all cores) or by a map-like callable.
+            The function must be picklable then (e.g. an instance of a module level class instead of a lambda).
+            If the function is vectorized, the population is evaluated at once instead
+
+        callback : Optional[Callable] default None
+            function called after each generation (see scipy's differential_evolution)
+
+        seed : Optional[int] default None
+            seed of the random number generator
+        """
         self.display = display
+        self._tol = tol
+        self._popsize = popsize
+        self._polish = polish
+        self._workers = workers
+        self._callback = callback
+        self._seed = seed
         self._number_evaluations_last_call = None
 
+    def _initial_population(self, init: np.ndarray, upper_bounds: np.ndarray, lower_bounds: np.ndarray):
+        # seeds (clipped to the bounds) completed by a latin hypercube sample
+        size = self.population_size(len(lower_bounds))
+        seeds = np.clip(np.atleast_2d(init), lower_bounds, upper_bounds)[:size]
+        sample = qmc.LatinHypercube(d=len(lower_bounds), seed=self._seed).random(size - len(seeds))
+        return np.concatenate((seeds, qmc.scale(sample, lower_bounds, upper_bounds))) if len(seeds) < size else seeds
+
     def __call__(
             self,
             function: Callable,
             upper_bounds: np.ndarray,
             lower_bounds: np.ndarray,
             max_iter: int = 300,
+            vectorized: bool = False,
+            init: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        t_initial = (upper_bounds + lower_bounds) / 2
+        """Minimize a function over the cube given by the bounds
+
+        Parameters
+        ----------
+        function : Callable
+            function to be minimized
+
+        upper_bounds : np.ndarray
+            upper bounds of the cube
+
+        lower_bounds : np.ndarray
+            lower bounds of the cube
+
+        max_iter : int default 300
+            maximum number of generations
+
+        vectorized : bool default False
+            if true, function is called with the whole population at once, i.e. it must map an array of shape
+            (number of points, dimension) to an array of shape (number of points,)
+
+        init : Optional[np.ndarray] default None
+            points seeding the initial population (e.g. the current Pareto set) stored in 2-dimensional array with
+            first dimension corresponding to the points. The remaining members are sampled by a latin hypercube.
+            If None, the initial population is sampled by a latin hypercube and contains the center of the cube
+
+        Returns
+        -------
+        np.ndarray
+            (approximate) minimizer of the function
+
+        """
+        parallel = not vectorized and self._workers != 1
+        if parallel and isinstance(self._workers, int):
+            try:
+                pickle.dumps(function)
+            except (pickle.PicklingError, AttributeError, TypeError) as error:
+                raise ValueError('Function must be picklable in order to be evaluated by several processes! Use an '
+                                 'instance of a module level class instead of a lambda or local function.') from error
+
+        func = VectorizedObjective(function) if vectorized else function
+        if init is None:
+            x0, population = (upper_bounds + lower_bounds) / 2, 'latinhypercube'
+        else:
+            x0, population = None, self._initial_population(init, upper_bounds, lower_bounds)
+
         res = differential_evolution(
-            func=function,
-            x0=t_initial,
+            func=func,
+            x0=x0,
+            init=population,
             disp=self.display,
-            tol=1e-5,
+            tol=self._tol,
+            popsize=self._popsize,
+            polish=self._polish,
+            callback=self._callback,
+            seed=self._seed,
             bounds=[
                 (lower_bounds[i], upper_bounds[i]) for i in range(len(lower_bounds))
             ],
             maxiter=max_iter,
+            vectorized=vectorized,
+            # the population is evaluated at once if vectorized or parallel
+            updating='deferred' if vectorized or parallel else 'immediate',
+            workers=self._workers if parallel else 1,
         )
 
         self.result = res
@@ -45,54 +168,59 @@ class DifferentialEvolution:
     def number_evaluations_last_call(self):
         return self._number_evaluations_last_call
 
+    @property
+    def popsize(self) -> int:
+        """
 
-def calculate_optimal_scaling_x(fun, blackbox_function, max_iter_minimizer: int = 500):
-    # scale each component to [0,1]
-    dim_f = len(fun(blackbox_function.design_space.upper_bounds))
-    minimizer = DifferentialEvolution()
-    x_min = np.zeros(dim_f)
-    x_max = np.zeros(dim_f)
-    for i in range(len(x_min)):
-        res_i_min = minimizer(
-            function=lambda x: fun(x)[i],
-            max_iter=max_iter_minimizer,
-            upper_bounds=blackbox_function.design_space.upper_bounds,
-            lower_bounds=blackbox_function.design_space.lower_bounds,
-        )
-        res_i_max = minimizer(
-            function=lambda x: -fun(x)[i],
-            max_iter=max_iter_minimizer,
-            upper_bounds=blackbox_function.design_space.upper_bounds,
-            lower_bounds=blackbox_function.design_space.lower_bounds,
-        )
-        x_min[i] = fun(res_i_min)[i]
-        x_max[i] = fun(res_i_max)[i]
+        Returns
+        -------
+        int
+            the size of the population is popsize times the dimension of the design space
 
-    return lambda x: (x - x_min) / (x_max - x_min)
+        """
+        return self._popsize
 
+    def population_size(self, dimension: int) -> int:
+        """Size of the population
 
-def calculate_optimal_scaling_g(fun, g, blackbox_function, max_iter_minimizer: int = 500):
-    # Scale g and each component to [0,1]
-    minimizer = DifferentialEvolution()
-    res_g = minimizer(
-        function=lambda x: g(fun(x)),
-        max_iter=max_iter_minimizer,
-        upper_bounds=blackbox_function.design_space.upper_bounds,
-        lower_bounds=blackbox_function.design_space.lower_bounds,
-    )
+        Parameters
+        ----------
+        dimension : int
+            dimension of the design space
 
-    res_g_max = minimizer(
-        function=lambda x: -g(fun(x)),
-        max_iter=max_iter_minimizer,
-        upper_bounds=blackbox_function.design_space.upper_bounds,
-        lower_bounds=blackbox_function.design_space.lower_bounds,
-    )
+        Returns
+        -------
+        int
+            number of members of the population (at least 5)
+
+        """
+        return max(self._popsize * dimension, 5)
+
+    @property
+    def workers(self) -> Union[int, Callable]:
+        """
+
+        Returns
+        -------
+        Union[int, Callable]
+            number of processes (-1: all cores) or map-like callable evaluating the population
+
+        """
+        return self._workers
 
-    xg_min = fun(res_g)
-    gxg_min = g(xg_min)
-    xg_max = fun(res_g_max)
-    gxg_max = g(xg_max)
-    return lambda x: (x - gxg_min) / (gxg_max - gxg_min)
+
+def apply_pareto_reflection(pareto_reflection, y: np.ndarray, vectorized: bool = False):
+    # apply the Pareto reflection to a single point or (if vectorized) to an array of points at once
+    if vectorized:
+        return pareto_reflection.batch_call(y)
+    return pareto_reflection(y)
+
+
+def get_g(pareto_reflection: MinGParetoReflection, vectorized: bool = False):
+    # g of the Pareto reflection applied to a single point or (if vectorized) to an array of points at once
+    if vectorized:
+        return pareto_reflection.batch_g
+    return pareto_reflection.g
 
 
 class GPRMinimizer(ParefMOO):
@@ -130,7 +258,18 @@ class GPRMinimizer(ParefMOO):
                  max_iter_minimizer: int = 500,
                  training_iter: int = 2000,
                  learning_rate: float = 0.05,
-                 min_distance_to_evaluated_points: float = 2e-2, ):
+                 min_distance_to_evaluated_points: float = 2e-2,
+                 vectorized: bool = False,
+                 warm_start: bool = False,
+                 training_tolerance: Optional[float] = None,
+                 training_patience: int = 10,
+                 max_training_time: Optional[float] = None,
+                 training_optimizer: str = 'adam',
+                 hyperparameter_update_interval: int = 1,
+                 sparse_gpr_threshold: Optional[int] = 5000,
+                 surrogate_factory: Optional[Callable[[], Surrogate]] = None,
+                 workers: int = 1,
+                 fantasization: str = 'constant_liar', ):
         """Initialize the algorithms hyperparameters
 
         Parameters
@@ -149,43 +288,145 @@ class GPRMinimizer(ParefMOO):
 
         min_distance_to_evaluated_points : float default 2e-2
             required minimum distance to already evaluated points
+
+        vectorized : bool default False
+            evaluate the GPR(s) at the whole population of the differential evolution at once instead of point by
+            point
+
+        warm_start : bool default False
+            keep the GPR(s) between the iterations and continue their training from the previously trained
+            hyperparameters
+
+        training_tolerance : Optional[float] default None
+            stop the training of a GPR once the relative change of its loss falls below this tolerance
+            (None: always train for training_iter iterations)
+
+        training_patience : int default 10
+            number of iterations without sufficient improvement of the loss after which the training of a GPR stops
+            (only if training_tolerance is given)
+
+        max_training_time : Optional[float] default None
+            maximum wall time of the training of a GPR in seconds (None: no limit)
+
+        training_optimizer : str default 'adam'
+            optimizer of the hyperparameters of the GPR(s), either 'adam' or 'lbfgs'
+
+        hyperparameter_update_interval : int default 1
+            train the hyperparameters of the GPR(s) only in every hyperparameter_update_interval-th iteration.
+            In between, the new evaluations are added to the cached Cholesky factor of the GPR(s) with frozen
+            hyperparameters in O(n^2) instead of retraining
+
+        sparse_gpr_threshold : Optional[int] default 5000
+            if the number of evaluations exceeds this threshold, sparse variational GPRs (trained by minibatches)
+            are used instead of exact GPRs (None: always use exact GPRs)
+
+        surrogate_factory : Optional[Callable[[], Surrogate]] default None
+            function returning a new (unfitted) :py:class:`surrogate <paref.interfaces.surrogates.surrogate.Surrogate>`
+            which is used instead of the GPR(s) (None: use the GPR(s)). The training parameters above which are
+            specific to the GPR (training_iter, learning_rate, training_tolerance, training_patience,
+            max_training_time, training_optimizer and sparse_gpr_threshold) are ignored then
+
+        workers : int default 1
+            number of threads on which the surrogate is evaluated in parallel during the search for the optimal
+            scalings of the Pareto reflections
+
+        fantasization : str default 'constant_liar'
+            fantasized evaluation at the previously proposed points of a batch proposal, either 'constant_liar'
+            (maximum of the evaluations in each component, i.e. a pessimistic lie) or 'kriging_believer' (prediction
+            of the GPR(s))
         """
+        if fantasization not in ('constant_liar', 'kriging_believer'):
+            raise ValueError(f'Fantasization must be either \'constant_liar\' or \'kriging_believer\'! '
+                             f'Fantasization is {fantasization}.')
         self._minimizer = DifferentialEvolution()
         self._max_iter_minimizer = max_iter_minimizer
         self._training_iter = training_iter
         self._learning_rate = learning_rate
         self._min_distance_to_evaluated_points = min_distance_to_evaluated_points
+        self._vectorized = vectorized
+        self._warm_start = warm_start
+        self._training_tolerance = training_tolerance
+        self._training_patience = training_patience
+        self._max_training_time = max_training_time
+        self._training_optimizer = training_optimizer
+        self._hyperparameter_update_interval = hyperparameter_update_interval
+        self._sparse_gpr_threshold = sparse_gpr_threshold
+        self._surrogate_factory = surrogate_factory
+        self._optimal_scaling = OptimalScaling(max_iter=max_iter_minimizer, vectorized=vectorized,
+                                               workers=workers)
+        self._number_gpr_fits = 0
         self._gpr = None
+        self._gpr_backend = None
+        self._fantasization = fantasization
+        self._fantasized = False
+
+    def _new_surrogate(self, backend: Optional[str]) -> Surrogate:
+        if self._surrogate_factory is not None:
+            return self._surrogate_factory()
+        return GPR(training_iter=self._training_iter, learning_rate=self._learning_rate,
+                   tolerance=self._training_tolerance, patience=self._training_patience,
+                   max_time=self._max_training_time, optimizer=self._training_optimizer,
+                   cache_posterior=backend == 'exact' and self._hyperparameter_update_interval > 1,
+                   backend=backend)
+
+    def _train_gpr(self, train_x: np.ndarray, train_y: np.ndarray) -> Surrogate:
+        gpr = self._gpr
+        self._number_gpr_fits += 1
+        # the backend is only switched for the default GPR
+        backend = None
+        if self._surrogate_factory is None:
+            backend = 'exact'
+            if self._sparse_gpr_threshold is not None and len(train_x) > self._sparse_gpr_threshold:
+                backend = 'sparse'
+        if backend != self._gpr_backend:
+            gpr = None
+        # fantasized evaluations of a batch proposal are discarded by refitting
+        fantasized, self._fantasized = self._fantasized, False
+
+        # add new evaluations to the fitted surrogate with frozen hyperparameters between hyperparameter updates
+        if (gpr is not None and backend != 'sparse' and not fantasized
+                and (self._number_gpr_fits - 1) % self._hyperparameter_update_interval != 0
+                and len(train_x) >= gpr.number_training_points):
+            gpr.partial_fit(train_x[gpr.number_training_points:], train_y[gpr.number_training_points:])
+            return gpr
+
+        # reuse the surrogate of the last iteration if warm started
+        if not self._warm_start or gpr is None:
+            gpr = self._new_surrogate(backend)
+            self._gpr_backend = backend
+        gpr.fit(train_x, train_y, warm_start=self._warm_start)
+        return gpr
+
+    def _scale(self,
+               pareto_reflection: MinGParetoReflection,
+               fun: Callable,
+               blackbox_function: BlackboxFunction,
+               inner_reflection=None) -> None:
+        # scale g and each component to [0,1], the scalings are cached as long as the surrogate is not refitted
+        pareto_reflection.scaling_x, pareto_reflection.scaling_g = self._optimal_scaling(
+            fun,
+            get_g(pareto_reflection, self._vectorized),
+            upper_bounds=blackbox_function.design_space.upper_bounds,
+            lower_bounds=blackbox_function.design_space.lower_bounds,
+            surrogate_version=self._number_gpr_fits,
+            key=(pareto_reflection, inner_reflection))
+        pareto_reflection._epsilon = 2e-2  # smaller epsilon have empirically shown to lead to instabilities
 
-    def apply_moo_operation(self,
-                            blackbox_function: BlackboxFunction,
-                            ) -> None:
-        """Apply moo operation constructed as above
-
-        Parameters
-        ----------
-        blackbox_function : BlackboxFunction
-            blackbox function to which algorithm is applied
-
-
-        """
-        # TBA: when found points are too close stop!
-        # TBA: control mechanism: when algo doesn't work give message about what went wrong
-        # TBA: monitoring: stop time, evaluations found, if training process of gpr converged, all with hints
-
-        if len(blackbox_function.y) < 20:
+    def _unwrap(self, blackbox_function: BlackboxFunction) -> Tuple[BlackboxFunction, List[ParetoReflection]]:
+        # underlying blackbox function and Pareto reflections (outermost first) of a composition
+        if len(blackbox_function.x) < 20:
             raise ValueError('Blackbox function must have at least 20 evaluations! Apply the latin hypercube sampling '
                              '(blackbox_function.perform_lhc(n=20)) first!')
 
-        gpr = GPR(training_iter=self._training_iter, learning_rate=self._learning_rate, )
-
         base_blackbox_function = blackbox_function
 
         pareto_reflections = []
-        while isinstance(base_blackbox_function, CompositionWithParetoReflection):
-            pareto_reflections.append(base_blackbox_function._pareto_reflection)
-            base_blackbox_function = base_blackbox_function._blackbox_function
+        if isinstance(base_blackbox_function, CompositionWithParetoReflection):
+            pareto_reflections = list(base_blackbox_function.pareto_reflections)
+            base_blackbox_function = base_blackbox_function.blackbox_function
+        return base_blackbox_function, pareto_reflections
 
+    def _fit_surrogate(self, base_blackbox_function: BlackboxFunction) -> Surrogate:
         train_x = base_blackbox_function.x
         train_y = base_blackbox_function.y
         print('\n=========================================================='
@@ -195,7 +436,7 @@ class GPRMinimizer(ParefMOO):
         )
         sleep(0.1)  # ensure that the print statement is displayed before the training starts
 
-        gpr.train(train_x=train_x, train_y=train_y)
+        gpr = self._train_gpr(train_x=train_x, train_y=train_y)
         if np.any(gpr.model_convergence > 0.1):
             warn(
                 'GPRs may have not converged! \n'
@@ -203,40 +444,56 @@ class GPRMinimizer(ParefMOO):
                 'You can check the convergence of the training by self._gpr.plot_loss().', RuntimeWarning)
             sleep(1)
         self._gpr = gpr
+        return gpr
 
-        if len(pareto_reflections) != 0:
-            pareto_reflection = pareto_reflections[0]
-            for reflection in pareto_reflections[1:]:
-                pareto_reflection = ComposeReflections(reflection, pareto_reflection)
+    def _check_proposal(self, res: np.ndarray, gpr: Surrogate, blackbox_function: BlackboxFunction) -> None:
+        prediction, standard_deviation = (value[0] for value in gpr.predict(res))
+        print(
+            f'\n Found Pareto point: \n x={res} '
+            f'\n prediction={prediction} '
+            f'\n standard deviation={standard_deviation}')
+        if np.any(np.all(prediction >= gpr(blackbox_function.x), axis=1)):
+            warn(
+                'Optimizer did not find a Pareto point! \n'
+                'Try more minimizer iterations (max_iter_minimizer).', RuntimeWarning)
+            sleep(1)
 
+    def _propose(self, blackbox_function: BlackboxFunction, train: bool = True) -> np.ndarray:
+        # TBA: when found points are too close stop!
+        # TBA: control mechanism: when algo doesn't work give message about what went wrong
+        # TBA: monitoring: stop time, evaluations found, if training process of gpr converged, all with hints
+        base_blackbox_function, pareto_reflections = self._unwrap(blackbox_function)
+        gpr = self._fit_surrogate(base_blackbox_function) if train or self._gpr is None else self._gpr
+
+        # if vectorized, the surrogate is evaluated at the whole population of the minimizer at once
+        vectorized = self._vectorized
+        if vectorized:
+            surrogate = lambda x: gpr.predict(x, return_std=False)
+        else:
+            surrogate = lambda x: gpr(x)
+
+        if len(pareto_reflections) != 0:
+            # compose the Pareto reflections from the innermost (last) one outwards, each MinGParetoReflection is scaled
+            # with respect to the composition of the surrogate and the Pareto reflections applied before it
             pareto_reflection = pareto_reflections[-1]
-            # calculate optimal scaling for first pareto reflection
-            if isinstance(pareto_reflections[-1], MinGParetoReflection):
+            if isinstance(pareto_reflection, MinGParetoReflection):
                 print('\nCalculating optimal scaling...')
-                pareto_reflections[-1].scaling_x = calculate_optimal_scaling_x(lambda x: gpr(x), blackbox_function)
-                pareto_reflections[-1].scaling_g = calculate_optimal_scaling_g(lambda x: gpr(x),
-                                                                               pareto_reflections[-1].g,
-                                                                               blackbox_function)
-                pareto_reflections[-1]._epsilon = 2e-2
-            if len(pareto_reflections) > 1:
-                for i in range(1, len(pareto_reflections) + 1):
-                    # calculate optimal scaling if pareto reflection is a MinGParetoReflection
-                    if isinstance(pareto_reflections[-i], MinGParetoReflection):
-                        print('\nCalculating optimal scaling...')
-                        pareto_reflections[-i].scaling_x = calculate_optimal_scaling_x(
-                            lambda x: pareto_reflection(gpr(x)),
-                            blackbox_function)
-                        pareto_reflections[-i].scaling_g = calculate_optimal_scaling_g(
-                            lambda x: pareto_reflection(gpr(x)),
-                            pareto_reflections[-i].g,
-                            blackbox_function)
-                        pareto_reflections[-i]._epsilon = 2e-2
-                    pareto_reflection = ComposeReflections(pareto_reflection, pareto_reflections[-i])
-
-            fun = lambda x: pareto_reflection(gpr(x))
+                self._scale(pareto_reflection, surrogate, blackbox_function, inner_reflection=None)
+            for i in range(2, len(pareto_reflections) + 1):
+                if isinstance(pareto_reflections[-i], MinGParetoReflection):
+                    print('\nCalculating optimal scaling...')
+                    self._scale(pareto_reflections[-i],
+                                lambda x, inner=pareto_reflection: apply_pareto_reflection(inner, surrogate(x),
+                                                                                           vectorized),
+                                blackbox_function,
+                                inner_reflection=pareto_reflection)
+                pareto_reflection = ComposeReflections(pareto_reflection, pareto_reflections[-i])
+
+            pareto_reflection = compile_reflection(pareto_reflection)
+            fun = lambda x: apply_pareto_reflection(pareto_reflection, surrogate(x), vectorized)
 
         else:
-            fun = lambda x: gpr(x)
+            fun = surrogate
 
         print('\nOptimization...')
         if isinstance(blackbox_function.design_space, Bounds):
@@ -245,20 +502,79 @@ class GPRMinimizer(ParefMOO):
                 max_iter=self._max_iter_minimizer,
                 upper_bounds=blackbox_function.design_space.upper_bounds,
                 lower_bounds=blackbox_function.design_space.lower_bounds,
+                vectorized=vectorized,
             )
 
         else:
             raise ValueError('Design space property of blackbox function must be an instance of Bounds!')
 
-        print(
-            f'\n Found Pareto point: \n x={res} '
-            f'\n prediction={gpr(res)} '
-            f'\n standard deviation={gpr.std(res)}')
-        if np.any([np.all(dominated) for dominated in (gpr(res) >= gpr(blackbox_function.x))]):
-            warn(
-                'Optimizer did not find a Pareto point! \n'
-                'Try more minimizer iterations (max_iter_minimizer).', RuntimeWarning)
-            sleep(1)
+        self._check_proposal(res, gpr, blackbox_function)
+        return res
+
+    def propose(self, blackbox_function: BlackboxFunction) -> np.ndarray:
+        """Train the GPR(s) and minimize the (composition with the Pareto reflection of the) GPR(s)
+
+        Parameters
+        ----------
+        blackbox_function : BlackboxFunction
+            blackbox function to which algorithm is applied
+
+        Returns
+        -------
+        np.ndarray
+            proposed (potential) Pareto point
+
+        """
+        return self._propose(blackbox_function)
+
+    def propose_batch(self, blackbox_functions: List[BlackboxFunction]) -> List[np.ndarray]:
+        """Propose several points at once by fantasizing the evaluations at the proposed points
+
+        The GPR(s) are trained once. After each proposal, a fantasized evaluation at the proposed point (see
+        fantasization) is added to the GPR(s) with frozen hyperparameters, such that the following proposals
+        are made as if the proposed point was already evaluated. The fantasized evaluations are discarded at the next
+        training.
+
+        Parameters
+        ----------
+        blackbox_functions : List[BlackboxFunction]
+            compositions of the same blackbox function with (possibly different) Pareto reflections
+
+        Returns
+        -------
+        List[np.ndarray]
+            proposed (potential) Pareto points
+
+        """
+        proposals = []
+        for i, blackbox_function in enumerate(blackbox_functions):
+            proposals.append(self._propose(blackbox_function, train=i == 0))
+            # the sparse GPR does not support adding evaluations
+            if i < len(blackbox_functions) - 1 and self._gpr_backend != 'sparse':
+                x = proposals[-1][np.newaxis]
+                if self._fantasization == 'constant_liar':
+                    y = np.max(self._unwrap(blackbox_function)[0].y, axis=0, keepdims=True)
+                else:
+                    y = self._gpr.predict(x, return_std=False)
+                self._gpr.partial_fit(x, y)
+                self._fantasized = True
+        return proposals
+
+    def apply_moo_operation(self,
+                            blackbox_function: BlackboxFunction,
+                            ) -> None:
+        """Apply moo operation constructed as above
+
+        Parameters
+        ----------
+        blackbox_function : BlackboxFunction
+            blackbox function to which algorithm is applied
+
+
+        """
+        res = self.propose(blackbox_function)
+        base_blackbox_function, _ = self._unwrap(blackbox_function)
+        prediction = self._gpr(res)
 
         # if np.all(pareto_reflection(gpr(res)) >= pareto_reflection(blackbox_function.y[0])):
         #    print('\nNo Pareto point was found. Algorithmic search stopped.')
@@ -270,8 +586,8 @@ class GPRMinimizer(ParefMOO):
         print('\nEvaluating blackbox function...')
         blackbox_function(res)
         print('Value of blackbox function: ', base_blackbox_function.y[-1])
-        print('Difference to estimation: ', gpr(res) - base_blackbox_function.y[-1], '\n')
-        if base_blackbox_function.y[-1] not in base_blackbox_function.pareto_front:
+        print('Difference to estimation: ', prediction - base_blackbox_function.y[-1], '\n')
+        if len(base_blackbox_function.y) - 1 not in base_blackbox_function.pareto_front_indices:
             warn(
                 'Found Point is not Pareto optimal! \n'
                 'Either the optimization converged or the optimization failed. Check the convergence by looking at '
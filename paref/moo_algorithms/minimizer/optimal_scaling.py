@@ -0,0 +1,374 @@
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Hashable, Optional, Tuple
+
+import numpy as np
+import torch
+from scipy.optimize import differential_evolution
+from scipy.stats import qmc
+
+
+class LinearScaling:
+    """Scale values linearly such that minimum is mapped to 0 and maximum to 1 (componentwise)
+
+    Examples
+    --------
+    >>> scaling = LinearScaling(minimum=np.zeros(2), maximum=np.array([1., 2.]))
+    >>> scaling(np.ones(2))
+    array([1. , 0.5])
+
+    """
+
+    def __init__(self, minimum: np.ndarray, maximum: np.ndarray):
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return (x - self.minimum) / (self.maximum - self.minimum)
+
+
+class _BatchedEvaluation:
+    # evaluates the points requested by concurrently running searches by a single call of the function
+    #
+    # A call blocks until every running search requested points (or left), then the last of them evaluates the stacked
+    # points of all requests and each request receives the values at its points.
+
+    def __init__(self, function: Callable[[np.ndarray], np.ndarray], number_searches: int):
+        self._function = function
+        self._number_searches = number_searches
+        self._requests = []
+        self._condition = threading.Condition()
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        request = {'x': x}
+        with self._condition:
+            self._requests.append(request)
+            self._evaluate_if_complete()
+            while 'values' not in request and 'error' not in request:
+                self._condition.wait()
+        if 'error' in request:
+            raise request['error']
+        return request['values']
+
+    def leave(self) -> None:
+        # the search is finished, i.e. the other searches do not wait for its requests anymore
+        with self._condition:
+            self._number_searches -= 1
+            self._evaluate_if_complete()
+
+    def _evaluate_if_complete(self) -> None:
+        if len(self._requests) == 0 or len(self._requests) < self._number_searches:
+            return
+        requests, self._requests = self._requests, []
+        try:
+            values = np.asarray(self._function(np.concatenate([request['x'] for request in requests])))
+            values = values.reshape(sum(len(request['x']) for request in requests), -1)
+            start = 0
+            for request in requests:
+                request['values'] = values[start:start + len(request['x'])]
+                start += len(request['x'])
+        except Exception as error:
+            for request in requests:
+                request['error'] = error
+        self._condition.notify_all()
+
+
+def minimize_batch(function: Callable[[np.ndarray], np.ndarray],
+                   number_problems: int,
+                   upper_bounds: np.ndarray,
+                   lower_bounds: np.ndarray,
+                   max_iter: int = 500,
+                   popsize: int = 15,
+                   tol: float = 1e-5,
+                   mutation: Tuple[float, float] = (0.5, 1.),
+                   recombination: float = 0.7,
+                   seed: Optional[int] = None,
+                   init: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                   polish: bool = True, ) -> Tuple[np.ndarray, np.ndarray]:
+    """Solve several minimization problems over the same cube by one batched differential evolution
+
+    Each problem is solved by scipy's (vectorized) `differential evolution
+    <https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.differential_evolution.html>`_.
+    The searches of all problems run concurrently and advance in lockstep: the populations of a generation of all
+    (not yet converged) searches are stacked and evaluated by a single call of the function, whose values of all
+    problems are shared by the searches. Hence, a generation of all problems costs one call of the function.
+
+    Parameters
+    ----------
+    function : Callable[[np.ndarray], np.ndarray]
+        function mapping an array of points of shape (number of points, dimension) to the array of values of all
+        problems of shape (number of points, number of problems), i.e. problem i minimizes the i-th column
+
+    number_problems : int
+        number of problems
+
+    upper_bounds : np.ndarray
+        upper bounds of the cube
+
+    lower_bounds : np.ndarray
+        lower bounds of the cube
+
+    max_iter : int default 500
+        maximum number of generations
+
+    popsize : int default 15
+        the size of each population is popsize times the dimension
+
+    tol : float default 1e-5
+        relative tolerance of the convergence
+
+    mutation : Tuple[float, float] default (0.5, 1.)
+        range of the (in each generation randomly chosen) mutation constant
+
+    recombination : float default 0.7
+        crossover probability
+
+    seed : Optional[int] default None
+        seed of the random number generator
+
+    init : Optional[Tuple[np.ndarray, np.ndarray]] default None
+        already evaluated points (within the cube) and their values of all problems, i.e. arrays of shape
+        (number of points, dimension) and (number of points, number of problems). The best of these points of each
+        problem seed its population (at most half of it)
+
+    polish : bool default True
+        polish the best member of each population by L-BFGS-B at the end
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        (approximate) minimizer of shape (number of problems, dimension) and minimum of each problem
+
+    """
+    rng = np.random.default_rng(seed)
+    upper_bounds, lower_bounds = np.asarray(upper_bounds, dtype=float), np.asarray(lower_bounds, dtype=float)
+    dimension = len(lower_bounds)
+    size = max(popsize * dimension, 5)
+    number_seeds = 0 if init is None else min(len(init[0]), size // 2)
+    if number_seeds != 0:
+        points, values = np.asarray(init[0], dtype=float), np.asarray(init[1]).reshape(len(init[0]), number_problems)
+        best = np.argsort(values, axis=0)[:number_seeds].T
+
+    populations, seeds = [], rng.integers(2 ** 32, size=number_problems)
+    for problem in range(number_problems):
+        # latin hypercube sample completed by the best evaluated points of the problem
+        sample = qmc.scale(qmc.LatinHypercube(d=dimension, seed=rng).random(size - number_seeds), lower_bounds,
+                           upper_bounds)
+        populations.append(np.concatenate((sample, np.clip(points[best[problem]], lower_bounds, upper_bounds)))
+                           if number_seeds != 0 else sample)
+
+    batch = _BatchedEvaluation(function, number_problems)
+
+    def search(problem: int):
+        def objective(x: np.ndarray) -> np.ndarray:
+            # scipy passes populations of shape (dimension, number of points) and single points when polishing
+            values = batch(np.atleast_2d(x.T))[:, problem]
+            return values if x.ndim == 2 else values[0]
+
+        try:
+            return differential_evolution(objective, bounds=list(zip(lower_bounds, upper_bounds)),
+                                          maxiter=max_iter, popsize=popsize, tol=tol, mutation=mutation,
+                                          recombination=recombination, seed=int(seeds[problem]),
+                                          init=populations[problem], polish=polish, vectorized=True,
+                                          updating='deferred')
+        finally:
+            batch.leave()
+
+    with ThreadPoolExecutor(number_problems) as executor:
+        results = list(executor.map(search, range(number_problems)))
+    return np.array([res.x for res in results]), np.array([res.fun for res in results])
+
+
+@contextmanager
+def limit_torch_threads(workers: int):
+    """Limit the number of threads of torch such that workers parallel workers do not oversubscribe the cores
+
+    The previous number of threads is restored when the context is left.
+
+    Parameters
+    ----------
+    workers : int
+        number of parallel workers
+
+    """
+    number_threads = torch.get_num_threads()
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+    try:
+        yield
+    finally:
+        torch.set_num_threads(number_threads)
+
+
+class OptimalScaling:
+    """Compute the optimal scalings of the components of a function and of g over the design space
+
+    The scalings map the minimum and maximum of each component of the function (and of g composed with the
+    function) over the cube to 0 and 1, respectively. The 2·d+2 extremal problems (for a function with d components)
+    are solved by one :py:func:`batched differential evolution <minimize_batch>`.
+
+    The minimum and maximum are cached by the version of the surrogate (e.g. a counter of its fits) and a key
+    identifying the Pareto reflection, such that the scalings are computed only once as long as the surrogate
+    is unchanged. The cache is cleared whenever the version changes.
+
+    The searches of all extremal problems run concurrently, i.e. computing the scalings takes roughly the time of one
+    search. If workers is greater than 1, the stacked points of each generation of all searches are split into chunks
+    which are evaluated on a thread pool. This pays off if the function releases the GIL (e.g. the torch and numpy
+    operations of a vectorized surrogate), whereas point by point evaluations (vectorized=False) are mostly serialized
+    by the GIL. Meanwhile, the number of threads of torch is limited such that the workers do not oversubscribe the
+    cores. The function is evaluated once on the calling thread before, such that caches which are built lazily
+    (e.g. the predictive caches of a GPR) are not built concurrently.
+
+    Examples
+    --------
+    >>> optimal_scaling = OptimalScaling(vectorized=True)
+    >>> scaling_x, scaling_g = optimal_scaling(fun=lambda x: x ** 2, g=lambda y: np.sum(y, axis=1),
+    ...                                        upper_bounds=np.ones(2), lower_bounds=-np.ones(2))
+
+    """
+
+    def __init__(self,
+                 max_iter: int = 500,
+                 vectorized: bool = False,
+                 popsize: int = 15,
+                 tol: float = 1e-5,
+                 workers: int = 1, ):
+        """
+
+        Parameters
+        ----------
+        max_iter : int default 500
+            maximum number of generations of the differential evolution
+
+        vectorized : bool default False
+            if true, the function maps an array of points (first dimension corresponding to the points) to an
+            array of values and g maps an array of values to an array of values as well
+
+        popsize : int default 15
+            the size of the population of each extremal problem is popsize times the dimension of the design space
+
+        tol : float default 1e-5
+            relative tolerance of the convergence of the differential evolution
+
+        workers : int default 1
+            number of threads evaluating the function in parallel
+        """
+        if workers < 1:
+            raise ValueError(f'Number of workers must be at least 1! Number of workers is {workers}.')
+        self._max_iter = max_iter
+        self._vectorized = vectorized
+        self._popsize = popsize
+        self._tol = tol
+        self._workers = workers
+        self._surrogate_version = None
+        self._cache = {}
+
+    def _evaluate(self,
+                  fun: Callable,
+                  g: Callable,
+                  x: np.ndarray,
+                  executor: Optional[Executor] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if executor is not None and len(x) > 1:
+            # evaluate chunks of the points in parallel
+            chunks = [chunk for chunk in np.array_split(x, self._workers) if len(chunk) != 0]
+            y, g_values = zip(*executor.map(lambda chunk: self._evaluate(fun, g, chunk), chunks))
+            return np.concatenate(y), np.concatenate(g_values)
+        if self._vectorized:
+            y = fun(x)
+            return np.asarray(y).reshape(len(x), -1), np.asarray(g(y)).reshape(len(x))
+        y = [fun(point) for point in x]
+        return np.array(y).reshape(len(x), -1), np.array([g(value) for value in y]).reshape(len(x))
+
+    def __call__(self,
+                 fun: Callable,
+                 g: Callable,
+                 upper_bounds: np.ndarray,
+                 lower_bounds: np.ndarray,
+                 surrogate_version: Optional[Hashable] = None,
+                 key: Optional[Hashable] = None,
+                 init: Optional[Tuple[np.ndarray, np.ndarray]] = None, ) -> Tuple[LinearScaling, LinearScaling]:
+        """Optimal scalings of the components of fun and of g composed with fun
+
+        Parameters
+        ----------
+        fun : Callable
+            function whose components are scaled
+
+        g : Callable
+            function applied to the values of fun which is scaled
+
+        upper_bounds : np.ndarray
+            upper bounds of the cube
+
+        lower_bounds : np.ndarray
+            lower bounds of the cube
+
+        surrogate_version : Optional[Hashable] default None
+            version of the surrogate underlying fun (None: no caching)
+
+        key : Optional[Hashable] default None
+            key identifying fun and g for the given version of the surrogate, e.g. the Pareto reflection
+
+        init : Optional[Tuple[np.ndarray, np.ndarray]] default None
+            already evaluated points and their values of fun (first dimension corresponding to the points) seeding
+            the searches without being evaluated again (e.g. an archive of evaluations of the blackbox function)
+
+        Returns
+        -------
+        Tuple[LinearScaling, LinearScaling]
+            scaling of the components (scaling_x) and scaling of g (scaling_g)
+
+        """
+        if surrogate_version is not None:
+            if surrogate_version != self._surrogate_version:
+                self._surrogate_version = surrogate_version
+                self._cache = {}
+            if key in self._cache:
+                return self._cache[key]
+
+        if self._workers > 1:
+            with ThreadPoolExecutor(self._workers) as executor, limit_torch_threads(self._workers):
+                extrema = self._extrema(fun, g, upper_bounds, lower_bounds, executor, init)
+        else:
+            extrema = self._extrema(fun, g, upper_bounds, lower_bounds, init=init)
+
+        dimension = (len(extrema) - 2) // 2
+        scalings = (LinearScaling(extrema[:dimension], -extrema[dimension:2 * dimension]),
+                    LinearScaling(extrema[-2], -extrema[-1]))
+        if surrogate_version is not None:
+            self._cache[key] = scalings
+        return scalings
+
+    def _extrema(self,
+                 fun: Callable,
+                 g: Callable,
+                 upper_bounds: np.ndarray,
+                 lower_bounds: np.ndarray,
+                 executor: Optional[Executor] = None,
+                 init: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
+        # minima of each component, minus maxima of each component, minimum and minus maximum of g
+        def values(y: np.ndarray, g_values: np.ndarray) -> np.ndarray:
+            # minimize and maximize each component and g
+            return np.concatenate((y, -y, g_values[:, np.newaxis], -g_values[:, np.newaxis]), axis=1)
+
+        def objectives(x: np.ndarray) -> np.ndarray:
+            return values(*self._evaluate(fun, g, x, executor))
+
+        # evaluate the function once on the calling thread (before any evaluation is dispatched to the workers)
+        dimension = self._evaluate(fun, g, np.atleast_2d((upper_bounds + lower_bounds) / 2))[0].shape[1]
+        if init is not None and len(init[0]) != 0:
+            y = np.asarray(init[1]).reshape(len(init[0]), -1)
+            g_values = np.asarray(g(y) if self._vectorized else [g(value) for value in y]).reshape(len(y))
+            init = (init[0], values(y, g_values))
+        else:
+            init = None
+
+        return minimize_batch(objectives, 2 * dimension + 2, upper_bounds=upper_bounds, lower_bounds=lower_bounds,
+                              max_iter=self._max_iter, popsize=self._popsize, tol=self._tol, init=init)[1]
+
+    def clear(self) -> None:
+        """Clear the cache
+        """
+        self._surrogate_version = None
+        self._cache = {}
@@ -0,0 +1,321 @@
+import time
+from typing import Optional, Union, Tuple
+
+import gpytorch
+import numpy as np
+import torch
+from matplotlib import pyplot as plt
+from tqdm import tqdm
+
+from paref.interfaces.surrogates.surrogate import Surrogate
+from paref.moo_algorithms.minimizer.surrogates.cholesky_posterior import posteriors_from_gpytorch, predict_posteriors
+from paref.moo_algorithms.minimizer.surrogates.prediction import fast_pred_var
+from paref.moo_algorithms.minimizer.surrogates.training import get_optimizer, LossPlateau, loss_convergence
+
+
+class BatchExactGP(gpytorch.models.ExactGP):
+    """Exact GP with independent hyperparameters for each output (batch dimension)
+
+    The training outputs are of shape (number of outputs, number of points).
+    """
+
+    def __init__(self, train_x: torch.Tensor, train_y: torch.Tensor, likelihood):
+        super(BatchExactGP, self).__init__(train_x, train_y, likelihood)
+        batch_shape = torch.Size([train_y.shape[0]])
+        self.mean_module = gpytorch.means.ConstantMean(batch_shape=batch_shape)
+        self.covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.RBFKernel(batch_shape=batch_shape),
+                                                         batch_shape=batch_shape)
+
+    def forward(self, x) -> gpytorch.distributions.MultivariateNormal:
+        mean_x = self.mean_module(x)
+        covar_x = self.covar_module(x)
+        return gpytorch.distributions.MultivariateNormal(mean_x, covar_x)
+
+
+class BatchGPR(Surrogate):
+    """GPR of all outputs in one batched model
+
+    Drop-in replacement for :py:class:`GPR <paref.moo_algorithms.minimizer.surrogates.gpr.GPR>`.
+    As for the GPR, each output is modeled by an independent GP with its own hyperparameters. However, the GPs of
+    all outputs are trained in one (vectorized) optimization and evaluated in one forward pass.
+    The loss which is optimized is the sum of the losses of all outputs.
+
+    Examples
+    --------
+    >>> gpr = BatchGPR(training_iter=100)
+    >>> gpr.train(train_x=np.random.random((20, 2)), train_y=np.random.random((20, 4)))
+    True
+    >>> gpr(np.zeros(2)).shape
+    (4,)
+
+    """
+
+    def __init__(self,
+                 training_iter: int = 1000,
+                 learning_rate=0.05,
+                 tolerance: Optional[float] = None,
+                 patience: int = 10,
+                 max_time: Optional[float] = None,
+                 optimizer: str = 'adam',
+                 cache_posterior: bool = False, ):
+        """
+
+        Parameters
+        ----------
+        training_iter : int default 1000
+            maximum number of training iterations
+
+        learning_rate : float default 0.05
+            learning rate of the optimizer
+
+        tolerance : Optional[float] default None
+            the training stops early if the summed loss of all outputs did not improve by more than this tolerance
+            (relative to the best loss so far) for patience iterations (None: no early stopping)
+
+        patience : int default 10
+            number of iterations without sufficient improvement of the loss after which the training stops
+
+        max_time : Optional[float] default None
+            maximum wall time of the training in seconds (None: no limit)
+
+        optimizer : str default 'adam'
+            optimizer of the hyperparameters, either 'adam' or 'lbfgs'
+
+        cache_posterior : bool default False
+            predict by :py:class:`Cholesky posteriors
+            <paref.moo_algorithms.minimizer.surrogates.cholesky_posterior.CholeskyPosterior>` with the trained
+            hyperparameters (cached Cholesky factor in double precision) instead of the gpytorch model
+        """
+        self._training_iter = training_iter
+        self._learning_rate = learning_rate
+        self._tolerance = tolerance
+        self._patience = patience
+        self._max_time = max_time
+        self._optimizer = optimizer
+        self._cache_posterior = cache_posterior
+        self._posteriors = None
+        self._train_x = None
+        self._train_outputs = None
+        self._model = None
+        self._likelihood = None
+        self._hyperparameters = None
+        self._means = None
+        self.converged = False
+
+    def train(self, train_x: np.ndarray, train_y: np.ndarray, warm_start: bool = False):
+        """Train the GPs of all outputs at once
+
+        Parameters
+        ----------
+        train_x : np.ndarray
+            training inputs stored in 2-dimensional array with first dimension corresponding to the points
+
+        train_y : np.ndarray
+            training outputs with first dimension corresponding to the points
+
+        warm_start : bool default False
+            if the GPR was already trained with the same number of outputs, keep the model and continue the
+            training on the new data from the previously trained hyperparameters
+
+        """
+        train_y = np.asarray(train_y).reshape(len(train_y), -1)
+        # prepossessing
+        self._means = np.mean(train_y, axis=0)
+        self._std = np.std(train_y, axis=0)
+        self._train_x, self._train_outputs = np.array(train_x, dtype=float), ((train_y - self._means) / self._std).T
+        outputs = torch.Tensor(self._train_outputs)
+        train_x = torch.Tensor(self._train_x)
+
+        if warm_start and self._model is not None and self._model.train_targets.shape[0] == len(outputs):
+            model = self._model
+            model.set_train_data(train_x, outputs, strict=False)
+        else:
+            self._likelihood = gpytorch.likelihoods.GaussianLikelihood(batch_shape=torch.Size([len(outputs)]))
+            model = BatchExactGP(train_x, outputs, self._likelihood)
+        self.converged = False
+
+        model.train()
+        self._likelihood.train()
+        optimizer = get_optimizer(model.parameters(), self._optimizer, self._learning_rate)
+        mll = gpytorch.mlls.ExactMarginalLogLikelihood(self._likelihood, model)
+
+        # losses of the outputs at the last evaluation of the closure (L-BFGS may evaluate it several times a step)
+        output_losses = {}
+
+        def closure():
+            optimizer.zero_grad()
+            # one loss for each output, the optimizer minimizes their sum
+            loss = -mll(model(train_x), outputs)
+            output_losses['loss'] = loss.detach()
+            loss = loss.sum()
+            loss.backward()
+            return loss
+
+        # store hyperparameters of the training for each output
+        hyper_parameter = {name: [] for name, _ in model.named_parameters()}
+        hyper_parameter['loss'] = []
+
+        loss_plateau = LossPlateau(self._tolerance, self._patience)
+        start_time = time.perf_counter()
+        for _ in tqdm(range(self._training_iter)):
+            optimizer.step(closure)
+            loss = output_losses['loss']
+            for name, parameter in model.named_parameters():
+                constraint = model.constraint_for_parameter_name(name)
+                value = constraint.transform(parameter) if constraint is not None else parameter
+                hyper_parameter[name].append(value.detach().reshape(len(outputs), -1)[:, 0].numpy())
+            hyper_parameter['loss'].append(loss.numpy())
+
+            if loss_plateau.update(loss.sum().item()):
+                self.converged = True
+                break
+
+            if self._max_time is not None and time.perf_counter() - start_time > self._max_time:
+                break
+
+        self._hyperparameters = {name: np.array(values) for name, values in hyper_parameter.items()}
+        self._model = model
+        self._posteriors = posteriors_from_gpytorch(model, self._train_x, self._train_outputs) \
+            if self._cache_posterior else None
+        return True
+
+    def fit(self, x: np.ndarray, y: np.ndarray, warm_start: bool = False) -> None:
+        """Train the GPs of all outputs at once (see train)
+        """
+        self.train(train_x=x, train_y=y, warm_start=warm_start)
+
+    def partial_fit(self, x: np.ndarray, y: np.ndarray):
+        """Add evaluations to the trained GPR without training the hyperparameters
+
+        The hyperparameters and the normalization of the outputs are kept frozen and the new evaluations are added
+        to the cached Cholesky posteriors by a block update in O(n^2) per evaluation.
+        Subsequent predictions are made by the Cholesky posteriors.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            new inputs stored in 2-dimensional array with first dimension corresponding to the points
+
+        y : np.ndarray
+            new outputs with first dimension corresponding to the points
+
+        """
+        x = np.asarray(x, dtype=float).reshape(-1, self._train_x.shape[1])
+        outputs = ((np.asarray(y).reshape(len(x), np.size(self._means)) - self._means) / self._std).T
+        if self._posteriors is None:
+            self._posteriors = posteriors_from_gpytorch(self._model, self._train_x, self._train_outputs)
+        for posterior, output in zip(self._posteriors, outputs):
+            posterior.add(x, output)
+        self._train_x = np.concatenate((self._train_x, x))
+        self._train_outputs = np.concatenate((self._train_outputs, outputs), axis=1)
+        return True
+
+    @property
+    def number_training_points(self) -> int:
+        return 0 if self._train_x is None else len(self._train_x)
+
+    @property
+    def model_convergence(self) -> np.ndarray:
+        return np.array([loss_convergence(hyperparameters['loss'], self.converged) for hyperparameters in self.info])
+
+    def predict(self, x: np.ndarray, return_std: bool = True) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Predict mean and standard deviation of all outputs at several points at once
+
+        Parameters
+        ----------
+        x : np.ndarray
+            points stored in 2-dimensional array of shape (number of points, dimension of design space)
+
+        return_std : bool default True
+            return the standard deviation as well
+
+        Returns
+        -------
+        Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+            mean (and standard deviation) of shape (number of points, number of outputs)
+
+        """
+        if self._posteriors is not None:
+            prediction = predict_posteriors(self._posteriors, x, return_std=return_std)
+            if not return_std:
+                return prediction * self._std + self._means
+            return prediction[0] * self._std + self._means, prediction[1]
+
+        x = torch.from_numpy(np.ascontiguousarray(np.atleast_2d(x), dtype=np.float32))
+        self._model.eval()
+        self._likelihood.eval()
+        with torch.no_grad(), fast_pred_var():
+            prediction = self._likelihood(self._model(x))
+
+        mean = prediction.mean.numpy().T * self._std + self._means
+        if not return_std:
+            return mean
+
+        return mean, prediction.stddev.numpy().T
+
+    def save(self, path: str) -> None:
+        """Save the trained GPR (hyperparameters, trained model and training data) to a file
+
+        Parameters
+        ----------
+        path : str
+            path to file
+
+        """
+        torch.save({'parameters': {'training_iter': self._training_iter,
+                                   'learning_rate': self._learning_rate,
+                                   'tolerance': self._tolerance,
+                                   'patience': self._patience,
+                                   'max_time': self._max_time,
+                                   'optimizer': self._optimizer,
+                                   'cache_posterior': self._cache_posterior},
+                    'means': self._means,
+                    'std': self._std,
+                    'train_x': self._train_x,
+                    'train_outputs': self._train_outputs,
+                    'hyperparameters': self._hyperparameters,
+                    'converged': self.converged,
+                    'posterior': self._posteriors is not None,
+                    'model': self._model.state_dict()},
+                   path)
+
+    def load(self, path: str) -> None:
+        """Load a trained GPR saved by save (replaces the current state of the GPR)
+
+        Parameters
+        ----------
+        path : str
+            path to file
+
+        """
+        state = torch.load(path, weights_only=False)
+        self.__init__(**state['parameters'])
+        self._means, self._std = state['means'], state['std']
+        self._train_x, self._train_outputs = state['train_x'], state['train_outputs']
+        self._hyperparameters = state['hyperparameters']
+        self.converged = state['converged']
+        self._likelihood = gpytorch.likelihoods.GaussianLikelihood(batch_shape=torch.Size([len(self._means)]))
+        self._model = BatchExactGP(torch.Tensor(self._train_x), torch.Tensor(self._train_outputs), self._likelihood)
+        self._model.load_state_dict(state['model'])
+        self._posteriors = posteriors_from_gpytorch(self._model, self._train_x, self._train_outputs) \
+            if state['posterior'] else None
+
+    @property
+    def info(self):
+        # hyperparameters and loss of each output (as for the GPR)
+        return [{name: list(values[:, i]) for name, values in self._hyperparameters.items()}
+                for i in range(len(self._means))]
+
+    def plot_loss(self):
+        fig, axs = plt.subplots(1, len(self._means))
+        fig.suptitle('Loss of GPR model(s)')
+        if len(self._means) > 1:
+            for i, hyperparameters in enumerate(self.info):
+                axs[i].plot(hyperparameters['loss'])
+                axs[i].set_title(f'GPR model {i}')
+
+            axs[0].set(xlabel='Training iteration', ylabel='loss')
+        else:
+            axs.plot(self.info[0]['loss'])
+            axs.set(xlabel='Training iteration', ylabel='loss')
+        plt.show()
@@ -0,0 +1,233 @@
+from typing import List, Union, Tuple
+
+import numpy as np
+import scipy as sp
+from scipy.spatial.distance import cdist
+
+
+class CholeskyPosterior:
+    """Exact GP posterior with frozen hyperparameters and cached Cholesky factor
+
+    The posterior of a GP with constant mean and scaled RBF kernel (as used by the GPR) is computed in numpy
+    (double precision). The Cholesky factor L of the kernel matrix K (plus noise) of the training points and the
+    weights :math:`K^{-1}(y-c)` of the posterior mean are cached. Hence, a prediction at a point costs O(n) for the
+    mean and O(n^2) for the variance instead of factorizing K again.
+
+    If new training points arrive while the hyperparameters are kept frozen, the Cholesky factor is extended by a
+    block update in O(n^2) (per new point) instead of the O(n^3) refactorization.
+
+    Examples
+    --------
+    >>> posterior = CholeskyPosterior(lengthscale=0.5, outputscale=1., noise=1e-4, constant_mean=0.)
+    >>> posterior.fit(np.zeros((1, 2)), np.ones(1))
+    >>> posterior.add(np.ones((1, 2)), np.zeros(1))
+    >>> mean, std = posterior.predict(np.zeros((1, 2)))
+
+    """
+
+    def __init__(self,
+                 lengthscale: float,
+                 outputscale: float,
+                 noise: float,
+                 constant_mean: float, ):
+        """
+
+        Parameters
+        ----------
+        lengthscale : float
+            lengthscale of the RBF kernel
+
+        outputscale : float
+            outputscale of the kernel
+
+        noise : float
+            variance of the (Gaussian) noise
+
+        constant_mean : float
+            constant prior mean
+        """
+        self.lengthscale = float(lengthscale)
+        self.outputscale = float(outputscale)
+        self.noise = float(noise)
+        self.constant_mean = float(constant_mean)
+        self._x = None
+        self._y = None
+        self._cholesky_factor = None
+        self._weights = None
+
+    def kernel(self, x_1: np.ndarray, x_2: np.ndarray) -> np.ndarray:
+        """Scaled RBF kernel matrix
+
+        Parameters
+        ----------
+        x_1 : np.ndarray
+            points stored in 2-dimensional array with first dimension corresponding to the points
+
+        x_2 : np.ndarray
+            points stored in 2-dimensional array with first dimension corresponding to the points
+
+        Returns
+        -------
+        np.ndarray
+            kernel matrix of shape (len(x_1), len(x_2))
+
+        """
+        return self.outputscale * np.exp(-0.5 * cdist(x_1 / self.lengthscale, x_2 / self.lengthscale, 'sqeuclidean'))
+
+    def _noisy_kernel(self, x: np.ndarray) -> np.ndarray:
+        return self.kernel(x, x) + self.noise * np.eye(len(x))
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Factorize the kernel matrix of the training points
+
+        Parameters
+        ----------
+        x : np.ndarray
+            training points stored in 2-dimensional array with first dimension corresponding to the points
+
+        y : np.ndarray
+            training outputs stored in 1-dimensional array
+
+        """
+        self._x = np.array(x, dtype=float)
+        self._y = np.array(y, dtype=float).reshape(-1)
+        self._cholesky_factor = _cholesky(self._noisy_kernel(self._x))
+        self._update_weights()
+
+    def add(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Add training points with a block update of the Cholesky factor in O(n^2) per point
+
+        Parameters
+        ----------
+        x : np.ndarray
+            new training points stored in 2-dimensional array with first dimension corresponding to the points
+
+        y : np.ndarray
+            new training outputs stored in 1-dimensional array
+
+        """
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float).reshape(-1)
+        if len(x) == 0:
+            return
+        if self._x is None:
+            self.fit(x, y)
+            return
+
+        # [[L, 0], [L_21, L_22]] is the Cholesky factor of [[K_11, K_12], [K_21, K_22]]
+        l_21 = sp.linalg.solve_triangular(self._cholesky_factor, self.kernel(self._x, x), lower=True).T
+        l_22 = _cholesky(self._noisy_kernel(x) - l_21 @ l_21.T)
+        n, m = len(self._x), len(x)
+        cholesky_factor = np.zeros((n + m, n + m))
+        cholesky_factor[:n, :n] = self._cholesky_factor
+        cholesky_factor[n:, :n] = l_21
+        cholesky_factor[n:, n:] = l_22
+
+        self._cholesky_factor = cholesky_factor
+        self._x = np.concatenate((self._x, x))
+        self._y = np.concatenate((self._y, y))
+        self._update_weights()
+
+    def _update_weights(self) -> None:
+        # weights of the posterior mean, i.e. K^{-1}(y-c), by two triangular solves in O(n^2)
+        self._weights = sp.linalg.cho_solve((self._cholesky_factor, True), self._y - self.constant_mean)
+
+    def predict(self, x: np.ndarray, return_std: bool = True) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Posterior mean and standard deviation (including the noise) at several points
+
+        Parameters
+        ----------
+        x : np.ndarray
+            points stored in 2-dimensional array with first dimension corresponding to the points
+
+        return_std : bool default True
+            return the standard deviation as well
+
+        Returns
+        -------
+        Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+            mean (and standard deviation) stored in 1-dimensional array
+
+        """
+        kernel = self.kernel(np.atleast_2d(x), self._x)
+        mean = self.constant_mean + kernel @ self._weights
+        if not return_std:
+            return mean
+
+        v = sp.linalg.solve_triangular(self._cholesky_factor, kernel.T, lower=True)
+        variance = self.outputscale + self.noise - np.sum(v ** 2, axis=0)
+        return mean, np.sqrt(np.maximum(variance, 0))
+
+    def __len__(self) -> int:
+        return 0 if self._x is None else len(self._x)
+
+
+def _cholesky(matrix: np.ndarray) -> np.ndarray:
+    # add increasing jitter to the diagonal if the matrix is numerically not positive definite
+    jitter = 0.
+    for _ in range(4):
+        try:
+            return np.linalg.cholesky(matrix + jitter * np.eye(len(matrix)))
+        except np.linalg.LinAlgError:
+            jitter = 1e-8 * np.mean(np.diag(matrix)) if jitter == 0 else 10 * jitter
+    raise ValueError('Kernel matrix is not positive definite!')
+
+
+def posteriors_from_gpytorch(model, x: np.ndarray, y: np.ndarray) -> List[CholeskyPosterior]:
+    """Cholesky posteriors with the (frozen) hyperparameters of a trained gpytorch model
+
+    Parameters
+    ----------
+    model :
+        trained gpytorch model with constant mean and scaled RBF kernel (possibly with batch dimension
+        corresponding to the outputs)
+
+    x : np.ndarray
+        training points stored in 2-dimensional array with first dimension corresponding to the points
+
+    y : np.ndarray
+        training outputs stored in 2-dimensional array with first dimension corresponding to the outputs
+
+    Returns
+    -------
+    List[CholeskyPosterior]
+        fitted posterior of each output
+
+    """
+    hyperparameters = [value.detach().double().numpy().reshape(len(y), -1)[:, 0] for value in
+                       (model.covar_module.base_kernel.lengthscale, model.covar_module.outputscale,
+                        model.likelihood.noise, model.mean_module.constant)]
+    posteriors = []
+    for output, (lengthscale, outputscale, noise, constant_mean) in zip(y, zip(*hyperparameters)):
+        posterior = CholeskyPosterior(lengthscale=lengthscale, outputscale=outputscale, noise=noise,
+                                      constant_mean=constant_mean)
+        posterior.fit(x, output)
+        posteriors.append(posterior)
+    return posteriors
+
+
+def predict_posteriors(posteriors: List[CholeskyPosterior],
+                       x: np.ndarray,
+                       return_std: bool = True) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """Predict all outputs by their posteriors
+
+    Parameters
+    ----------
+    posteriors : List[CholeskyPosterior]
+        posterior of each output
+
+    x : np.ndarray
+        points stored in 2-dimensional array with first dimension corresponding to the points
+
+    return_std : bool default True
+        return the standard deviation as well
+
+    Returns
+    -------
+    Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+        mean (and standard deviation) of shape (number of points, number of outputs)
+
+    """
+    predictions = [posterior.predict(x, return_std=return_std) for posterior in posteriors]
+    if not return_std:
+        return np.stack(predictions, axis=1)
+    return tuple(np.stack(prediction, axis=1) for prediction in zip(*predictions))
@@ -1,9 +1,18 @@
+import time
+from typing import Optional, Union, Tuple
+
 import gpytorch
 import torch
 from matplotlib import pyplot as plt
 from tqdm import tqdm
 import numpy as np
 
+from paref.interfaces.surrogates.surrogate import Surrogate
+from paref.moo_algorithms.minimizer.surrogates.cholesky_posterior import posteriors_from_gpytorch, predict_posteriors
+from paref.moo_algorithms.minimizer.surrogates.prediction import fast_pred_var
+from paref.moo_algorithms.minimizer.surrogates.sparse_gpr import SparseGpr0Torch, VariationalGP0
+from paref.moo_algorithms.minimizer.surrogates.training import get_optimizer, LossPlateau, loss_convergence
+
 
 class ExactGP0(gpytorch.models.ExactGP):
     """
@@ -22,9 +31,39 @@ class ExactGP0(gpytorch.models.ExactGP):
 
 
 class Gpr0Torch:
-    def __init__(self, training_iter=1000, learning_rate=0.1):
+    def __init__(self, training_iter=1000, learning_rate=0.1, tolerance=None, patience=10, max_time=None,
+                 optimizer='adam'):
+        """
+
+        Parameters
+        ----------
+        training_iter : int default 1000
+            maximum number of training iterations (steps of the optimizer)
+
+        learning_rate : float default 0.1
+            learning rate of the optimizer
+
+        tolerance : Optional[float] default None
+            the training stops early if the loss did not improve by more than this tolerance (relative to the best
+            loss so far) for patience iterations (None: no early stopping)
+
+        patience : int default 10
+            number of iterations without sufficient improvement of the loss after which the training stops
+
+        max_time : Optional[float] default None
+            maximum wall time of the training in seconds (None: no limit)
+
+        optimizer : str default 'adam'
+            optimizer of the hyperparameters, either 'adam' or 'lbfgs' (L-BFGS with strong Wolfe line search
+            performing up to 20 inner iterations per training iteration)
+        """
         self._training_iter = training_iter
         self._learning_rate = learning_rate
+        self._tolerance = tolerance
+        self._patience = patience
+        self._max_time = max_time
+        self._optimizer = optimizer
+        self.converged = False
         # with no white noise
         # self._likelihood = gpytorch.likelihoods.GaussianLikelihood(
         #    noise_constraint=gpytorch.constraints.Interval(
@@ -45,36 +84,41 @@ class Gpr0Torch:
         self._model.eval()
         self._likelihood.eval()
 
-        with torch.no_grad(), gpytorch.settings.fast_pred_var():
+        with torch.no_grad(), fast_pred_var():
             # make predictions for pred_x
             observed_pred = self._likelihood(self._model(pred_x))
 
         return observed_pred
 
-    def train_torch(self, train_x: torch.Tensor, train_y: torch.Tensor) -> bool:
+    def train_torch(self, train_x: torch.Tensor, train_y: torch.Tensor, warm_start: bool = False) -> bool:
         """
         Train the model with torch tensors as input and output.
         Note that the output need to be of dimension one.
+        If warm_start is true and the model was already trained, the training data of the model is replaced and
+        the training continues from the current hyperparameters.
+        The training stops after training_iter iterations, if the loss reached a plateau (see tolerance and
+        patience) or if the maximum wall time is exceeded. The attribute converged is true if and only if
+        the training stopped since the loss reached a plateau.
         """
-        # Initialize likelihood (with no constraints) and _model
-        model = ExactGP0(train_x, train_y, self._likelihood)
+        if warm_start and self._model is not None:
+            model = self._model
+            model.set_train_data(train_x, train_y, strict=False)
+        else:
+            # Initialize likelihood (with no constraints) and _model
+            model = ExactGP0(train_x, train_y, self._likelihood)
+        self.converged = False
 
         # Set on the training mode of the models
         model.train()
         self._likelihood.train()
 
-        # Use the adam optimizer of torch
-        optimizer = torch.optim.Adam(model.parameters(), lr=self._learning_rate)
+        # Use the adam optimizer of torch (or L-BFGS)
+        optimizer = get_optimizer(model.parameters(), self._optimizer, self._learning_rate)
 
         # "Loss" for GPs - the marginal log likelihood
         mll = gpytorch.mlls.ExactMarginalLogLikelihood(self._likelihood, model)
 
-        # store hyperparameters of the training
-        hyper_parameter = {name: [] for name, _ in model.named_parameters()}
-        hyper_parameter['loss'] = []
-
-        # Start the training
-        for _ in tqdm(range(self._training_iter)):
+        def closure():
             # Zero gradients from previous iteration
             optimizer.zero_grad()
             # Output from _model
@@ -82,8 +126,17 @@ class Gpr0Torch:
             # Calc loss and backpropagation gradients
             loss = -mll(output, train_y)
             loss.backward()
+            return loss
 
-            optimizer.step()
+        # store hyperparameters of the training
+        hyper_parameter = {name: [] for name, _ in model.named_parameters()}
+        hyper_parameter['loss'] = []
+
+        loss_plateau = LossPlateau(self._tolerance, self._patience)
+        start_time = time.perf_counter()
+        # Start the training
+        for _ in tqdm(range(self._training_iter)):
+            loss = optimizer.step(closure)
             for name, parameter in model.named_parameters():
                 if model.constraint_for_parameter_name(name) is not None:
                     hyper_parameter[name].append(
@@ -98,6 +151,14 @@ class Gpr0Torch:
             # Appending loss
             hyper_parameter['loss'].append(loss.item())
 
+            # Early stopping if the loss reached a plateau
+            if loss_plateau.update(loss.item()):
+                self.converged = True
+                break
+
+            if self._max_time is not None and time.perf_counter() - start_time > self._max_time:
+                break
+
         self.hyperparameters = hyper_parameter  # store hyperparameters
         self._model = model
         return True
@@ -181,53 +242,278 @@ class Gpr0Torch:
         return True
 
 
-class GPR:
+class GPR(Surrogate):
+    """GPR of each output (default surrogate of the minimizers)
+
+    Each output is normalized and modeled by an independent GP with constant mean and scaled RBF kernel.
+
+    Examples
+    --------
+    >>> gpr = GPR(training_iter=100)
+    >>> gpr.fit(np.random.random((20, 2)), np.random.random((20, 3)))
+    >>> mean, std = gpr.predict(np.zeros((1, 2)))
+
+    """
+
     def __init__(self,
                  training_iter: int = 1000,
-                 learning_rate=0.05, ):
+                 learning_rate=0.05,
+                 tolerance: Optional[float] = None,
+                 patience: int = 10,
+                 max_time: Optional[float] = None,
+                 optimizer: str = 'adam',
+                 cache_posterior: bool = False,
+                 backend: str = 'exact',
+                 number_inducing_points: int = 256,
+                 batch_size: int = 1024, ):
+        """
+
+        Parameters
+        ----------
+        training_iter : int default 1000
+            maximum number of training iterations of each output model
+
+        learning_rate : float default 0.05
+            learning rate of the optimizer
+
+        tolerance : Optional[float] default None
+            the training of an output model stops early if its loss did not improve by more than this tolerance
+            (relative to the best loss so far) for patience iterations (None: no early stopping)
+
+        patience : int default 10
+            number of iterations without sufficient improvement of the loss after which the training stops
+
+        max_time : Optional[float] default None
+            maximum wall time of the training of each output model in seconds (None: no limit)
+
+        optimizer : str default 'adam'
+            optimizer of the hyperparameters, either 'adam' or 'lbfgs'
+
+        cache_posterior : bool default False
+            predict by a :py:class:`Cholesky posterior
+            <paref.moo_algorithms.minimizer.surrogates.cholesky_posterior.CholeskyPosterior>` with the trained
+            hyperparameters (cached Cholesky factor in double precision) instead of the gpytorch models
+            (only available for the exact backend)
+
+        backend : str default 'exact'
+            either 'exact' (exact GP of each output) or 'sparse' (:py:class:`sparse variational GP
+            <paref.moo_algorithms.minimizer.surrogates.sparse_gpr.SparseGpr0Torch>` of each output trained by
+            minibatches, suited for large numbers of evaluations; training_iter is the number of epochs then)
+
+        number_inducing_points : int default 256
+            number of inducing points of the sparse backend
+
+        batch_size : int default 1024
+            size of the minibatches of the sparse backend
+        """
+        if backend not in ('exact', 'sparse'):
+            raise ValueError(f'Backend must be either \'exact\' or \'sparse\'! Backend is {backend}.')
+        if backend == 'sparse' and cache_posterior:
+            raise ValueError('Caching the posterior requires the exact backend!')
         self._models = None
         self._training_iter = training_iter
         self._learning_rate = learning_rate
+        self._tolerance = tolerance
+        self._patience = patience
+        self._max_time = max_time
+        self._optimizer = optimizer
+        self._cache_posterior = cache_posterior
+        self._backend = backend
+        self._number_inducing_points = number_inducing_points
+        self._batch_size = batch_size
+        self._posteriors = None
+        self._train_x = None
+        self._train_outputs = None
         self._means = None
 
-    def train(self, train_x: np.ndarray, train_y: np.ndarray):
+    def train(self, train_x: np.ndarray, train_y: np.ndarray, warm_start: bool = False):
+        """Train a GPR for each output
+
+        Parameters
+        ----------
+        train_x : np.ndarray
+            training inputs stored in 2-dimensional array with first dimension corresponding to the points
+
+        train_y : np.ndarray
+            training outputs with first dimension corresponding to the points
+
+        warm_start : bool default False
+            if the GPR was already trained with the same number of outputs, keep the models and continue the
+            training on the new data from the previously trained hyperparameters
+
+        """
         # prepossessing
         self._means = np.mean(train_y, axis=0)
         self._std = np.std(train_y, axis=0)
-        # training
-        train_x = torch.Tensor(train_x)
-        models = []
-        for output in (train_y.T - self._means.reshape(-1, 1)) / self._std.reshape(-1, 1):
-            model = Gpr0Torch(
-                training_iter=self._training_iter, learning_rate=self._learning_rate
-            )
-            model.train_torch(train_x, torch.Tensor(output))
-            models.append(model)
-        self._models = models
-
-        # Check if training converged
-        losses = np.array([hp['loss'] for hp in self.info])
-        losses_last = np.array([hp['loss'][int(self._training_iter * 0.5):] for hp in self.info])
-
-        self._model_convergence = (np.max(losses_last, axis=1) - np.min(losses_last, axis=1)) / (
-                np.max(losses, axis=1) - np.min(losses, axis=1)) * 2
+        outputs = (train_y.T - self._means.reshape(-1, 1)) / self._std.reshape(-1, 1)
+        self._train_x, self._train_outputs = np.array(train_x, dtype=float), outputs
+        # training (on the copy of the inputs, e.g. the inputs may be a read-only view of an evaluation store)
+        train_x = torch.Tensor(self._train_x)
+        if not (warm_start and self._models is not None and len(self._models) == len(outputs)):
+            warm_start = False
+            self._models = [self._new_model() for _ in outputs]
+        for model, output in zip(self._models, outputs):
+            model.train_torch(train_x, torch.Tensor(output), warm_start=warm_start)
+
+        # Check if training converged (models which stopped at a plateau of the loss are converged)
+        self._model_convergence = np.array([loss_convergence(model.hyperparameters['loss'], model.converged)
+                                            for model in self._models])
+        self._posteriors = self._fit_posteriors() if self._cache_posterior else None
+        return True
+
+    def fit(self, x: np.ndarray, y: np.ndarray, warm_start: bool = False) -> None:
+        """Train a GPR for each output (see train)
+        """
+        self.train(train_x=x, train_y=y, warm_start=warm_start)
+
+    def _new_model(self):
+        if self._backend == 'sparse':
+            return SparseGpr0Torch(training_iter=self._training_iter, learning_rate=self._learning_rate,
+                                   tolerance=self._tolerance, patience=self._patience, max_time=self._max_time,
+                                   number_inducing_points=self._number_inducing_points, batch_size=self._batch_size)
+        return Gpr0Torch(training_iter=self._training_iter, learning_rate=self._learning_rate,
+                         tolerance=self._tolerance, patience=self._patience, max_time=self._max_time,
+                         optimizer=self._optimizer)
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    def _fit_posteriors(self):
+        return [posteriors_from_gpytorch(model._model, self._train_x, output.reshape(1, -1))[0]
+                for model, output in zip(self._models, self._train_outputs)]
+
+    def partial_fit(self, x: np.ndarray, y: np.ndarray):
+        """Add evaluations to the trained GPR without training the hyperparameters
+
+        The hyperparameters and the normalization of the outputs are kept frozen and the new evaluations are added
+        to the cached Cholesky posteriors by a block update in O(n^2) per evaluation.
+        Subsequent predictions are made by the Cholesky posteriors (only available for the exact backend).
+
+        Parameters
+        ----------
+        x : np.ndarray
+            new inputs stored in 2-dimensional array with first dimension corresponding to the points
+
+        y : np.ndarray
+            new outputs with first dimension corresponding to the points
+
+        """
+        if self._backend != 'exact':
+            raise ValueError('Partial fitting requires the exact backend!')
+        x = np.asarray(x, dtype=float).reshape(-1, self._train_x.shape[1])
+        outputs = ((np.asarray(y).reshape(len(x), np.size(self._means)) - self._means) / self._std).T
+        if self._posteriors is None:
+            self._posteriors = self._fit_posteriors()
+        for posterior, output in zip(self._posteriors, outputs):
+            posterior.add(x, output)
+        self._train_x = np.concatenate((self._train_x, x))
+        self._train_outputs = np.concatenate((self._train_outputs, outputs), axis=1)
         return True
 
+    @property
+    def number_training_points(self) -> int:
+        return 0 if self._train_x is None else len(self._train_x)
+
     @property
     def model_convergence(self):
         return self._model_convergence
 
-    def __call__(self, x: np.ndarray) -> np.ndarray:
-        x = torch.Tensor([x.tolist()])
-        return np.array(
-            [model.predict_torch(x).mean.numpy()[0] for model in self._models]
-        ).T * self._std + self._means
-
-    def std(self, x: np.ndarray) -> np.ndarray:
-        x = torch.Tensor([x.tolist()])
-        return np.array(
-            [model.predict_torch(x).stddev.numpy()[0] for model in self._models]
-        ).T
+    def predict(self, x: np.ndarray, return_std: bool = True) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Predict mean and standard deviation of all outputs at several points at once
+
+        The points are converted to a tensor once and each output model is evaluated once for all points, i.e.
+        mean and standard deviation are obtained from the same forward pass.
+        If the posterior is cached (see cache_posterior and partial_fit), the Cholesky posteriors are evaluated
+        instead.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            points stored in 2-dimensional array of shape (number of points, dimension of design space)
+
+        return_std : bool default True
+            return the standard deviation as well
+
+        Returns
+        -------
+        Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+            mean (and standard deviation) of shape (number of points, number of outputs)
+
+        """
+        if self._posteriors is not None:
+            prediction = predict_posteriors(self._posteriors, x, return_std=return_std)
+            if not return_std:
+                return prediction * self._std + self._means
+            return prediction[0] * self._std + self._means, prediction[1]
+
+        x = torch.from_numpy(np.ascontiguousarray(np.atleast_2d(x), dtype=np.float32))
+        predictions = [model.predict_torch(x) for model in self._models]
+        mean = np.stack([prediction.mean.numpy() for prediction in predictions], axis=1) * self._std + self._means
+        if not return_std:
+            return mean
+
+        return mean, np.stack([prediction.stddev.numpy() for prediction in predictions], axis=1)
+
+    def save(self, path: str) -> None:
+        """Save the trained GPR (hyperparameters, trained models and training data) to a file
+
+        Parameters
+        ----------
+        path : str
+            path to file
+
+        """
+        torch.save({'parameters': {'training_iter': self._training_iter,
+                                   'learning_rate': self._learning_rate,
+                                   'tolerance': self._tolerance,
+                                   'patience': self._patience,
+                                   'max_time': self._max_time,
+                                   'optimizer': self._optimizer,
+                                   'cache_posterior': self._cache_posterior,
+                                   'backend': self._backend,
+                                   'number_inducing_points': self._number_inducing_points,
+                                   'batch_size': self._batch_size},
+                    'means': self._means,
+                    'std': self._std,
+                    'train_x': self._train_x,
+                    'train_outputs': self._train_outputs,
+                    'model_convergence': self._model_convergence,
+                    'posterior': self._posteriors is not None,
+                    'models': [{'model': model._model.state_dict(),
+                                'likelihood': model._likelihood.state_dict(),
+                                'hyperparameters': model.hyperparameters,
+                                'converged': model.converged} for model in self._models]},
+                   path)
+
+    def load(self, path: str) -> None:
+        """Load a trained GPR saved by save (replaces the current state of the GPR)
+
+        Parameters
+        ----------
+        path : str
+            path to file
+
+        """
+        state = torch.load(path, weights_only=False)
+        self.__init__(**state['parameters'])
+        self._means, self._std = state['means'], state['std']
+        self._train_x, self._train_outputs = state['train_x'], state['train_outputs']
+        self._model_convergence = state['model_convergence']
+        self._models = []
+        for model_state, output in zip(state['models'], self._train_outputs):
+            model = self._new_model()
+            model._likelihood.load_state_dict(model_state['likelihood'])
+            if self._backend == 'sparse':
+                model._model = VariationalGP0(
+                    torch.empty(model_state['model']['variational_strategy.inducing_points'].shape))
+            else:
+                model._model = ExactGP0(torch.Tensor(self._train_x), torch.Tensor(output), model._likelihood)
+            model._model.load_state_dict(model_state['model'])
+            model.hyperparameters = model_state['hyperparameters']
+            model.converged = model_state['converged']
+            self._models.append(model)
+        self._posteriors = self._fit_posteriors() if state['posterior'] else None
 
     @property
     def info(self):
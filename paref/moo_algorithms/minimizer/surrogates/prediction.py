@@ -0,0 +1,32 @@
+import threading
+from contextlib import contextmanager
+
+import gpytorch
+
+_lock = threading.Lock()
+_number_predictions = 0
+_setting = None
+
+
+@contextmanager
+def fast_pred_var():
+    """Enable gpytorch's fast predictive variances while any prediction is running
+
+    The settings of gpytorch are process-global, i.e. a prediction leaving gpytorch.settings.fast_pred_var() switches
+    the setting off for all other threads. Hence, concurrent predictions (e.g. on a thread pool) enter the setting
+    once and leave it when the last prediction is done.
+    """
+    global _number_predictions, _setting
+    with _lock:
+        if _number_predictions == 0:
+            _setting = gpytorch.settings.fast_pred_var()
+            _setting.__enter__()
+        _number_predictions += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _number_predictions -= 1
+            if _number_predictions == 0:
+                _setting.__exit__(None, None, None)
+                _setting = None
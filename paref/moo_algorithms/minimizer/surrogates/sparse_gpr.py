@@ -0,0 +1,141 @@
+import time
+
+import gpytorch
+import numpy as np
+import torch
+from tqdm import tqdm
+
+from paref.moo_algorithms.minimizer.surrogates.prediction import fast_pred_var
+from paref.moo_algorithms.minimizer.surrogates.training import LossPlateau
+
+
+class VariationalGP0(gpytorch.models.ApproximateGP):
+    """Sparse variational GP (SVGP) with learned inducing points
+
+    Mean and kernel agree with the ones of the exact GP (constant mean and scaled RBF kernel).
+    """
+
+    def __init__(self, inducing_points: torch.Tensor):
+        variational_distribution = gpytorch.variational.CholeskyVariationalDistribution(len(inducing_points))
+        variational_strategy = gpytorch.variational.VariationalStrategy(self, inducing_points,
+                                                                        variational_distribution,
+                                                                        learn_inducing_locations=True)
+        super(VariationalGP0, self).__init__(variational_strategy)
+        self.mean_module = gpytorch.means.ConstantMean()
+        self.covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.RBFKernel())
+
+    def forward(self, x) -> gpytorch.distributions.MultivariateNormal:
+        mean_x = self.mean_module(x)
+        covar_x = self.covar_module(x)
+        return gpytorch.distributions.MultivariateNormal(mean_x, covar_x)
+
+
+class SparseGpr0Torch:
+    """Sparse GP of a single output trained by minibatch optimization of the variational ELBO
+
+    The training and prediction cost O(n m^2) and O(m^2) for n training points and m inducing points instead of
+    O(n^3) and O(n^2) for the exact GP. Hence, this model is suited for large numbers of evaluations.
+    Apart from the optimizer (always Adam), it can be used as the exact
+    :py:class:`Gpr0Torch <paref.moo_algorithms.minimizer.surrogates.gpr.Gpr0Torch>`.
+    """
+
+    def __init__(self, training_iter=1000, learning_rate=0.1, tolerance=None, patience=10, max_time=None,
+                 number_inducing_points=256, batch_size=1024):
+        """
+
+        Parameters
+        ----------
+        training_iter : int default 1000
+            maximum number of training epochs (passes over all training points)
+
+        learning_rate : float default 0.1
+            learning rate of the Adam optimizer
+
+        tolerance : Optional[float] default None
+            the training stops early if the loss of an epoch did not improve by more than this tolerance (relative
+            to the best loss so far) for patience epochs (None: no early stopping)
+
+        patience : int default 10
+            number of epochs without sufficient improvement of the loss after which the training stops
+
+        max_time : Optional[float] default None
+            maximum wall time of the training in seconds (None: no limit)
+
+        number_inducing_points : int default 256
+            number of inducing points (initialized at randomly chosen training points)
+
+        batch_size : int default 1024
+            number of training points in each minibatch
+        """
+        self._training_iter = training_iter
+        self._learning_rate = learning_rate
+        self._tolerance = tolerance
+        self._patience = patience
+        self._max_time = max_time
+        self._number_inducing_points = number_inducing_points
+        self._batch_size = batch_size
+        self.converged = False
+        self._likelihood = gpytorch.likelihoods.GaussianLikelihood()
+        self._model = None
+        self.hyperparameters = None
+
+    def predict_torch(self, pred_x: torch.Tensor) -> gpytorch.distributions.MultivariateNormal:
+        self._model.eval()
+        self._likelihood.eval()
+
+        with torch.no_grad(), fast_pred_var():
+            observed_pred = self._likelihood(self._model(pred_x))
+
+        return observed_pred
+
+    def train_torch(self, train_x: torch.Tensor, train_y: torch.Tensor, warm_start: bool = False) -> bool:
+        """
+        Train the model with torch tensors as input and output by minibatches.
+        If warm_start is true and the model was already trained, the training continues from the current
+        inducing points, variational distribution and hyperparameters on the new training data.
+        """
+        if not (warm_start and self._model is not None):
+            inducing_points = train_x[torch.randperm(len(train_x))[:self._number_inducing_points]].clone()
+            self._model = VariationalGP0(inducing_points)
+        model = self._model
+        self.converged = False
+
+        model.train()
+        self._likelihood.train()
+        optimizer = torch.optim.Adam([{'params': model.parameters()}, {'params': self._likelihood.parameters()}],
+                                     lr=self._learning_rate)
+        mll = gpytorch.mlls.VariationalELBO(self._likelihood, model, num_data=len(train_y))
+
+        # store (scalar) hyperparameters of the training (named as for the exact GP)
+        parameters = [(prefix + name, parameter, module.constraint_for_parameter_name(name))
+                      for prefix, module in (('', model), ('likelihood.', self._likelihood))
+                      for name, parameter in module.named_parameters()
+                      if parameter.numel() == 1 and 'variational' not in name]
+        hyper_parameter = {name: [] for name, _, _ in parameters}
+        hyper_parameter['loss'] = []
+
+        loss_plateau = LossPlateau(self._tolerance, self._patience)
+        start_time = time.perf_counter()
+        for _ in tqdm(range(self._training_iter)):
+            losses = []
+            for batch in torch.randperm(len(train_x)).split(self._batch_size):
+                optimizer.zero_grad()
+                loss = -mll(model(train_x[batch]), train_y[batch])
+                loss.backward()
+                optimizer.step()
+                losses.append(loss.item())
+
+            for name, parameter, constraint in parameters:
+                hyper_parameter[name].append(
+                    (constraint.transform(parameter) if constraint is not None else parameter).item())
+            hyper_parameter['loss'].append(float(np.mean(losses)))
+
+            if loss_plateau.update(hyper_parameter['loss'][-1]):
+                self.converged = True
+                break
+
+            if self._max_time is not None and time.perf_counter() - start_time > self._max_time:
+                break
+
+        self.hyperparameters = hyper_parameter
+        return True
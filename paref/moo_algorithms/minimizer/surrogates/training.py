@@ -0,0 +1,93 @@
+from typing import Optional
+
+import numpy as np
+import torch
+
+
+def get_optimizer(parameters, optimizer: str, learning_rate: float) -> torch.optim.Optimizer:
+    """Optimizer of the hyperparameters
+
+    Parameters
+    ----------
+    parameters :
+        parameters of the model
+
+    optimizer : str
+        either 'adam' or 'lbfgs' (L-BFGS with strong Wolfe line search performing up to 20 inner iterations per step)
+
+    learning_rate : float
+        learning rate of the optimizer
+
+    Returns
+    -------
+    torch.optim.Optimizer
+        optimizer (to be stepped with a closure)
+
+    """
+    if optimizer == 'lbfgs':
+        return torch.optim.LBFGS(parameters, lr=learning_rate, max_iter=20, line_search_fn='strong_wolfe')
+    if optimizer == 'adam':
+        return torch.optim.Adam(parameters, lr=learning_rate)
+    raise ValueError(f'Optimizer must be either \'adam\' or \'lbfgs\'! Optimizer is {optimizer}.')
+
+
+class LossPlateau:
+    """Detect a plateau of the loss during the training
+
+    The loss reached a plateau if it did not improve by more than the tolerance (relative to the best loss so far)
+    for patience iterations.
+    """
+
+    def __init__(self, tolerance: Optional[float], patience: int = 10):
+        self._tolerance = tolerance
+        self._patience = patience
+        self._best_loss = None
+        self._iterations_without_improvement = 0
+
+    def update(self, loss: float) -> bool:
+        """Add the loss of the current iteration
+
+        Parameters
+        ----------
+        loss : float
+            loss of the current iteration
+
+        Returns
+        -------
+        bool
+            true if the loss reached a plateau (always false if the tolerance is None)
+
+        """
+        if self._tolerance is None:
+            return False
+        if self._best_loss is None or loss < self._best_loss - self._tolerance * max(abs(self._best_loss), 1.):
+            self._best_loss, self._iterations_without_improvement = loss, 0
+        else:
+            self._iterations_without_improvement += 1
+        return self._iterations_without_improvement >= self._patience
+
+
+def loss_convergence(loss: np.ndarray, converged: bool = False) -> float:
+    """Measure the convergence of the training by its loss history
+
+    Parameters
+    ----------
+    loss : np.ndarray
+        loss in each training iteration
+
+    converged : bool default False
+        true if the training stopped since the loss reached a plateau
+
+    Returns
+    -------
+    float
+        twice the range of the loss in the second half of the training relative to the range of the total loss
+        (0 if converged)
+
+    """
+    loss = np.asarray(loss)
+    loss_last = loss[int(len(loss) * 0.5):]
+    loss_range = np.max(loss) - np.min(loss)
+    if converged or loss_range == 0:
+        return 0.
+    return (np.max(loss_last) - np.min(loss_last)) / loss_range * 2
@@ -42,8 +42,7 @@ class ConvergenceReached(StoppingCriteria):
 
         """
         if len(blackbox_function.evaluations) >= 2:
-            norm = np.linalg.norm(blackbox_function.evaluations[-1][1] -
-                                  blackbox_function.evaluations[-2][1])
+            norm = np.linalg.norm(blackbox_function.y[-1] - blackbox_function.y[-2])
 
             if norm > self._epsilon:
                 return False
@@ -0,0 +1,105 @@
+import numpy as np
+
+from paref.pareto_dominance.non_dominated_sorting import _as_points, non_dominated_indices
+
+
+class DominanceIndex:
+    """Spatial index of points answering which query points lie in the dominance box of some indexed point
+
+    A query point q lies in the dominance box of an indexed point p if p is lower or equal than q in every component.
+    Only the non-dominated indexed points determine the answer, hence all other points are discarded when the index
+    is built.
+
+    For two components, the non-dominated points sorted ascending by the first component are sorted descending by the
+    second component (a staircase). Thus, the points with first component lower or equal than the query are a prefix
+    whose minimal second component is the one of its last point, i.e. a query is answered by a binary search
+    (O(log n)).
+    For more components, the points are sorted by the first component and split into blocks of block_size points.
+    The points of a block are only compared (by a vectorized numpy broadcast) to the queries lying in the dominance
+    box of the componentwise minimum of the block.
+
+    Examples
+    --------
+    >>> index = DominanceIndex(np.array([[1, 2], [2, 1], [2, 2]]))
+    >>> index.query(np.array([[1, 1], [2, 1], [3, 3]]))
+    array([False,  True,  True])
+
+    """
+
+    def __init__(self, points: np.ndarray, block_size: int = 64):
+        """
+
+        Parameters
+        ----------
+        points : np.ndarray
+            indexed points stored in 2-dimensional array with first dimension corresponding to the points
+            (or 1-dimensional array of scalar values)
+
+        block_size : int default 64
+            number of points of each block if the points have more than two components
+        """
+        if block_size < 1:
+            raise ValueError(f'Block size must be at least 1! Block size is {block_size}.')
+        points = _as_points(points)
+        self._dimension = points.shape[1]
+        points = np.unique(points[non_dominated_indices(points)], axis=0)
+        # np.unique sorts lexicographically, i.e. ascending by the first component
+        self._points = points
+        self._block_size = block_size
+        if self._dimension > 2:
+            self._block_minima = np.array([np.min(points[start:start + block_size], axis=0)
+                                           for start in range(0, len(points), block_size)]).reshape(-1, self._dimension)
+
+    def query(self, x: np.ndarray) -> np.ndarray:
+        """Indicate which query points lie in the dominance box of some indexed point
+
+        Parameters
+        ----------
+        x : np.ndarray
+            query points stored in 2-dimensional array with first dimension corresponding to the points
+
+        Returns
+        -------
+        np.ndarray
+            boolean array which is true at index i if some indexed point is lower or equal than the ith query point
+            in every component
+
+        """
+        x = np.asarray(x, dtype=float)
+        if len(x.shape) != 2 or x.shape[1] != self._dimension:
+            raise ValueError(f'Query points must be stored in 2-dimensional array with {self._dimension} columns! '
+                             f'Shape of query points is {x.shape}.')
+        if len(self._points) == 0:
+            return np.zeros(len(x), dtype=bool)
+
+        if self._dimension == 1:
+            return self._points[0, 0] <= x[:, 0]
+
+        if self._dimension == 2:
+            # number of points with first component lower or equal than the query
+            number_lower = np.searchsorted(self._points[:, 0], x[:, 0], side='right')
+            return (number_lower > 0) & (self._points[np.maximum(number_lower - 1, 0), 1] <= x[:, 1])
+
+        mask = np.zeros(len(x), dtype=bool)
+        for block, minimum in enumerate(self._block_minima):
+            candidates = np.flatnonzero(~mask & np.all(minimum <= x, axis=1))
+            if len(candidates) == 0:
+                continue
+            points = self._points[block * self._block_size:(block + 1) * self._block_size]
+            mask[candidates] = np.any(np.all(points <= x[candidates, np.newaxis], axis=2), axis=1)
+        return mask
+
+    @property
+    def points(self) -> np.ndarray:
+        """
+
+        Returns
+        -------
+        np.ndarray
+            non-dominated indexed points (without duplicates)
+
+        """
+        return self._points
+
+    def __len__(self) -> int:
+        return len(self._points)
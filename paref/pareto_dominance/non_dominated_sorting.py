@@ -0,0 +1,147 @@
+import numpy as np
+
+# maximal number of pairwise comparisons evaluated at once by the broadcast filter
+_MAX_BROADCAST_SIZE = 2 ** 22
+
+
+def _as_points(points: np.ndarray) -> np.ndarray:
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 1:
+        # scalar valued evaluations
+        points = points.reshape(-1, 1)
+    return points
+
+
+def dominated_mask(points: np.ndarray, reference_points: np.ndarray) -> np.ndarray:
+    """Indicate which points are dominated by some reference point
+
+    A point p is dominated by a point q if q is lower or equal than p in every component and strictly lower in at
+    least one component.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        points stored in 2-dimensional array with first dimension corresponding to the points
+
+    reference_points : np.ndarray
+        reference points stored in 2-dimensional array with first dimension corresponding to the points
+
+    Returns
+    -------
+    np.ndarray
+        boolean array which is true at index i if the ith point is dominated by some reference point
+
+    """
+    points, reference_points = _as_points(points), _as_points(reference_points)
+    mask = np.zeros(len(points), dtype=bool)
+    if len(points) == 0 or len(reference_points) == 0:
+        return mask
+
+    block_size = max(1, _MAX_BROADCAST_SIZE // len(reference_points))
+    for start in range(0, len(points), block_size):
+        block = points[start:start + block_size]
+        # compare component by component in order to avoid 3-dimensional temporary arrays
+        lower_equal = reference_points[:, 0] <= block[:, 0, None]
+        lower = reference_points[:, 0] < block[:, 0, None]
+        for i in range(1, points.shape[1]):
+            lower_equal &= reference_points[:, i] <= block[:, i, None]
+            lower |= reference_points[:, i] < block[:, i, None]
+        mask[start:start + block_size] = np.any(lower_equal & lower, axis=1)
+    return mask
+
+
+def _non_dominated_indices_2d(points: np.ndarray) -> np.ndarray:
+    # sweep over the points sorted ascending by the first and then by the second component
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    first, second = points[order, 0], points[order, 1]
+
+    # group points with equal first component
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = first[1:] != first[:-1]
+    group = np.cumsum(new_group) - 1
+    group_start = np.flatnonzero(new_group)
+
+    # minimal second component among all points with strictly smaller first component
+    running_min = np.minimum.accumulate(second)
+    min_before_group = np.full(len(group_start), np.inf)
+    min_before_group[1:] = running_min[group_start[1:] - 1]
+
+    is_pareto = (second == second[group_start][group]) & (second < min_before_group[group])
+    return np.sort(order[is_pareto])
+
+
+def _non_dominated_indices_blocked(points: np.ndarray, block_size: int) -> np.ndarray:
+    # A point can only be dominated by points with lower (or equal) sum of components which are lexicographically
+    # smaller. Hence, processing the points in this order, each point must only be compared to the non-dominated
+    # points found so far and to the points within its own block.
+    order = np.lexsort(tuple(points[:, i] for i in reversed(range(points.shape[1]))) + (np.sum(points, axis=1),))
+    front = np.empty(0, dtype=int)
+    for start in range(0, len(order), block_size):
+        block = order[start:start + block_size]
+        block = block[~dominated_mask(points[block], points[front])]
+        block = block[~dominated_mask(points[block], points[block])]
+        front = np.concatenate((front, block))
+    return np.sort(front)
+
+
+def non_dominated_indices(points: np.ndarray, block_size: int = 256) -> np.ndarray:
+    """Indices of the non-dominated points
+
+    A point is non-dominated (i.e. Pareto optimal among the points) if no other point is lower or equal in every
+    component and strictly lower in at least one component. In particular, duplicates of a non-dominated point are
+    non-dominated as well.
+
+    For two components a sort based sweep with complexity O(n log n) is applied.
+    For more components, the points are sorted by the sum of their components and filtered blockwise against the
+    non-dominated points found so far by a (vectorized) numpy broadcast.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        points stored in 2-dimensional array with first dimension corresponding to the points
+        (or 1-dimensional array of scalar values)
+
+    block_size : int default 256
+        number of points which are filtered at once if the points have more than two components
+
+    Returns
+    -------
+    np.ndarray
+        ascending indices of the non-dominated points
+
+    Examples
+    --------
+    >>> non_dominated_indices(np.array([[1, 2], [2, 1], [2, 2], [1, 2]]))
+    array([0, 1, 3])
+
+    """
+    points = _as_points(points)
+    if len(points) == 0:
+        return np.empty(0, dtype=int)
+
+    if points.shape[1] == 1:
+        return np.flatnonzero(points[:, 0] == np.min(points[:, 0]))
+
+    if points.shape[1] == 2:
+        return _non_dominated_indices_2d(points)
+
+    return _non_dominated_indices_blocked(points, block_size)
+
+
+def non_dominated_points(points: np.ndarray) -> np.ndarray:
+    """Non-dominated points, i.e. the Pareto front of the points
+
+    Parameters
+    ----------
+    points : np.ndarray
+        points stored in 2-dimensional array with first dimension corresponding to the points
+        (or 1-dimensional array of scalar values)
+
+    Returns
+    -------
+    np.ndarray
+        non-dominated points in the order they appear in points
+
+    """
+    points = np.asarray(points)
+    return points[non_dominated_indices(points)]
@@ -0,0 +1,126 @@
+import numpy as np
+
+from paref.pareto_dominance.non_dominated_sorting import non_dominated_indices, dominated_mask
+
+
+class ParetoArchive:
+    """Incrementally maintained archive of the non-dominated points
+
+    The archive stores the indices and values of all points which are non-dominated among the points added so far.
+    Each added point is compared to the current archive only: if it is dominated, it is discarded and otherwise
+    all archived points it dominates are evicted.
+    Hence, adding a point costs O(|archive|) instead of recomputing the non-dominated points from scratch.
+
+    .. note::
+
+        Points must be added in ascending order of their indices (e.g. in the order the evaluations are stored).
+        Then, the indices of the archive are ascending as well.
+
+    Examples
+    --------
+    >>> archive = ParetoArchive()
+    >>> archive.add(0, np.array([1, 2]))
+    True
+    >>> archive.add(1, np.array([2, 2]))
+    False
+    >>> archive.add(2, np.array([0, 2]))
+    True
+    >>> archive.indices
+    array([2])
+
+    """
+
+    def __init__(self):
+        self._indices = np.empty(0, dtype=int)
+        self._points = None
+
+    def add(self, index: int, point: np.ndarray) -> bool:
+        """Add a point to the archive
+
+        Parameters
+        ----------
+        index : int
+            index of the point (e.g. index of the evaluation)
+
+        point : np.ndarray
+            point stored in 1-dimensional array (or scalar)
+
+        Returns
+        -------
+        bool
+            true if the point is non-dominated by the archive (and was added) and false otherwise
+
+        """
+        point = np.asarray(point, dtype=float).reshape(1, -1)
+        if self._points is None:
+            self._indices, self._points = np.array([index]), point
+            return True
+
+        if dominated_mask(point, self._points)[0]:
+            return False
+
+        keep = ~dominated_mask(self._points, point)
+        self._indices = np.append(self._indices[keep], index)
+        self._points = np.concatenate((self._points[keep], point))
+        return True
+
+    def extend(self, indices: np.ndarray, points: np.ndarray) -> None:
+        """Add several points to the archive
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            ascending indices of the points
+
+        points : np.ndarray
+            points stored in 2-dimensional array with first dimension corresponding to the points
+            (or 1-dimensional array of scalar values)
+
+        """
+        if len(points) == 0:
+            return
+        points = np.asarray(points, dtype=float).reshape(len(points), -1)
+        if self._points is not None:
+            indices = np.concatenate((self._indices, indices))
+            points = np.concatenate((self._points, points))
+
+        pareto_indices = non_dominated_indices(points)
+        self._indices, self._points = np.asarray(indices)[pareto_indices], points[pareto_indices]
+
+    def clear(self) -> None:
+        """Remove all points from the archive
+        """
+        self._indices = np.empty(0, dtype=int)
+        self._points = None
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Ascending indices of the non-dominated points
+
+        Returns
+        -------
+        np.ndarray
+            indices of the non-dominated points
+
+        """
+        return self._indices
+
+    @property
+    def points(self) -> np.ndarray:
+        """Non-dominated points
+
+        Returns
+        -------
+        np.ndarray
+            non-dominated points stored in 2-dimensional array with first dimension corresponding to the points
+
+        """
+        if self._points is None:
+            return np.empty((0, 0))
+        return self._points
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __contains__(self, index: int) -> bool:
+        return bool(np.any(self._indices == index))
@@ -4,6 +4,7 @@ from typing import Union
 import numpy as np
 
 from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
+from paref.pareto_dominance.dominance_index import DominanceIndex
 
 
 class AvoidPoints(ParetoReflection):
@@ -90,8 +91,60 @@ class AvoidPoints(ParetoReflection):
             raise ValueError('Epsilon must be positive!')
 
         self.nadir = nadir
-        self.epsilon = epsilon
-        self.epsilon_avoiding_points = epsilon_avoiding_points
+        self._epsilon = epsilon
+        self._epsilon_avoiding_points = epsilon_avoiding_points
+        self._index = None
+
+    @property
+    def epsilon(self) -> Union[numbers.Real, np.ndarray]:
+        return self._epsilon
+
+    @epsilon.setter
+    def epsilon(self, epsilon: Union[numbers.Real, np.ndarray]) -> None:
+        self._epsilon = epsilon
+        self._index = None
+
+    @property
+    def epsilon_avoiding_points(self) -> np.ndarray:
+        return self._epsilon_avoiding_points
+
+    @epsilon_avoiding_points.setter
+    def epsilon_avoiding_points(self, epsilon_avoiding_points: np.ndarray) -> None:
+        self._epsilon_avoiding_points = epsilon_avoiding_points
+        self._index = None
+
+    @property
+    def index(self) -> DominanceIndex:
+        """Spatial index of the avoided points minus epsilon (built at the first call)
+
+        Returns
+        -------
+        DominanceIndex
+            index of the avoided points minus epsilon (a scalar avoided point is compared to each component)
+
+        """
+        if self._index is None:
+            shifted_points = np.asarray(self._epsilon_avoiding_points, dtype=float).reshape(
+                len(self._epsilon_avoiding_points), -1) - self._epsilon
+            self._index = DominanceIndex(np.broadcast_to(shifted_points, (len(shifted_points), len(self.nadir))))
+        return self._index
+
+    def nadir_mask(self, x: np.ndarray) -> np.ndarray:
+        """Indicate which inputs are mapped to the nadir
+
+        Parameters
+        ----------
+        x : np.ndarray
+            input vectors stored in 2-dimensional array with first dimension corresponding to the inputs
+
+        Returns
+        -------
+        np.ndarray
+            boolean array which is true at index i if some avoided point minus epsilon is lower or equal than the
+            ith input in every component
+
+        """
+        return self.index.query(x)
 
     def __call__(self, x: np.ndarray):
         """Calculate the epsilon avoiding function
@@ -110,12 +163,34 @@ class AvoidPoints(ParetoReflection):
         """
         if len(x.shape) != 1:
             raise ValueError(f'Input x must be of dimension 1! Shape of x is {x.shape}.')
-        for point in self.epsilon_avoiding_points:
-            if np.all(point - self.epsilon <= x):
-                return self.nadir
+        if self.nadir_mask(x[np.newaxis])[0]:
+            return self.nadir
 
         return x
 
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        """Calculate the epsilon avoiding function for several inputs at once
+
+        Parameters
+        ----------
+        x : np.ndarray
+            input vectors stored in 2-dimensional array with first dimension corresponding to the inputs
+
+        Returns
+        -------
+        np.ndarray
+            values of the epsilon avoiding function stored in 2-dimensional array
+
+        .. note::
+
+            The avoided points are looked up in a spatial index, i.e. the cost of an input grows logarithmically
+            (two components) or blockwise (more components) with the number of avoided points.
+
+        """
+        if len(x.shape) != 2:
+            raise ValueError(f'Input x must be of dimension 2! Shape of x is {x.shape}.')
+        return np.where(self.nadir_mask(x)[:, np.newaxis], self.nadir, x)
+
     @property
     def dimension_codomain(self) -> int:
         return len(self.nadir)
@@ -58,3 +58,8 @@ class FillGap(MinGParetoReflection):
     @property
     def g(self, ) -> Callable:
         return self._g
+
+    @property
+    def batch_g(self) -> Callable:
+        # norm of the projections onto the span of the gap
+        return lambda x: np.linalg.norm((x - self.center) @ self.orthogonal_basis.T @ self.orthogonal_basis, axis=1)
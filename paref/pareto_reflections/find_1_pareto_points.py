@@ -48,3 +48,7 @@ class Find1ParetoPoints(MinGParetoReflection):
     @property
     def g(self):
         return lambda x: x[self.dimension]
+
+    @property
+    def batch_g(self):
+        return lambda x: x[:, self.dimension]
@@ -52,3 +52,7 @@ class FindEdgePoints(MinGParetoReflection):
     @property
     def g(self):
         return lambda x: np.sum(x) - x[self.dimension]
+
+    @property
+    def batch_g(self):
+        return lambda x: np.sum(x, axis=1) - x[:, self.dimension]
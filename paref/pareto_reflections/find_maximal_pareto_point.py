@@ -43,13 +43,20 @@ class FindMaximalParetoPoint(ParetoReflection):
         self.bbf = blackbox_function
 
     def __call__(self, x: np.ndarray) -> np.ndarray:
+        self._update_minimum()
+        return np.linalg.norm(x - self.m, ord=self.potency)
+
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        self._update_minimum()
+        return np.linalg.norm(x - self.m, ord=self.potency, axis=1)
+
+    def _update_minimum(self):
         if self._counter < 2:
             self._counter += 1
             if len(self.bbf.y) == 0:
                 self.m = 0
             else:
                 self.m = np.min(self.bbf.y, axis=0)
-        return np.linalg.norm(x - self.m, ord=self.potency)
 
     @property
     def dimension_codomain(self) -> int:
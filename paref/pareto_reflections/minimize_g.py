@@ -5,6 +5,17 @@ import numpy as np
 
 from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
 from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
+from paref.moo_algorithms.minimizer.optimal_scaling import LinearScaling
+
+
+def identity(x: np.ndarray) -> np.ndarray:
+    # default scaling (a module level function, such that the Pareto reflection can be pickled)
+    return x
+
+
+def _is_vectorized(scaling: Callable[[np.ndarray], np.ndarray]) -> bool:
+    # the built-in scalings are applied componentwise, i.e. they broadcast over several inputs
+    return scaling is identity or isinstance(scaling, LinearScaling)
 
 
 class MinGParetoReflection(ParetoReflection):
@@ -35,8 +46,8 @@ class MinGParetoReflection(ParetoReflection):
     def __init__(self,
                  blackbox_function: BlackboxFunction,
                  epsilon: Union[float, np.ndarray] = 1e-2,
-                 scaling_g: Callable[[np.ndarray], np.ndarray] = lambda x: x,
-                 scaling_x: Callable[[np.ndarray], np.ndarray] = lambda x: x, ):
+                 scaling_g: Callable[[np.ndarray], np.ndarray] = identity,
+                 scaling_x: Callable[[np.ndarray], np.ndarray] = identity, ):
         """
 
         Parameters
@@ -48,11 +59,13 @@ class MinGParetoReflection(ParetoReflection):
         epsilon : Union[float, np.ndarray] default 1e-3
             epsilon determining weight of components
 
-        scaling_g : Callable[[np.ndarray], np.ndarray] default lambda x: x
-            scaling function for g
+        scaling_g : Callable[[np.ndarray], np.ndarray] default identity
+            scaling function for g (applied to the value of g at a single point)
 
-        scaling_x : Callable[[np.ndarray], np.ndarray] default lambda x: x
-            scaling function for x
+        scaling_x : Callable[[np.ndarray], np.ndarray] default identity
+            scaling function for x (applied to a single point). Only the built-in scalings (identity and
+            :py:class:`LinearScaling <paref.moo_algorithms.minimizer.optimal_scaling.LinearScaling>`) are applied
+            to several points at once by batch_call, any other scaling is applied point by point
         """
         self.bbf = blackbox_function
         self._epsilon = epsilon
@@ -63,6 +76,13 @@ class MinGParetoReflection(ParetoReflection):
     def __call__(self, x: np.ndarray) -> np.ndarray:
         return self.scaling_g(self.g(x)) + np.sum(self._epsilon * self.scaling_x(x))
 
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        if not (_is_vectorized(self.scaling_g) and _is_vectorized(self.scaling_x)):
+            # user-supplied scalings need not broadcast over several inputs
+            return np.array([self(point) for point in x]).reshape(len(x))
+        # the scalings are applied to all inputs at once
+        return self.scaling_g(self.batch_g(x)) + np.sum(self._epsilon * self.scaling_x(x), axis=1)
+
     @property
     def dimension_domain(self) -> int:
         return self.bbf.dimension_target_space
@@ -75,3 +95,11 @@ class MinGParetoReflection(ParetoReflection):
     @abstractmethod
     def g(self) -> Callable[[np.ndarray], np.ndarray]:
         raise NotImplementedError
+
+    @property
+    def batch_g(self) -> Callable[[np.ndarray], np.ndarray]:
+        """g applied to several inputs stored in 2-dimensional array with first dimension corresponding to the inputs
+
+        Overwrite this property with a vectorized implementation of g if possible.
+        """
+        return lambda x: np.array([self.g(point) for point in x])
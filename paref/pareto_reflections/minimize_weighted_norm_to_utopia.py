@@ -78,6 +78,11 @@ class MinimizeWeightedNormToUtopia(ParetoReflection):
             raise ValueError(f'Input x must be of dimension 1! Shape of x is {x.shape}.')
         return np.linalg.norm(self.scalar*(x-self.utopia_point), ord=self.potency)
 
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        if len(x.shape) != 2:
+            raise ValueError(f'Input x must be of dimension 2! Shape of x is {x.shape}.')
+        return np.linalg.norm(self.scalar * (x - self.utopia_point), ord=self.potency, axis=1)
+
     @property
     def dimension_codomain(self) -> int:
         return 1
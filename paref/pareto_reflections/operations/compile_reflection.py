@@ -0,0 +1,222 @@
+import threading
+from typing import List, Tuple
+
+import numpy as np
+
+from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
+from paref.pareto_dominance.dominance_index import DominanceIndex
+from paref.pareto_reflections.avoid_points import AvoidPoints
+from paref.pareto_reflections.operations.compose_reflections import ComposeReflections
+from paref.pareto_reflections.restrict_by_point import RestrictByPoint
+
+
+def flatten_reflection(pareto_reflection: ParetoReflection) -> List[ParetoReflection]:
+    """Flatten (nested) compositions of Pareto reflections
+
+    Parameters
+    ----------
+    pareto_reflection : ParetoReflection
+        Pareto reflection
+
+    Returns
+    -------
+    List[ParetoReflection]
+        Pareto reflections which are not compositions in the order they are applied
+
+    """
+    if isinstance(pareto_reflection, CompiledReflection):
+        return list(pareto_reflection.stages)
+    if isinstance(pareto_reflection, ComposeReflections):
+        return (flatten_reflection(pareto_reflection.pareto_reflecting_function_1)
+                + flatten_reflection(pareto_reflection.pareto_reflecting_function_2))
+    return [pareto_reflection]
+
+
+def _is_masking(pareto_reflection: ParetoReflection) -> bool:
+    # masking Pareto reflections map an input either to itself or to their nadir
+    return type(pareto_reflection) in (RestrictByPoint, AvoidPoints)
+
+
+class _MaskingKernel:
+    # fused consecutive masking Pareto reflections
+    #
+    # An input is kept if every stage keeps it. Otherwise, it is mapped to the nadir of the first stage which does
+    # not keep it and the remaining stages are applied to that nadir, i.e. it is mapped to a constant which is
+    # computed once. Hence, the masks of all stages are computed on the inputs themselves.
+
+    def __init__(self, stages: List[ParetoReflection]):
+        self.tests = []
+        for i, stage in enumerate(stages):
+            value = np.asarray(stage.nadir, dtype=float)
+            for later_stage in stages[i + 1:]:
+                value = np.asarray(later_stage(value), dtype=float)
+            if isinstance(stage, RestrictByPoint):
+                # the input is masked if any component exceeds the restricting point
+                self.tests.append((np.asarray(stage.restricting_point, dtype=float), value))
+            else:
+                # the input is masked if it lies in the dominance box of any avoided point minus epsilon
+                self.tests.append((stage.index, value))
+
+    def __call__(self, x: np.ndarray, scratch: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        comparison, mask = scratch
+        out = np.array(x, dtype=float)
+        # the first stage masking an input determines its value, hence the stages are applied in reverse order
+        for test, value in reversed(self.tests):
+            if isinstance(test, DominanceIndex):
+                out[test.query(x)] = value
+            else:
+                np.less(test, x, out=comparison)
+                comparison.any(axis=1, out=mask)
+                out[mask] = value
+        return out
+
+
+class CompiledReflection(ParetoReflection):
+    """Pareto reflection compiled into a flat pipeline of vectorized kernels
+
+    Compositions of Pareto reflections are nested, i.e. each call of a composition dispatches to all of its
+    components and allocates intermediate arrays. Compiling a Pareto reflection flattens (nested) compositions into
+    the sequence of Pareto reflections which are applied and fuses consecutive masking Pareto reflections
+    (:py:class:`RestrictByPoint <paref.pareto_reflections.restrict_by_point.RestrictByPoint>` and
+    :py:class:`AvoidPoints <paref.pareto_reflections.avoid_points.AvoidPoints>`) into a single kernel operating on
+    preallocated scratch buffers. All other Pareto reflections are applied by their batch call.
+
+    The compiled Pareto reflection is equal to (and has the same hash as) the Pareto reflection it is compiled from.
+    The minimizers compile the Pareto reflections they minimize automatically.
+
+    The avoided points are looked up in the spatial index of the
+    :py:class:`AvoidPoints <paref.pareto_reflections.avoid_points.AvoidPoints>` Pareto reflection.
+
+    .. warning::
+        The nadirs, restricting points and avoided points of masking Pareto reflections are read when compiling,
+        i.e. the Pareto reflection must be compiled again if they change.
+
+    Examples
+    --------
+    >>> pareto_reflection = compile_reflection(ComposeReflections(RestrictByPoint(nadir, restricting_point),
+    >>>                                                           FindEdgePoints(dimension=0, blackbox_function=bbf)))
+    >>> pareto_reflection.batch_call(bbf.y)
+
+    """
+
+    def __init__(self, pareto_reflection: ParetoReflection):
+        """
+
+        Parameters
+        ----------
+        pareto_reflection : ParetoReflection
+            Pareto reflection which is compiled
+        """
+        self._pareto_reflection = pareto_reflection
+        self.stages = tuple(flatten_reflection(pareto_reflection))
+        self._kernels = []
+        i = 0
+        while i < len(self.stages):
+            j = i
+            while j < len(self.stages) and _is_masking(self.stages[j]):
+                j += 1
+            if j > i:
+                self._kernels.append(_MaskingKernel(list(self.stages[i:j])))
+                i = j
+            else:
+                self._kernels.append(self.stages[i].batch_call)
+                i += 1
+        self._scratch = threading.local()
+
+    def __getstate__(self) -> dict:
+        # the scratch buffers are local to each thread
+        state = self.__dict__.copy()
+        del state['_scratch']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._scratch = threading.local()
+
+    def _scratch_buffers(self, shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        # scratch buffers of the masking kernels (reallocated only if the shape of the inputs changes)
+        buffers = getattr(self._scratch, 'buffers', None)
+        if buffers is None or buffers[0].shape != shape:
+            buffers = (np.empty(shape, dtype=bool), np.empty(shape[0], dtype=bool))
+            self._scratch.buffers = buffers
+        return buffers
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """
+
+        Parameters
+        ----------
+        x : np.ndarray
+            input of Pareto reflection
+
+        Returns
+        -------
+        np.ndarray
+            value of the Pareto reflection at x
+
+        """
+        if len(np.shape(x)) != 1:
+            raise ValueError(f'Input x must be of dimension 1! Shape of x is {np.shape(x)}.')
+        return self.batch_call(np.asarray(x)[np.newaxis])[0]
+
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x)
+        if len(x.shape) != 2:
+            raise ValueError(f'Input x must be of dimension 2! Shape of x is {x.shape}.')
+        for kernel in self._kernels:
+            if isinstance(kernel, _MaskingKernel):
+                x = kernel(x, self._scratch_buffers(x.shape))
+            else:
+                x = kernel(x)
+        return x
+
+    @property
+    def pareto_reflection(self) -> ParetoReflection:
+        """
+
+        Returns
+        -------
+        ParetoReflection
+            Pareto reflection which is compiled
+
+        """
+        return self._pareto_reflection
+
+    @property
+    def parameter_version(self) -> int:
+        return self._pareto_reflection.parameter_version
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompiledReflection):
+            other = other.pareto_reflection
+        return self._pareto_reflection == other
+
+    def __hash__(self) -> int:
+        return hash(self._pareto_reflection)
+
+    @property
+    def dimension_codomain(self) -> int:
+        return self._pareto_reflection.dimension_codomain
+
+    @property
+    def dimension_domain(self) -> int:
+        return self._pareto_reflection.dimension_domain
+
+
+def compile_reflection(pareto_reflection: ParetoReflection) -> CompiledReflection:
+    """Compile a Pareto reflection into a flat pipeline of vectorized kernels
+
+    Parameters
+    ----------
+    pareto_reflection : ParetoReflection
+        Pareto reflection (e.g. a composition of Pareto reflections)
+
+    Returns
+    -------
+    CompiledReflection
+        compiled Pareto reflection (the Pareto reflection itself if it is compiled already)
+
+    """
+    if isinstance(pareto_reflection, CompiledReflection):
+        return pareto_reflection
+    return CompiledReflection(pareto_reflection)
@@ -42,10 +42,28 @@ class ComposeReflections(ParetoReflection):
         """
         return self.pareto_reflecting_function_2(self.pareto_reflecting_function_1(x))
 
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        return self.pareto_reflecting_function_2.batch_call(self.pareto_reflecting_function_1.batch_call(x))
+
+    def __eq__(self, other) -> bool:
+        # compositions of the same Pareto reflections are equal
+        if not isinstance(other, ComposeReflections):
+            return NotImplemented
+        return (self.pareto_reflecting_function_1 == other.pareto_reflecting_function_1
+                and self.pareto_reflecting_function_2 == other.pareto_reflecting_function_2)
+
+    def __hash__(self) -> int:
+        return hash((self.pareto_reflecting_function_1, self.pareto_reflecting_function_2))
+
+    @property
+    def parameter_version(self) -> int:
+        return (super().parameter_version + self.pareto_reflecting_function_1.parameter_version
+                + self.pareto_reflecting_function_2.parameter_version)
+
     @property
     def dimension_codomain(self) -> int:
-        return self.pareto_reflecting_function_1.dimension_codomain
+        return self.pareto_reflecting_function_2.dimension_codomain
 
     @property
     def dimension_domain(self) -> int:
-        return self.pareto_reflecting_function_2.dimension_domain
+        return self.pareto_reflecting_function_1.dimension_domain
@@ -50,3 +50,8 @@ class PrioritySearch(MinGParetoReflection):
     def g(self) -> Callable:
         return lambda x: np.linalg.norm(np.sum(np.array([np.dot(x - self._center, basis_vector) * basis_vector
                                                          for basis_vector in self.orthogonal_basis]), axis=0))
+
+    @property
+    def batch_g(self) -> Callable:
+        # norm of the projections onto the span of the edge points
+        return lambda x: np.linalg.norm((x - self._center) @ self.orthogonal_basis.T @ self.orthogonal_basis, axis=1)
@@ -93,11 +93,48 @@ class RestrictByPoint(ParetoReflection):
                 f'Shapes don\'t match! Shape of x is {x.shape}, shape of restricting point is '
                 f'{self.restricting_point.shape}!')
 
-        if np.any(self.restricting_point < x):
+        if self.nadir_mask(x[np.newaxis])[0]:
             return self.nadir
         else:
             return x
 
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        """Calculate the RestrictByPoint function for several inputs at once
+
+        Parameters
+        ----------
+        x : np.ndarray
+            input vectors stored in 2-dimensional array with first dimension corresponding to the inputs
+
+        Returns
+        -------
+        np.ndarray
+            values of the restricting function stored in 2-dimensional array
+
+        """
+        if len(x.shape) != 2 or x.shape[1:] != self.restricting_point.shape:
+            raise ValueError(
+                f'Shapes don\'t match! Shape of x is {x.shape}, inputs must be of the shape of the restricting point '
+                f'{self.restricting_point.shape}!')
+
+        return np.where(self.nadir_mask(x)[:, np.newaxis], self.nadir, x)
+
+    def nadir_mask(self, x: np.ndarray) -> np.ndarray:
+        """Indicate which inputs are mapped to the nadir
+
+        Parameters
+        ----------
+        x : np.ndarray
+            input vectors stored in 2-dimensional array with first dimension corresponding to the inputs
+
+        Returns
+        -------
+        np.ndarray
+            boolean array which is true at index i if some component of the ith input exceeds the restricting point
+
+        """
+        return np.any(self.restricting_point < x, axis=1)
+
     @property
     def dimension_codomain(self) -> int:
         return len(self.nadir)
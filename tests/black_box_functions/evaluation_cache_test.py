@@ -0,0 +1,80 @@
+import asyncio
+
+import numpy as np
+
+from paref.blackbox_functions.evaluation_cache import EvaluationCache
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+from tests.interfaces.moo_algorithms.async_blackbox_function_test import LocalAsyncBlackboxFunction
+
+
+class CountingBlackboxFunction(QuadraticBlackboxFunction):
+    def __init__(self):
+        self.number_calls = 0
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        self.number_calls += 1
+        return np.array([np.sum(x ** 2), np.sum((x - 1) ** 2)])
+
+
+def test_near_duplicates_are_found_by_hash_and_tree():
+    rng = np.random.default_rng(0)
+    x = rng.random((200, 3))
+    cache = EvaluationCache(tolerance=1e-3)
+    cache.add(x, np.arange(200))
+    values = cache.lookup(np.concatenate((x + rng.uniform(-1e-3, 1e-3, x.shape), rng.random((10, 3)) + 2)))
+
+    assert [int(value) for value in values[:200]] == list(range(200))
+    assert values[200:] == [None] * 10
+    assert (cache.hits, cache.misses) == (200, 10)
+
+
+def test_tolerance_is_inclusive_for_indexed_and_recent_inputs():
+    cache = EvaluationCache(tolerance=0.5)
+    cache.add(2. * np.arange(100).reshape(-1, 1), np.arange(100))
+    # the first lookup indexes the inputs, later inputs are compared directly until they are indexed
+    assert cache.lookup(np.array([[0.5]])) == [0]
+    cache.add(np.array([[1000.]]), np.array([100]))
+    assert cache.lookup(np.array([[1000.5], [10.5]])) == [100, 5]
+
+
+def test_cached_evaluations_are_not_recomputed():
+    bbf = CountingBlackboxFunction()
+    bbf(np.zeros(2))
+    bbf.enable_cache(tolerance=1e-6)
+    np.testing.assert_allclose(bbf(np.array([1e-7, 0])), [0, 2])
+    bbf(np.ones(2))
+    assert bbf.number_calls == 2
+    assert len(bbf.evaluations) == 2
+    assert (bbf.cache.hits, bbf.cache.misses) == (1, 1)
+
+    bbf.enable_cache(record_duplicates=True)
+    bbf(np.ones(2))
+    assert bbf.number_calls == 2
+    assert len(bbf.evaluations) == 3
+
+
+def test_batch_evaluates_only_missing_points():
+    bbf = LocalAsyncBlackboxFunction()
+    bbf.enable_cache()
+    bbf(np.zeros(2))
+    y = bbf(np.array([[1., 1.], [0., 0.], [1., 0.]]), batch_evaluation=True)
+    np.testing.assert_allclose(y, [[2, 0], [0, 2], [1, 1]])
+    asyncio.run(bbf.evaluate(np.ones(2)))
+
+    assert bbf.max_in_flight == 2
+    assert len(bbf.evaluations) == 3
+    assert (bbf.cache.hits, bbf.cache.misses) == (2, 3)
+
+
+def test_duplicates_of_discarded_evaluations_are_stored_again():
+    bbf = CountingBlackboxFunction()
+    bbf.enable_cache()
+    bbf(np.zeros(2))
+    bbf(np.ones(2))
+    bbf.truncate_evaluations(1)
+
+    np.testing.assert_allclose(bbf(np.ones(2)), [2, 0])
+    bbf(np.zeros(2))
+    assert bbf.number_calls == 2
+    assert len(bbf.evaluations) == 2
+    np.testing.assert_allclose(bbf.x, [[0, 0], [1, 1]])
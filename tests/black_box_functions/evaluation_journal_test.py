@@ -0,0 +1,61 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from paref.blackbox_functions.evaluation_journal import EvaluationJournal
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+
+
+def test_journal_is_memory_mapped_and_discards_incomplete_records(tmp_path):
+    path = str(tmp_path / 'evaluations.journal')
+    with EvaluationJournal(path, sync_every=2) as journal:
+        journal.append(np.zeros(2), np.ones(3))
+        journal.extend(np.ones((2, 2)), np.zeros((2, 3)))
+        assert len(journal) == 3
+        with pytest.raises(ValueError):
+            journal.append(np.zeros(3), np.ones(3))
+
+    # a crash while writing a record
+    with open(path, 'ab') as file:
+        file.write(b'\x00' * 12)
+
+    x, y = EvaluationJournal.read(path)
+    assert isinstance(x.base, np.memmap)
+    assert x.shape == (3, 2) and y.shape == (3, 3)
+    np.testing.assert_allclose(y[0], np.ones(3))
+
+    with EvaluationJournal(path) as journal:
+        assert len(journal) == 3
+        journal.truncate(1)
+        journal.append(np.ones(2), np.ones(3))
+    x, y = EvaluationJournal.read(path)
+    np.testing.assert_allclose(x, [[0, 0], [1, 1]])
+
+
+def test_blackbox_function_resumes_from_journal(tmp_path):
+    path = str(tmp_path / 'evaluations.journal')
+    bbf = QuadraticBlackboxFunction()
+    bbf(np.zeros(2))
+    bbf.open_journal(path, sync_every=1)
+    bbf.perform_lhc(4)
+    bbf(np.ones(2))
+    bbf.truncate_evaluations(5)
+    # the journal does not belong to pickled copies
+    assert pickle.loads(pickle.dumps(bbf)).journal is None
+    with pytest.raises(ValueError):
+        QuadraticBlackboxFunction().open_journal(path)
+
+    # resume after a crash (the journal was not closed)
+    resumed = QuadraticBlackboxFunction()
+    resumed.load(path, resume=True)
+    np.testing.assert_allclose(resumed.x, bbf.x)
+    np.testing.assert_allclose(resumed.y, bbf.y)
+    resumed(np.ones(2))
+    resumed.close_journal()
+
+    loaded = QuadraticBlackboxFunction()
+    loaded.load(path)
+    assert len(loaded.evaluations) == 6
+    assert loaded.journal is None
+    np.testing.assert_allclose(loaded.y[-1], [2, 0])
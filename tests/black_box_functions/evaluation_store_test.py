@@ -0,0 +1,89 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from paref.blackbox_functions.design_space.bounds import Bounds
+from paref.blackbox_functions.evaluation_store import EvaluationStore
+from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
+
+
+class QuadraticBlackboxFunction(BlackboxFunction):
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return np.array([np.sum(x ** 2), np.sum((x - 1) ** 2)])
+
+    @property
+    def dimension_design_space(self) -> int:
+        return 2
+
+    @property
+    def dimension_target_space(self) -> int:
+        return 2
+
+    @property
+    def design_space(self) -> Bounds:
+        return Bounds(upper_bounds=np.ones(2), lower_bounds=np.zeros(2))
+
+
+def test_append_grows_beyond_initial_capacity():
+    store = EvaluationStore(initial_capacity=2)
+    for i in range(10):
+        store.append(np.array([i, i]), np.array([i, 2 * i, 3 * i]))
+
+    assert len(store) == 10
+    assert store.x.shape == (10, 2)
+    assert store.y.shape == (10, 3)
+    assert (store.y[:, 1] == 2 * np.arange(10)).all()
+
+
+def test_views_are_read_only():
+    store = EvaluationStore()
+    store.append(np.zeros(2), np.ones(2))
+    with pytest.raises(ValueError):
+        store.y[0, 0] = 2
+
+
+def test_scalar_outputs():
+    store = EvaluationStore()
+    store.extend(np.zeros((3, 2)), np.array([1., 2., 3.]))
+    store.append(np.ones(2), 4.)
+    assert (store.y == np.array([1., 2., 3., 4.])).all()
+
+
+def test_list_compatibility():
+    store = EvaluationStore.from_list([[np.zeros(2), np.ones(2)], [np.ones(2), np.zeros(2)]])
+    store.append([np.ones(2), np.ones(2)])
+
+    x, y = store[-1]
+    assert (x == np.ones(2)).all() and (y == np.ones(2)).all()
+    assert len(store[:2]) == 2 and isinstance(store[:2], list)
+    assert [evaluation[0].tolist() for evaluation in store[1:]] == [[1, 1], [1, 1]]
+    assert [evaluation[1].tolist() for evaluation in store] == [[1, 1], [0, 0], [1, 1]]
+
+    store.truncate(1)
+    assert len(store) == 1
+
+
+def test_blackbox_function_stores_evaluations():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(5)
+    bbf(np.zeros(2))
+
+    assert len(bbf.evaluations) == 6
+    assert bbf.x.shape == (6, 2)
+    assert (bbf.y[-1] == np.array([0, 2])).all()
+
+    bbf.evaluations = bbf.evaluations.to_list()[:3]
+    assert isinstance(bbf.evaluations, EvaluationStore)
+    assert len(bbf.y) == 3
+
+
+def test_parallel_evaluations_are_stored():
+    bbf = QuadraticBlackboxFunction()
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(bbf, np.random.default_rng(0).random((500, 2))))
+
+    assert len(bbf.evaluations) == 500
+    assert np.allclose(bbf.y[:, 0], np.sum(bbf.x ** 2, axis=1))
+    assert np.array_equal(pickle.loads(pickle.dumps(bbf.evaluations)).y, bbf.y)
@@ -0,0 +1,121 @@
+import pickle
+import time
+from concurrent.futures import TimeoutError
+
+import numpy as np
+import pytest
+
+from paref.blackbox_functions.design_space.bounds import Bounds
+from paref.blackbox_functions.parallel_blackbox_function import ParallelBlackboxFunction
+from paref.interfaces.moo_algorithms.blackbox_function import BlackboxFunction
+
+
+class QuadraticBlackboxFunction(BlackboxFunction):
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return np.array([np.sum(x ** 2), np.sum((x - 1) ** 2)])
+
+    @property
+    def dimension_design_space(self) -> int:
+        return 2
+
+    @property
+    def dimension_target_space(self) -> int:
+        return 2
+
+    @property
+    def design_space(self) -> Bounds:
+        return Bounds(upper_bounds=np.ones(2), lower_bounds=np.zeros(2))
+
+
+class FlakyBlackboxFunction(QuadraticBlackboxFunction):
+    # fails at the first evaluation and sleeps at the second one
+    def __init__(self):
+        self.number_calls = 0
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        self.number_calls += 1
+        if self.number_calls == 1:
+            raise RuntimeError('Simulation crashed!')
+        if self.number_calls == 2:
+            time.sleep(0.5)
+        return np.array([np.sum(x ** 2), np.sum((x - 1) ** 2)])
+
+
+class SleepingBlackboxFunction(QuadraticBlackboxFunction):
+    # sleeps x[0] seconds at the first number_sleeps evaluations
+    def __init__(self, number_sleeps: int):
+        self.number_sleeps = number_sleeps
+        self.number_calls = 0
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        self.number_calls += 1
+        if self.number_calls <= self.number_sleeps:
+            time.sleep(x[0])
+        return np.array([np.sum(x ** 2), np.sum((x - 1) ** 2)])
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_batch_evaluation_is_ordered_and_stored(executor):
+    bbf = QuadraticBlackboxFunction()
+    x = np.random.random((7, 2))
+    with ParallelBlackboxFunction(bbf, max_workers=2, executor=executor, chunk_size=3) as parallel_bbf:
+        y = parallel_bbf(x, batch_evaluation=True)
+        parallel_bbf(np.zeros(2))
+
+    expected = np.stack([np.sum(x ** 2, axis=1), np.sum((x - 1) ** 2, axis=1)], axis=1)
+    np.testing.assert_allclose(y, expected)
+    assert len(parallel_bbf.evaluations) == 8
+    np.testing.assert_allclose(parallel_bbf.y[:7], expected)
+    np.testing.assert_allclose(parallel_bbf.y[7], [0, 2])
+    # the wrapped blackbox function does not store the evaluations
+    assert len(bbf.evaluations) == 0
+
+
+def test_perform_lhc_uses_batch_evaluation():
+    with ParallelBlackboxFunction(QuadraticBlackboxFunction(), max_workers=2, executor='thread') as parallel_bbf:
+        parallel_bbf.perform_lhc(10)
+
+    assert len(parallel_bbf.evaluations) == 10
+    assert parallel_bbf.x.shape == (10, 2)
+
+
+def test_failed_and_timed_out_tasks_are_retried():
+    parallel_bbf = ParallelBlackboxFunction(FlakyBlackboxFunction(), max_workers=2, executor='thread', timeout=0.1,
+                                            retries=2)
+    np.testing.assert_allclose(parallel_bbf(np.ones((1, 2)), batch_evaluation=True), [[2, 0]])
+    assert parallel_bbf.blackbox_function.number_calls == 3
+    parallel_bbf.close()
+
+    parallel_bbf = ParallelBlackboxFunction(FlakyBlackboxFunction(), executor='thread', timeout=0.1, retries=1)
+    with pytest.raises(TimeoutError):
+        parallel_bbf(np.ones(2))
+    parallel_bbf.close()
+    assert len(parallel_bbf.evaluations) == 0
+
+
+def test_pickle():
+    parallel_bbf = ParallelBlackboxFunction(QuadraticBlackboxFunction(), executor='thread')
+    parallel_bbf(np.zeros(2))
+    restored = pickle.loads(pickle.dumps(parallel_bbf))
+    parallel_bbf.close()
+
+    assert len(restored.evaluations) == 1
+    np.testing.assert_allclose(restored(np.ones(2)), [2, 0])
+    restored.close()
+
+
+def test_timeout_starts_at_submission():
+    parallel_bbf = ParallelBlackboxFunction(SleepingBlackboxFunction(2), max_workers=2, executor='thread', timeout=0.5)
+    # the second task times out although its result is awaited only after the first one
+    with pytest.raises(TimeoutError):
+        parallel_bbf(np.array([[0.4, 0], [0.8, 0]]), batch_evaluation=True)
+    parallel_bbf.close()
+
+
+def test_retries_are_not_queued_behind_timed_out_tasks():
+    parallel_bbf = ParallelBlackboxFunction(SleepingBlackboxFunction(1), max_workers=1, executor='thread', timeout=0.2,
+                                            retries=1)
+    start = time.perf_counter()
+    np.testing.assert_allclose(parallel_bbf(np.array([[1., 0]]), batch_evaluation=True), [[1, 1]])
+    assert time.perf_counter() - start < 0.8
+    parallel_bbf.close()
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import numpy as np
+
+from paref.blackbox_functions.design_space.bounds import Bounds
+from paref.interfaces.moo_algorithms.async_blackbox_function import AsyncBlackboxFunction
+from paref.moo_algorithms.stopping_criteria.max_iterations_reached import MaxIterationsReached
+from paref.pareto_reflections.minimize_weighted_norm_to_utopia import MinimizeWeightedNormToUtopia
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+from tests.interfaces.moo_algorithms.batch_proposal_test import RandomSearch
+
+
+class LocalAsyncBlackboxFunction(AsyncBlackboxFunction):
+    # in-process stand-in for a remote solver
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def evaluate(self, x: np.ndarray) -> np.ndarray:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.1)
+        self.in_flight -= 1
+        return np.array([np.sum(x ** 2), np.sum((x - 1) ** 2)])
+
+    @property
+    def dimension_design_space(self) -> int:
+        return 2
+
+    @property
+    def dimension_target_space(self) -> int:
+        return 2
+
+    @property
+    def design_space(self) -> Bounds:
+        return Bounds(upper_bounds=np.ones(2), lower_bounds=np.zeros(2))
+
+
+def test_evaluations_are_stored_once():
+    bbf = LocalAsyncBlackboxFunction()
+    np.testing.assert_allclose(asyncio.run(bbf.evaluate(np.zeros(2))), [0, 2])
+    np.testing.assert_allclose(bbf(np.ones(2)), [2, 0])
+    bbf.perform_lhc(5)
+
+    assert len(bbf.evaluations) == 7
+    # all samples of the LHC were in flight at once
+    assert bbf.max_in_flight == 5
+
+
+def test_inherited_call_stores_once():
+    class SubclassedBlackboxFunction(QuadraticBlackboxFunction):
+        pass
+
+    bbf = SubclassedBlackboxFunction()
+    bbf(np.zeros(2))
+    assert len(bbf.evaluations) == 1
+
+
+def test_apply_to_sequence_async_keeps_evaluations_in_flight():
+    bbf = LocalAsyncBlackboxFunction()
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    moo = RandomSearch()
+    start = time.perf_counter()
+    asyncio.run(moo.apply_to_sequence_async(bbf, reflection, MaxIterationsReached(9), max_in_flight=3))
+
+    assert len(bbf.evaluations) == 9
+    assert bbf.max_in_flight == 3
+    assert bbf.in_flight == 0
+    assert time.perf_counter() - start < 9 * 0.1
+    assert len(moo.best_fits) != 0
+
+
+class SlowRandomSearch(RandomSearch):
+    # records the number of evaluations at the start and the end of each proposal
+    def __init__(self):
+        self.lengths = []
+
+    def propose(self, blackbox_function):
+        length = len(blackbox_function.evaluations)
+        time.sleep(0.15)
+        self.lengths.append((length, len(blackbox_function.evaluations)))
+        return np.random.default_rng(len(self.lengths)).random(2)
+
+
+def test_evaluations_do_not_change_during_proposals():
+    bbf = LocalAsyncBlackboxFunction()
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    moo = SlowRandomSearch()
+    asyncio.run(moo.apply_to_sequence_async(bbf, reflection, MaxIterationsReached(6), max_in_flight=3))
+
+    assert len(bbf.evaluations) >= 6
+    assert all(start == end for start, end in moo.lengths)
+
+
+class ConstantSearch(RandomSearch):
+    def propose(self, blackbox_function):
+        return np.zeros(2)
+
+
+def test_cached_proposals_are_not_evaluated_again():
+    bbf = LocalAsyncBlackboxFunction()
+    bbf.enable_cache()
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    asyncio.run(ConstantSearch().apply_to_sequence_async(bbf, reflection, MaxIterationsReached(4), max_in_flight=1))
+
+    assert len(bbf.evaluations) == 1
+    assert (bbf.cache.hits, bbf.cache.misses) == (3, 1)
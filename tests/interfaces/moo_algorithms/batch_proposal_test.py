@@ -0,0 +1,58 @@
+import threading
+import time
+
+import numpy as np
+
+from paref.interfaces.moo_algorithms.paref_moo import ParefMOO, CompositionWithParetoReflection
+from paref.moo_algorithms.minimizer.gpr_minimizer import GPRMinimizer
+from paref.moo_algorithms.stopping_criteria.max_iterations_reached import MaxIterationsReached
+from paref.pareto_reflections.minimize_weighted_norm_to_utopia import MinimizeWeightedNormToUtopia
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+
+
+class SlowQuadraticBlackboxFunction(QuadraticBlackboxFunction):
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        time.sleep(0.2)
+        self.threads.add(threading.get_ident())
+        return np.array([np.sum(x ** 2), np.sum((x - 1) ** 2)])
+
+
+class RandomSearch(ParefMOO):
+    def propose(self, blackbox_function):
+        return np.random.default_rng(len(blackbox_function.y)).random(2)
+
+    def apply_moo_operation(self, blackbox_function):
+        blackbox_function(self.propose(blackbox_function))
+
+    @property
+    def supported_codomain_dimensions(self):
+        return None
+
+
+def test_batch_is_evaluated_concurrently():
+    bbf = SlowQuadraticBlackboxFunction()
+    bbf.threads = set()
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    start = time.perf_counter()
+    RandomSearch().apply_to_sequence(bbf, reflection, MaxIterationsReached(2), batch_size=4)
+
+    assert len(bbf.evaluations) == 8
+    assert len(bbf.threads) > 1
+    assert time.perf_counter() - start < 8 * 0.2
+
+
+def test_fantasized_batch_proposals_differ():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(20)
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    composition = CompositionWithParetoReflection(bbf, reflection)
+    moo = GPRMinimizer(max_iter_minimizer=50, training_iter=100)
+    proposals = moo.propose_batch([composition] * 3)
+
+    assert len(bbf.evaluations) == 20
+    # the evaluations at the first two proposals were fantasized
+    assert moo._gpr.number_training_points == 22
+    assert np.linalg.norm(proposals[0] - proposals[1]) > 1e-3
+
+    # the fantasized evaluations are discarded at the next training
+    assert moo._train_gpr(bbf.x, bbf.y).number_training_points == 20
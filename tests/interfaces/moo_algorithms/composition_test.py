@@ -0,0 +1,93 @@
+import numpy as np
+
+from paref.interfaces.moo_algorithms.paref_moo import CompositionWithParetoReflection
+from paref.pareto_reflections.minimize_weighted_norm_to_utopia import MinimizeWeightedNormToUtopia
+from paref.pareto_reflections.restrict_by_point import RestrictByPoint
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+
+
+class CountingReflection(RestrictByPoint):
+    # counts the outputs to which the Pareto reflection is applied in batch calls (in place, i.e. the parameter
+    # version does not change)
+    def __init__(self, nadir: np.ndarray, restricting_point: np.ndarray):
+        super().__init__(nadir, restricting_point)
+        self.counter = [0]
+
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        self.counter[0] += len(x)
+        return super().batch_call(x)
+
+    @property
+    def number_outputs(self) -> int:
+        return self.counter[0]
+
+
+def test_composed_evaluations_are_computed_lazily_and_cached():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(10)
+    reflection = CountingReflection(nadir=10 * np.ones(2), restricting_point=np.ones(2))
+    composition = CompositionWithParetoReflection(bbf, reflection)
+    assert reflection.number_outputs == 0
+
+    np.testing.assert_allclose(composition.y, reflection.batch_call(bbf.y))
+    assert reflection.number_outputs == 2 * 10
+    # the cache is shared by compositions with the same Pareto reflection
+    np.testing.assert_allclose(CompositionWithParetoReflection(bbf, reflection).y, composition.y)
+    assert reflection.number_outputs == 2 * 10
+
+    # only new evaluations are mapped
+    composition(np.zeros(2))
+    bbf(np.ones(2))
+    assert len(composition.evaluations) == 12
+    assert reflection.number_outputs == 2 * 10 + 2
+    np.testing.assert_allclose(composition.y[-2:], reflection.batch_call(bbf.y[-2:]))
+
+    # discarding evaluations invalidates the cache
+    bbf.truncate_evaluations(5)
+    assert len(composition.y) == 5
+    np.testing.assert_allclose(composition.y, reflection.batch_call(bbf.y))
+
+
+def test_nested_compositions_collapse():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(5)
+    inner = RestrictByPoint(nadir=10 * np.ones(2), restricting_point=np.ones(2))
+    outer = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    composition = CompositionWithParetoReflection(CompositionWithParetoReflection(bbf, inner), outer)
+
+    assert composition.blackbox_function is bbf
+    assert composition.pareto_reflections == (outer, inner)
+    np.testing.assert_allclose(composition(np.zeros(2)), outer(inner(bbf(np.zeros(2)))))
+    np.testing.assert_allclose(composition.y, outer.batch_call(inner.batch_call(bbf.y)))
+    assert len(bbf.evaluations) == 7
+
+
+def test_composed_evaluations_are_recomputed_if_parameters_change():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(5)
+    inner = RestrictByPoint(nadir=10 * np.ones(2), restricting_point=np.ones(2))
+    outer = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    composition = CompositionWithParetoReflection(CompositionWithParetoReflection(bbf, inner), outer)
+    np.testing.assert_allclose(composition.y, outer.batch_call(inner.batch_call(bbf.y)))
+
+    outer.scalar = 100 * np.ones(2)
+    np.testing.assert_allclose(composition.y, outer.batch_call(inner.batch_call(bbf.y)))
+    inner.restricting_point = 2 * np.ones(2)
+    np.testing.assert_allclose(composition.y, outer.batch_call(inner.batch_call(bbf.y)))
+
+
+class UnhashableReflection(RestrictByPoint):
+    # defining __eq__ without __hash__ makes instances unhashable
+    def __eq__(self, other) -> bool:
+        return self is other
+
+
+def test_composition_with_unhashable_reflection():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(5)
+    reflection = UnhashableReflection(nadir=10 * np.ones(2), restricting_point=np.ones(2))
+    composition = CompositionWithParetoReflection(bbf, reflection)
+
+    np.testing.assert_allclose(composition.y, reflection.batch_call(bbf.y))
+    bbf(np.zeros(2))
+    np.testing.assert_allclose(composition.y, reflection.batch_call(bbf.y))
@@ -0,0 +1,69 @@
+import numpy as np
+
+from paref.interfaces.sequences_pareto_reflections.sequence_pareto_reflections import SequenceParetoReflections
+from paref.pareto_reflection_sequences.generic.repeating_sequence import RepeatingSequence
+from paref.pareto_reflections.operations.compose_reflections import ComposeReflections
+from paref.pareto_reflections.restrict_by_point import RestrictByPoint
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+from tests.pareto_reflections.batch_call_test import Shift
+
+
+def brute_force_best_fits(pareto_reflection, points):
+    values = [pareto_reflection(point) for point in points]
+    pareto_points = [points[i] for i, value in enumerate(values)
+                     if not any(np.all(value >= other) and np.any(value > other) for other in values)]
+    return np.unique(np.array(pareto_points), axis=0)
+
+
+def test_best_fits_agrees_with_brute_force():
+    points = np.random.default_rng(0).uniform(size=(100, 2)).round(1)
+    pareto_reflection = ComposeReflections(Shift(), RestrictByPoint(nadir=np.ones(2), restricting_point=-np.ones(2)))
+    assert (pareto_reflection.best_fits(points) == brute_force_best_fits(pareto_reflection, points)).all()
+
+
+class CountingShift(Shift):
+    def __init__(self):
+        self.number_calls = 0
+
+    def batch_call(self, x: np.ndarray) -> np.ndarray:
+        self.number_calls += 1
+        return super().batch_call(x)
+
+
+def test_sequence_best_fits_applies_each_reflection_once():
+    bbf = QuadraticBlackboxFunction()
+    shifts = [CountingShift(), CountingShift()]
+    sequence = RepeatingSequence(pareto_reflections=shifts)
+    for _ in range(6):
+        sequence.next(bbf)
+    assert isinstance(sequence, SequenceParetoReflections)
+
+    points = np.random.default_rng(0).uniform(size=(20, 2))
+    best_fits = sequence.best_fits(points)
+    assert (best_fits == brute_force_best_fits(shifts[0], points)).all()
+    assert [shift.number_calls for shift in shifts] == [1, 1]
+
+
+def test_compositions_of_same_reflections_are_equal():
+    shift, restrict = Shift(), RestrictByPoint(nadir=np.ones(2), restricting_point=np.zeros(2))
+    assert ComposeReflections(shift, restrict) == ComposeReflections(shift, restrict)
+    assert len({ComposeReflections(shift, restrict), ComposeReflections(shift, restrict)}) == 1
+    assert ComposeReflections(shift, restrict) != ComposeReflections(restrict, shift)
+
+
+class UnhashableShift(CountingShift):
+    # defining __eq__ without __hash__ makes instances unhashable
+    def __eq__(self, other) -> bool:
+        return self is other
+
+
+def test_sequence_best_fits_with_unhashable_reflections():
+    bbf = QuadraticBlackboxFunction()
+    shifts = [UnhashableShift(), CountingShift()]
+    sequence = RepeatingSequence(pareto_reflections=shifts)
+    for _ in range(4):
+        sequence.next(bbf)
+
+    points = np.random.default_rng(0).uniform(size=(20, 2))
+    assert (sequence.best_fits(points) == brute_force_best_fits(shifts[0], points)).all()
+    assert [shift.number_calls for shift in shifts] == [1, 1]
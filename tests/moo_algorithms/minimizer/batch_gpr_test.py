@@ -0,0 +1,51 @@
+import numpy as np
+
+from paref.moo_algorithms.minimizer.surrogates.batch_gpr import BatchGPR
+from paref.moo_algorithms.minimizer.surrogates.gpr import GPR
+
+
+def training_data():
+    rng = np.random.default_rng(0)
+    train_x = rng.random((20, 2))
+    train_y = np.stack((np.sum(train_x, axis=1), np.sum(train_x ** 2, axis=1), np.sin(3 * train_x[:, 0])), axis=1)
+    return train_x, train_y
+
+
+def test_batch_gpr_agrees_with_gpr():
+    train_x, train_y = training_data()
+    gpr, batch_gpr = GPR(training_iter=50), BatchGPR(training_iter=50)
+    gpr.train(train_x=train_x, train_y=train_y)
+    batch_gpr.train(train_x=train_x, train_y=train_y)
+
+    x = np.random.default_rng(1).random((5, 2))
+    mean, std = batch_gpr.predict(x)
+    assert mean.shape == (5, 3) and std.shape == (5, 3)
+    assert np.allclose(mean, gpr.predict(x, return_std=False), atol=1e-3)
+    assert np.allclose(std, gpr.std(x), atol=1e-3)
+    assert np.allclose(batch_gpr(x[0]), mean[0]) and np.allclose(batch_gpr.std(x[0]), std[0])
+
+    assert len(batch_gpr.info) == 3
+    assert np.allclose([hyperparameters['loss'] for hyperparameters in batch_gpr.info],
+                       [hyperparameters['loss'] for hyperparameters in gpr.info], atol=1e-3)
+    assert batch_gpr.model_convergence.shape == (3,)
+
+
+def test_warm_started_batch_gpr_stops_early():
+    train_x, train_y = training_data()
+    batch_gpr = BatchGPR(training_iter=2000, tolerance=1e-4)
+    batch_gpr.train(train_x=train_x[:19], train_y=train_y[:19])
+    number_iterations = len(batch_gpr.info[0]['loss'])
+    assert batch_gpr.converged and number_iterations < 2000
+
+    batch_gpr.train(train_x=train_x, train_y=train_y, warm_start=True)
+    assert len(batch_gpr.info[0]['loss']) < number_iterations
+    assert np.all(batch_gpr.model_convergence == 0)
+
+
+def test_lbfgs_training():
+    train_x, train_y = training_data()
+    batch_gpr = BatchGPR(training_iter=30, learning_rate=0.1, optimizer='lbfgs', tolerance=1e-6)
+    batch_gpr.train(train_x=train_x, train_y=train_y)
+
+    assert len(batch_gpr.info) == 3 and np.ndim(batch_gpr.info[0]['loss']) == 1
+    assert np.allclose(batch_gpr.predict(train_x, return_std=False), train_y, atol=0.05)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from paref.moo_algorithms.minimizer.surrogates.batch_gpr import BatchGPR
+from paref.moo_algorithms.minimizer.surrogates.cholesky_posterior import CholeskyPosterior
+from paref.moo_algorithms.minimizer.surrogates.gpr import GPR
+
+
+def test_block_updates_agree_with_refactorization():
+    rng = np.random.default_rng(0)
+    x, y = rng.random((30, 3)), rng.random(30)
+    posterior = CholeskyPosterior(lengthscale=0.3, outputscale=2., noise=1e-3, constant_mean=0.5)
+    posterior.fit(x[:10], y[:10])
+    posterior.add(x[10:11], y[10:11])
+    posterior.add(x[11:], y[11:])
+
+    reference = CholeskyPosterior(lengthscale=0.3, outputscale=2., noise=1e-3, constant_mean=0.5)
+    reference.fit(x, y)
+
+    x_test = rng.random((5, 3))
+    assert len(posterior) == 30
+    assert np.allclose(posterior.predict(x_test), reference.predict(x_test))
+    assert np.allclose(posterior._cholesky_factor, reference._cholesky_factor)
+
+
+def test_cached_posterior_agrees_with_gpytorch():
+    rng = np.random.default_rng(0)
+    train_x = rng.random((20, 2))
+    train_y = np.stack((np.sum(train_x, axis=1), np.sum(train_x ** 2, axis=1)), axis=1)
+    x = rng.random((5, 2))
+    for gpr_class in [GPR, BatchGPR]:
+        gpr, cached_gpr = gpr_class(training_iter=50), gpr_class(training_iter=50, cache_posterior=True)
+        gpr.train(train_x=train_x, train_y=train_y)
+        cached_gpr.train(train_x=train_x, train_y=train_y)
+        for prediction, cached_prediction in zip(gpr.predict(x), cached_gpr.predict(x)):
+            assert np.allclose(prediction, cached_prediction, atol=1e-3)
+
+
+def test_partial_fit_adds_evaluations():
+    rng = np.random.default_rng(0)
+    train_x = rng.random((25, 2))
+    train_y = np.sum(train_x, axis=1).reshape(-1, 1)
+    gpr = GPR(training_iter=50)
+    gpr.train(train_x=train_x[:20], train_y=train_y[:20])
+    gpr.partial_fit(train_x[20:], train_y[20:])
+
+    assert gpr.number_training_points == 25
+    # the new evaluations are (almost) interpolated
+    assert np.allclose(gpr(train_x[20:]), train_y[20:], atol=0.05)
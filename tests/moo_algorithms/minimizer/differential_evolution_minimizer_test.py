@@ -0,0 +1,126 @@
+import numpy as np
+
+from paref.interfaces.moo_algorithms.paref_moo import CompositionWithParetoReflection
+from paref.moo_algorithms.minimizer.differential_evolution_minimizer import DifferentialEvolutionMinimizer
+from paref.moo_algorithms.minimizer.gpr_minimizer import DifferentialEvolution
+from paref.moo_algorithms.minimizer.optimal_scaling import LinearScaling
+from paref.pareto_reflections.find_edge_points import FindEdgePoints
+from paref.pareto_reflections.minimize_weighted_norm_to_utopia import MinimizeWeightedNormToUtopia
+from tests.black_box_functions.evaluation_cache_test import CountingBlackboxFunction
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+
+
+def test_search_evaluations_are_kept_and_reused():
+    bbf = CountingBlackboxFunction()
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    moo = DifferentialEvolutionMinimizer(minimizer=DifferentialEvolution(popsize=5, seed=0, polish=False),
+                                         keep_search_evaluations=True)
+    moo.apply_moo_operation(CompositionWithParetoReflection(bbf, reflection))
+    number_evaluations = len(bbf.evaluations)
+
+    # each call of the blackbox function is stored and the evaluation at the minimizer is reused
+    assert bbf.number_calls == number_evaluations
+    tags = bbf.evaluations.tags
+    assert list(tags).count('proposal') == 1 and list(tags).count('search') == number_evaluations - 1
+    proposal = bbf.evaluations.indices_with_tag('proposal')[0]
+    np.testing.assert_allclose(bbf.y[proposal], [np.sum(bbf.x[proposal] ** 2), np.sum((bbf.x[proposal] - 1) ** 2)])
+
+    # the next search is seeded by the previous evaluations
+    moo.apply_moo_operation(CompositionWithParetoReflection(bbf, reflection))
+    assert len(bbf.evaluations.indices_with_tag('proposal')) == 2
+    assert np.sum(bbf.y[bbf.evaluations.indices_with_tag('proposal')[1]]) <= np.sum(bbf.y[proposal]) + 1e-12
+
+
+def test_search_evaluations_are_discarded_by_default():
+    bbf = CountingBlackboxFunction()
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    moo = DifferentialEvolutionMinimizer(minimizer=DifferentialEvolution(popsize=5, seed=0, polish=False))
+    moo.apply_moo_operation(CompositionWithParetoReflection(bbf, reflection))
+
+    assert len(bbf.evaluations) == 1
+    assert bbf.number_calls > 1
+    assert bbf.evaluations.tags[0] is None
+
+
+def test_proposals_are_stored_with_cache_enabled():
+    bbf = CountingBlackboxFunction()
+    bbf.perform_lhc(5)
+    bbf.enable_cache()
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    moo = DifferentialEvolutionMinimizer(minimizer=DifferentialEvolution(popsize=5, seed=0, polish=False))
+    moo.apply_moo_operation(CompositionWithParetoReflection(bbf, reflection))
+    number_calls = bbf.number_calls
+
+    # the proposal was evaluated during the search, i.e. it is stored with the cached value
+    assert len(bbf.evaluations) == 6
+    assert bbf.cache.hits >= 1
+    np.testing.assert_allclose(bbf.y[-1], [np.sum(bbf.x[-1] ** 2), np.sum((bbf.x[-1] - 1) ** 2)])
+
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.ones(2), potency=np.array([2]), scalar=np.ones(2))
+    moo.apply_moo_operation(CompositionWithParetoReflection(bbf, reflection))
+    assert len(bbf.evaluations) == 7
+    assert bbf.number_calls > number_calls
+
+
+def test_search_evaluations_of_workers_are_kept():
+    bbf = QuadraticBlackboxFunction()
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    moo = DifferentialEvolutionMinimizer(minimizer=DifferentialEvolution(popsize=5, seed=0, polish=False, workers=2),
+                                         keep_search_evaluations=True)
+    moo.apply_moo_operation(CompositionWithParetoReflection(bbf, reflection))
+
+    assert len(bbf.evaluations) > 10
+    assert list(bbf.evaluations.tags).count('proposal') == 1
+    np.testing.assert_allclose(bbf.y, np.stack((np.sum(bbf.x ** 2, axis=1), np.sum((bbf.x - 1) ** 2, axis=1)), 1))
+
+
+class ScalarBlackboxFunction(QuadraticBlackboxFunction):
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return np.array([np.sum((x - 0.5) ** 2)])
+
+    @property
+    def dimension_target_space(self) -> int:
+        return 1
+
+
+def test_blackbox_function_without_pareto_reflection_is_minimized():
+    bbf = ScalarBlackboxFunction()
+    moo = DifferentialEvolutionMinimizer(minimizer=DifferentialEvolution(popsize=5, seed=0))
+    moo.apply_moo_operation(bbf)
+
+    assert len(bbf.evaluations) == 1
+    np.testing.assert_allclose(bbf.x[0], [0.5, 0.5], atol=1e-3)
+
+
+def test_search_evaluations_are_not_journaled(tmp_path):
+    path = str(tmp_path / 'journal.bin')
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(5)
+    bbf.open_journal(path)
+    reflection = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    for keep_search_evaluations in (False, True):
+        moo = DifferentialEvolutionMinimizer(minimizer=DifferentialEvolution(popsize=5, seed=0, polish=False),
+                                             keep_search_evaluations=keep_search_evaluations)
+        moo.apply_moo_operation(CompositionWithParetoReflection(bbf, reflection))
+    bbf.close_journal()
+
+    # the journal records the initial evaluations and both proposals
+    journaled = np.flatnonzero(bbf.evaluations.tags != 'search')
+    assert len(journaled) == 7 and len(bbf.evaluations) > 7
+    resumed = QuadraticBlackboxFunction()
+    resumed.load(path)
+    np.testing.assert_array_equal(resumed.x, bbf.x[journaled])
+    np.testing.assert_array_equal(resumed.y, bbf.y[journaled])
+
+
+def test_optimal_scalings_are_set_on_the_minimized_reflection():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(5)
+    reflection = FindEdgePoints(dimension=0, blackbox_function=bbf)
+    moo = DifferentialEvolutionMinimizer(minimizer=DifferentialEvolution(popsize=5, seed=0, polish=False))
+    moo.apply_moo_operation(CompositionWithParetoReflection(bbf, reflection))
+
+    # the components of the quadratic blackbox function range from 0 to 2 over the unit cube
+    assert isinstance(reflection.scaling_x, LinearScaling)
+    np.testing.assert_allclose(reflection.scaling_x.minimum, [0, 0], atol=1e-3)
+    np.testing.assert_allclose(reflection.scaling_x.maximum, [2, 2], atol=1e-3)
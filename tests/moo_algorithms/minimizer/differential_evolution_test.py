@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from paref.moo_algorithms.minimizer.gpr_minimizer import DifferentialEvolution
+
+
+def sphere(x):
+    return np.sum((x - 0.25) ** 2)
+
+
+def test_vectorized_minimization():
+    calls = []
+
+    def function(x):
+        calls.append(x.shape)
+        return np.sum((x - 0.25) ** 2, axis=1)
+
+    minimizer = DifferentialEvolution()
+    res = minimizer(function=function, upper_bounds=np.ones(2), lower_bounds=np.zeros(2), max_iter=100,
+                    vectorized=True)
+
+    assert np.allclose(res, 0.25, atol=1e-3)
+    # the whole population is evaluated at once
+    assert all(len(shape) == 2 for shape in calls)
+    assert max(shape[0] for shape in calls) > 1
+
+
+def test_initial_population_is_seeded():
+    minimizer = DifferentialEvolution(polish=False, popsize=5, seed=0)
+    res = minimizer(function=sphere, upper_bounds=np.ones(2), lower_bounds=np.zeros(2), max_iter=1,
+                    init=np.array([[0.25, 0.25], [2., 2.]]))
+
+    assert np.allclose(res, 0.25)
+
+
+def test_parallel_minimization():
+    calls = []
+
+    def parallel_map(function, population):
+        calls.append(len(population))
+        return map(function, population)
+
+    minimizer = DifferentialEvolution(workers=parallel_map, seed=0)
+    res = minimizer(function=sphere, upper_bounds=np.ones(2), lower_bounds=np.zeros(2), max_iter=100)
+    assert np.allclose(res, 0.25, atol=1e-3)
+    # the whole population is passed to the map
+    assert max(calls) > 1
+
+    # the function must be picklable in order to be evaluated by several processes
+    with pytest.raises(ValueError):
+        DifferentialEvolution(workers=2)(function=lambda x: sphere(x), upper_bounds=np.ones(2),
+                                         lower_bounds=np.zeros(2))
@@ -0,0 +1,99 @@
+import gpytorch
+import numpy as np
+import pytest
+
+from paref.moo_algorithms.minimizer.surrogates.gpr import GPR
+from paref.moo_algorithms.minimizer.surrogates.prediction import fast_pred_var
+
+
+def trained_gpr():
+    rng = np.random.default_rng(0)
+    train_x = rng.random((20, 2))
+    train_y = np.stack((np.sum(train_x, axis=1), np.sum(train_x ** 2, axis=1)), axis=1)
+    gpr = GPR(training_iter=50)
+    gpr.train(train_x=train_x, train_y=train_y)
+    return gpr
+
+
+def test_batched_prediction_agrees_with_single_point_prediction():
+    gpr = trained_gpr()
+    x = np.random.default_rng(1).random((5, 2))
+    mean, std = gpr.predict(x)
+
+    assert mean.shape == (5, 2) and std.shape == (5, 2)
+    for i in range(5):
+        assert np.allclose(mean[i], gpr(x[i]), atol=1e-5)
+        assert np.allclose(std[i], gpr.std(x[i]), atol=1e-5)
+    assert np.allclose(gpr.predict(x, return_std=False), mean)
+
+
+def test_fast_predictive_variances_stay_enabled_while_any_prediction_is_running():
+    first, second = fast_pred_var(), fast_pred_var()
+    first.__enter__()
+    second.__enter__()
+    # overlapping predictions (e.g. on different threads) may finish in any order
+    first.__exit__(None, None, None)
+    assert gpytorch.settings.fast_pred_var.on()
+    second.__exit__(None, None, None)
+    assert gpytorch.settings.fast_pred_var.off()
+
+
+@pytest.mark.filterwarnings('error::UserWarning')
+def test_training_on_read_only_inputs():
+    rng = np.random.default_rng(0)
+    train_x = rng.random((20, 2))
+    train_x.flags.writeable = False
+    GPR(training_iter=5).train(train_x=train_x, train_y=np.sum(train_x, axis=1, keepdims=True))
+
+
+def test_warm_started_training_continues_from_trained_models():
+    rng = np.random.default_rng(0)
+    train_x = rng.random((21, 2))
+    train_y = np.stack((np.sum(train_x, axis=1), np.sum(train_x ** 2, axis=1)), axis=1)
+    gpr = GPR(training_iter=2000, tolerance=1e-4)
+    gpr.train(train_x=train_x[:20], train_y=train_y[:20])
+    models = gpr._models
+    number_iterations = [len(hyperparameters['loss']) for hyperparameters in gpr.info]
+    assert max(number_iterations) < 2000
+
+    gpr.train(train_x=train_x, train_y=train_y, warm_start=True)
+    assert gpr._models is models
+    assert np.all(np.array([len(hyperparameters['loss']) for hyperparameters in gpr.info]) < number_iterations)
+    assert np.all(gpr.model_convergence == 0)
+
+
+def test_training_stops_at_wall_time():
+    rng = np.random.default_rng(0)
+    train_x = rng.random((20, 2))
+    gpr = GPR(training_iter=100000, max_time=0.5)
+    gpr.train(train_x=train_x, train_y=np.sum(train_x, axis=1).reshape(-1, 1))
+    assert len(gpr.info[0]['loss']) < 100000
+
+
+def test_lbfgs_training():
+    gpr = GPR(training_iter=30, learning_rate=1, optimizer='lbfgs', tolerance=1e-6)
+    rng = np.random.default_rng(0)
+    train_x = rng.random((20, 2))
+    train_y = np.stack((np.sum(train_x, axis=1), np.sum(train_x ** 2, axis=1)), axis=1)
+    gpr.train(train_x=train_x, train_y=train_y)
+    assert np.all(gpr.model_convergence == 0)
+    assert np.allclose(gpr(train_x), train_y, atol=0.05)
+
+    with pytest.raises(ValueError, match=r'.*Optimizer must be either.*'):
+        GPR(optimizer='sgd').train(train_x=train_x, train_y=train_y)
+
+
+def test_sparse_backend():
+    rng = np.random.default_rng(0)
+    train_x = rng.random((300, 2))
+    train_y = np.stack((np.sum(train_x, axis=1), np.sum(train_x ** 2, axis=1)), axis=1)
+    gpr = GPR(training_iter=30, backend='sparse', number_inducing_points=32, batch_size=100)
+    gpr.train(train_x=train_x, train_y=train_y)
+
+    mean, std = gpr.predict(train_x[:10])
+    assert mean.shape == (10, 2) and std.shape == (10, 2)
+    assert np.allclose(mean, train_y[:10], atol=0.2)
+    assert len(gpr.info[0]['loss']) == 30
+
+    with pytest.raises(ValueError, match=r'.*Partial fitting requires the exact backend!.*'):
+        gpr.partial_fit(train_x[:1], train_y[:1])
@@ -0,0 +1,103 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+import torch
+
+from paref.moo_algorithms.minimizer.optimal_scaling import minimize_batch, OptimalScaling
+
+
+def test_batched_minimization_solves_all_problems():
+    function = lambda x: np.stack((np.sum((x - 0.3) ** 2, axis=1), -np.sum(x ** 2, axis=1)), axis=1)
+    x, minima = minimize_batch(function, 2, upper_bounds=np.ones(3), lower_bounds=-np.ones(3), seed=0)
+
+    assert np.allclose(x[0], 0.3, atol=1e-3) and np.isclose(minima[0], 0, atol=1e-5)
+    assert np.allclose(np.abs(x[1]), 1, atol=1e-3) and np.isclose(minima[1], -3, atol=1e-3)
+
+
+def test_optimal_scaling_maps_extrema_to_unit_interval():
+    fun = lambda x: x ** 2
+    for vectorized, g in ((True, lambda y: np.sum(y, axis=1)), (False, np.sum)):
+        scaling_x, scaling_g = OptimalScaling(vectorized=vectorized)(fun, g, upper_bounds=np.ones(2),
+                                                                     lower_bounds=-np.ones(2))
+        assert np.allclose(scaling_x(np.array([[0., 0.], [1., 1.]])), [[0., 0.], [1., 1.]], atol=1e-4)
+        assert np.allclose(scaling_g(np.array([0., 2.])), [0., 1.], atol=1e-4)
+
+
+def test_scalings_are_cached_by_surrogate_version_and_key():
+    calls = []
+
+    def fun(x):
+        calls.append(len(x))
+        return x ** 2
+
+    optimal_scaling = OptimalScaling(vectorized=True)
+    kwargs = dict(g=lambda y: np.sum(y, axis=1), upper_bounds=np.ones(2), lower_bounds=-np.ones(2))
+    scalings = optimal_scaling(fun, surrogate_version=0, key='reflection', **kwargs)
+    number_calls = len(calls)
+
+    assert optimal_scaling(fun, surrogate_version=0, key='reflection', **kwargs) is scalings
+    assert len(calls) == number_calls
+    assert optimal_scaling(fun, surrogate_version=0, key='other reflection', **kwargs) is not scalings
+    assert optimal_scaling(fun, surrogate_version=1, key='reflection', **kwargs) is not scalings
+
+
+def test_parallel_evaluation():
+    threads, torch_threads = [], set()
+
+    def fun(x):
+        threads.append(threading.get_ident())
+        torch_threads.add(torch.get_num_threads())
+        return x ** 2
+
+    number_threads = torch.get_num_threads()
+    optimal_scaling = OptimalScaling(vectorized=True, workers=3)
+    scaling_x, scaling_g = optimal_scaling(fun, lambda y: np.sum(y, axis=1), upper_bounds=np.ones(2),
+                                           lower_bounds=-np.ones(2))
+    # the function is evaluated on the calling thread before any evaluation is dispatched to the workers
+    assert threads[0] == threading.get_ident()
+    assert len(set(threads)) > 1 and torch.get_num_threads() == number_threads
+    # the number of threads of torch is limited while the workers evaluate the function
+    assert torch_threads == {max(1, (os.cpu_count() or 1) // 3)}
+    assert np.allclose(scaling_x.maximum, 1, atol=1e-4) and np.isclose(scaling_g.maximum, 2, atol=1e-4)
+
+
+def test_evaluated_points_seed_the_batched_minimization():
+    calls = []
+
+    def function(x):
+        calls.append(len(x))
+        return np.stack((np.sum((x - 0.3) ** 2, axis=1), -np.sum(x ** 2, axis=1)), axis=1)
+
+    points = np.array([[0.3, 0.3], [1., 1.], [0., 0.]])
+    x, minima = minimize_batch(function, 2, upper_bounds=np.ones(2), lower_bounds=-np.ones(2), max_iter=0,
+                               popsize=2, seed=0, init=(points, function(points)), polish=False)
+
+    # the best points of each problem are members of its initial population, the populations of all problems are
+    # evaluated at once
+    assert calls[1:] == [2 * 5]
+    assert np.allclose(x[0], 0.3) and np.isclose(minima[0], 0)
+    assert np.allclose(np.abs(x[1]), 1) and np.isclose(minima[1], -2)
+
+
+def test_generations_of_all_problems_are_evaluated_at_once():
+    calls = []
+
+    def function(x):
+        calls.append(len(x))
+        return np.concatenate((x, -x), axis=1)
+
+    x, minima = minimize_batch(function, 4, upper_bounds=np.ones(2), lower_bounds=-np.ones(2), max_iter=50,
+                               popsize=5, seed=0, polish=False)
+
+    assert calls[0] == 4 * 10 and len(calls) <= 50 + 1
+    assert np.allclose(minima, -1, atol=1e-3)
+
+
+def test_errors_of_the_batched_function_are_raised():
+    def function(x):
+        raise RuntimeError('evaluation failed')
+
+    with pytest.raises(RuntimeError):
+        minimize_batch(function, 2, upper_bounds=np.ones(2), lower_bounds=-np.ones(2), max_iter=5)
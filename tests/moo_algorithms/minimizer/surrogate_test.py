@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from paref.interfaces.moo_algorithms.paref_moo import CompositionWithParetoReflection
+from paref.moo_algorithms.minimizer.gpr_minimizer import GPRMinimizer
+from paref.moo_algorithms.minimizer.surrogates.batch_gpr import BatchGPR
+from paref.moo_algorithms.minimizer.surrogates.gpr import GPR
+from paref.pareto_reflections.minimize_weighted_norm_to_utopia import MinimizeWeightedNormToUtopia
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+from tests.pareto_reflections.batch_call_test import Shift
+
+
+def training_data(n=20):
+    rng = np.random.default_rng(0)
+    train_x = rng.random((n, 2))
+    train_y = np.stack((np.sum(train_x, axis=1), np.sum(train_x ** 2, axis=1)), axis=1)
+    return train_x, train_y
+
+
+@pytest.mark.parametrize('surrogate', [GPR(training_iter=50),
+                                       GPR(training_iter=5, backend='sparse', number_inducing_points=10),
+                                       BatchGPR(training_iter=50)])
+def test_saved_surrogate_predicts_as_before(surrogate, tmp_path):
+    train_x, train_y = training_data()
+    surrogate.fit(train_x, train_y)
+    path = str(tmp_path / 'surrogate.pth')
+    surrogate.save(path)
+
+    loaded = type(surrogate)()
+    loaded.load(path)
+    x = np.random.default_rng(1).random((5, 2))
+    assert loaded.number_training_points == 20
+    for prediction, loaded_prediction in zip(surrogate.predict(x), loaded.predict(x)):
+        assert np.allclose(prediction, loaded_prediction, atol=1e-5)
+
+
+def test_saved_partially_fitted_gpr_predicts_as_before(tmp_path):
+    train_x, train_y = training_data(25)
+    gpr = GPR(training_iter=50)
+    gpr.fit(train_x[:20], train_y[:20])
+    gpr.partial_fit(train_x[20:], train_y[20:])
+    path = str(tmp_path / 'gpr.pth')
+    gpr.save(path)
+
+    loaded = GPR()
+    loaded.load(path)
+    x = np.random.default_rng(1).random((5, 2))
+    assert loaded.number_training_points == 25
+    for prediction, loaded_prediction in zip(gpr.predict(x), loaded.predict(x)):
+        assert np.allclose(prediction, loaded_prediction)
+
+
+def test_minimizer_uses_surrogate_factory():
+    train_x, train_y = training_data(25)
+    surrogates = []
+
+    def factory():
+        surrogates.append(BatchGPR(training_iter=50))
+        return surrogates[-1]
+
+    minimizer = GPRMinimizer(surrogate_factory=factory, hyperparameter_update_interval=2)
+    surrogate = minimizer._train_gpr(train_x[:20], train_y[:20])
+    minimizer._gpr = surrogate
+    assert surrogates == [surrogate] and surrogate.number_training_points == 20
+
+    # between hyperparameter updates the new evaluations are added to the surrogate
+    assert minimizer._train_gpr(train_x, train_y) is surrogate
+    assert surrogate.number_training_points == 25 and len(surrogates) == 1
+
+
+def test_minimizer_passes_training_parameters_to_gpr():
+    minimizer = GPRMinimizer(training_iter=50, training_tolerance=1e-3, training_patience=3, max_training_time=5.,
+                             training_optimizer='lbfgs')
+    gpr = minimizer._new_surrogate('exact')
+    assert (gpr._tolerance, gpr._patience, gpr._max_time, gpr._optimizer) == (1e-3, 3, 5., 'lbfgs')
+
+    train_x, train_y = training_data()
+    minimizer._train_gpr(train_x, train_y)
+
+
+def test_minimized_function_applies_each_pareto_reflection_once():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(20)
+    inner = Shift()
+    outer = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    composition = CompositionWithParetoReflection(CompositionWithParetoReflection(bbf, inner), outer)
+    minimized = []
+
+    def minimizer(function, **kwargs):
+        minimized.append(function)
+        return np.zeros(2)
+
+    gpr_minimizer = GPRMinimizer(vectorized=True, surrogate_factory=lambda: BatchGPR(training_iter=50))
+    gpr_minimizer._minimizer = minimizer
+    gpr_minimizer.apply_moo_operation(composition)
+
+    x = np.random.default_rng(1).random((5, 2))
+    prediction = gpr_minimizer._gpr.predict(x, return_std=False)
+    np.testing.assert_allclose(np.ravel(minimized[0](x)), outer.batch_call(inner.batch_call(prediction)).ravel())
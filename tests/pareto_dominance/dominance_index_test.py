@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from paref.pareto_dominance.dominance_index import DominanceIndex
+
+
+def brute_force_query(points, x):
+    return np.array([any(np.all(point <= query) for point in points) for query in x], dtype=bool)
+
+
+@pytest.mark.parametrize('dimension', [1, 2, 3, 5])
+def test_agrees_with_brute_force(dimension):
+    rng = np.random.default_rng(dimension)
+    # integer valued points ensure ties and duplicates
+    points = rng.integers(0, 8, size=(200, dimension)).astype(float)
+    x = rng.integers(0, 8, size=(300, dimension)).astype(float)
+    index = DominanceIndex(points, block_size=4)
+
+    assert (index.query(x) == brute_force_query(points, x)).all()
+    assert len(index) <= len(np.unique(points, axis=0))
+
+
+def test_example_case():
+    index = DominanceIndex(np.array([[1, 2], [2, 1], [2, 2]]))
+    assert (index.query(np.array([[1, 1], [2, 1], [3, 3]])) == np.array([False, True, True])).all()
+    # dominated points are discarded
+    assert (index.points == np.array([[1, 2], [2, 1]])).all()
+
+
+def test_empty_index_and_queries():
+    assert not DominanceIndex(np.empty((0, 3))).query(np.zeros((4, 3))).any()
+    assert len(DominanceIndex(np.ones((5, 2))).query(np.empty((0, 2)))) == 0
+
+
+def test_raise_value_error_with_wrong_query_shape():
+    with pytest.raises(ValueError, match=r'.*must be stored in 2-dimensional array with 2 columns!.*'):
+        DominanceIndex(np.ones((5, 2))).query(np.ones(2))
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from paref.pareto_dominance.non_dominated_sorting import non_dominated_indices, non_dominated_points, dominated_mask
+
+
+def brute_force_non_dominated_indices(points):
+    indices = []
+    for i, point in enumerate(points):
+        if not any(np.all(other <= point) and np.any(other < point) for other in points):
+            indices.append(i)
+    return np.array(indices, dtype=int)
+
+
+@pytest.mark.parametrize('dimension', [1, 2, 3, 5])
+def test_agrees_with_brute_force(dimension):
+    rng = np.random.default_rng(dimension)
+    # integer valued points ensure ties and duplicates
+    points = rng.integers(0, 6, size=(300, dimension)).astype(float)
+    assert (non_dominated_indices(points, block_size=16) == brute_force_non_dominated_indices(points)).all()
+
+
+def test_example_case():
+    points = np.array([[1, 2], [2, 1], [2, 2], [1, 2]])
+    assert (non_dominated_indices(points) == np.array([0, 1, 3])).all()
+    assert (non_dominated_points(points) == np.array([[1, 2], [2, 1], [1, 2]])).all()
+
+
+def test_scalar_and_empty_points():
+    assert (non_dominated_indices(np.array([3., 1., 2., 1.])) == np.array([1, 3])).all()
+    assert len(non_dominated_indices(np.empty((0, 3)))) == 0
+
+
+def test_dominated_mask():
+    mask = dominated_mask(np.array([[1, 1], [2, 2], [0, 3]]), np.array([[1, 1], [0, 2]]))
+    assert (mask == np.array([False, True, True])).all()
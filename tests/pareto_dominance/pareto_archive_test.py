@@ -0,0 +1,37 @@
+import numpy as np
+
+from paref.blackbox_functions.evaluation_store import EvaluationStore
+from paref.pareto_dominance.non_dominated_sorting import non_dominated_indices
+from paref.pareto_dominance.pareto_archive import ParetoArchive
+
+
+def test_incremental_archive_agrees_with_non_dominated_sorting():
+    rng = np.random.default_rng(0)
+    points = rng.integers(0, 8, size=(200, 3)).astype(float)
+    archive = ParetoArchive()
+    for i, point in enumerate(points):
+        archive.add(i, point)
+        assert (archive.indices == non_dominated_indices(points[:i + 1])).all()
+
+
+def test_extend_archive():
+    rng = np.random.default_rng(1)
+    points = rng.random((100, 2))
+    archive = ParetoArchive()
+    archive.extend(np.arange(50), points[:50])
+    archive.extend(np.arange(50, 100), points[50:])
+    assert (archive.indices == non_dominated_indices(points)).all()
+    assert (archive.points == points[archive.indices]).all()
+
+
+def test_store_keeps_archive_up_to_date():
+    rng = np.random.default_rng(2)
+    y = rng.random((60, 2))
+    store = EvaluationStore()
+    for i in range(40):
+        store.append(np.zeros(1), y[i])
+    store.extend(np.zeros((20, 1)), y[40:])
+    assert (store.pareto_front_indices == non_dominated_indices(y)).all()
+
+    store.truncate(10)
+    assert (store.pareto_front_indices == non_dominated_indices(y[:10])).all()
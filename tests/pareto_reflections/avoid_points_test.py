@@ -49,3 +49,26 @@ def test_raise_value_error_with_differing_input_shapes():
         pareto_reflection = AvoidPoints(nadir=nadir, epsilon_avoiding_points=epsilon_avoiding_points, epsilon=epsilon)
         case = np.array([[3, 7], [3, 7]])
         pareto_reflection(case)
+
+
+@pytest.mark.parametrize('dimension', [2, 4])
+def test_batch_call_agrees_with_brute_force_for_many_avoided_points(dimension):
+    rng = np.random.default_rng(dimension)
+    epsilon_avoiding_points, epsilon = rng.uniform(0, 1, size=(500, dimension)), 0.05
+    nadir = 2 * np.ones(dimension)
+    pareto_reflection = AvoidPoints(nadir=nadir, epsilon_avoiding_points=epsilon_avoiding_points, epsilon=epsilon)
+    x = rng.uniform(0, 1, size=(200, dimension))
+
+    avoided = np.array([any(np.all(point - epsilon <= case) for point in epsilon_avoiding_points) for case in x])
+    assert (pareto_reflection.batch_call(x) == np.where(avoided[:, np.newaxis], nadir, x)).all()
+    assert (pareto_reflection(x[0]) == (nadir if avoided[0] else x[0])).all()
+
+
+def test_index_is_rebuilt_if_avoided_points_change():
+    pareto_reflection = AvoidPoints(nadir=np.array([3, 7]), epsilon_avoiding_points=np.array([[2, 1]]), epsilon=1)
+    assert (pareto_reflection(np.ones(2)) == np.array([3, 7])).all()
+
+    pareto_reflection.epsilon_avoiding_points = np.array([[5, 5]])
+    assert (pareto_reflection(np.ones(2)) == np.ones(2)).all()
+    pareto_reflection.epsilon = 4
+    assert (pareto_reflection(np.ones(2)) == np.array([3, 7])).all()
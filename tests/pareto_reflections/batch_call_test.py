@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
+from paref.moo_algorithms.minimizer.optimal_scaling import LinearScaling
+from paref.pareto_reflections.avoid_points import AvoidPoints
+from paref.pareto_reflections.fill_gap import FillGap
+from paref.pareto_reflections.find_1_pareto_points import Find1ParetoPoints
+from paref.pareto_reflections.find_edge_points import FindEdgePoints
+from paref.pareto_reflections.find_maximal_pareto_point import FindMaximalParetoPoint
+from paref.pareto_reflections.minimize_weighted_norm_to_utopia import MinimizeWeightedNormToUtopia
+from paref.pareto_reflections.operations.compose_reflections import ComposeReflections
+from paref.pareto_reflections.restrict_by_point import RestrictByPoint
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+
+
+class Shift(ParetoReflection):
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return x - 1
+
+    @property
+    def dimension_codomain(self) -> int:
+        return 2
+
+    @property
+    def dimension_domain(self) -> int:
+        return 2
+
+
+def scaled(pareto_reflection, scaling_g, scaling_x):
+    pareto_reflection.scaling_g, pareto_reflection.scaling_x = scaling_g, scaling_x
+    return pareto_reflection
+
+
+def pareto_reflections():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(10)
+    return [
+        Shift(),
+        RestrictByPoint(nadir=np.array([3, 7]), restricting_point=np.array([1, 1])),
+        AvoidPoints(nadir=np.array([3, 7]), epsilon_avoiding_points=np.array([[1, 1], [0.5, 1.5]]), epsilon=0.2),
+        AvoidPoints(nadir=np.array([3, 7]), epsilon_avoiding_points=np.array([1, 0.5]), epsilon=0.2),
+        MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([3]), scalar=np.array([1, 2])),
+        Find1ParetoPoints(dimension=1, blackbox_function=bbf),
+        FindEdgePoints(dimension=0, blackbox_function=bbf),
+        FillGap(blackbox_function=bbf, gap_points=np.array([[0, 1], [1, 0]])),
+        FindMaximalParetoPoint(blackbox_function=bbf),
+        ComposeReflections(Shift(), RestrictByPoint(nadir=np.array([3, 7]), restricting_point=np.zeros(2))),
+        scaled(FindEdgePoints(dimension=1, blackbox_function=bbf),
+               scaling_g=LinearScaling(minimum=-1, maximum=3),
+               scaling_x=LinearScaling(minimum=np.zeros(2), maximum=np.array([1, 2]))),
+        # scalings which do not broadcast over several inputs
+        scaled(FindEdgePoints(dimension=0, blackbox_function=bbf),
+               scaling_g=lambda g: float(g) ** 2,
+               scaling_x=lambda x: x / np.linalg.norm(x)),
+    ]
+
+
+@pytest.mark.parametrize('pareto_reflection', pareto_reflections())
+def test_batch_call_agrees_with_call(pareto_reflection):
+    points = np.random.default_rng(0).uniform(-1, 2, size=(50, 2))
+    expected = np.array([pareto_reflection(point) for point in points]).reshape(len(points), -1)
+
+    values = pareto_reflection.batch_call(points)
+    assert len(values) == len(points)
+    assert np.allclose(values.reshape(len(points), -1), expected)
+
+
+def test_batch_call_raises_with_1_dimensional_input():
+    pareto_reflection = RestrictByPoint(nadir=np.array([3, 7]), restricting_point=np.array([1, 1]))
+    with pytest.raises(ValueError, match=r'.*Shapes don\'t match!.*'):
+        pareto_reflection.batch_call(np.ones(2))
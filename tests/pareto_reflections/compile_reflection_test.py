@@ -0,0 +1,70 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from paref.pareto_reflections.avoid_points import AvoidPoints
+from paref.pareto_reflections.find_edge_points import FindEdgePoints
+from paref.pareto_reflections.minimize_weighted_norm_to_utopia import MinimizeWeightedNormToUtopia
+from paref.pareto_reflections.operations.compile_reflection import CompiledReflection, compile_reflection, \
+    flatten_reflection
+from paref.pareto_reflections.operations.compose_reflections import ComposeReflections
+from paref.pareto_reflections.restrict_by_point import RestrictByPoint
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+from tests.pareto_reflections.batch_call_test import Shift
+
+
+def compositions():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(10)
+    restrict = RestrictByPoint(nadir=np.array([3, 7]), restricting_point=np.array([1, 1]))
+    avoid = AvoidPoints(nadir=np.array([2, 0.5]), epsilon_avoiding_points=np.array([[1, 1], [0.5, 1.5]]), epsilon=0.6)
+    avoid_scalar = AvoidPoints(nadir=np.array([0, 0]), epsilon_avoiding_points=np.array([1, 0.5]), epsilon=0.2)
+    norm = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([3]), scalar=np.array([1, 2]))
+    return [
+        restrict,
+        ComposeReflections(restrict, FindEdgePoints(dimension=0, blackbox_function=bbf)),
+        ComposeReflections(ComposeReflections(Shift(), avoid), ComposeReflections(restrict, avoid_scalar)),
+        ComposeReflections(ComposeReflections(avoid, restrict), ComposeReflections(Shift(), norm)),
+        ComposeReflections(avoid_scalar, ComposeReflections(avoid, ComposeReflections(restrict, norm))),
+    ]
+
+
+@pytest.mark.parametrize('pareto_reflection', compositions())
+def test_compiled_reflection_agrees_with_reflection(pareto_reflection):
+    points = np.random.default_rng(0).uniform(-1, 2, size=(200, 2))
+    compiled = compile_reflection(pareto_reflection)
+
+    np.testing.assert_allclose(compiled.batch_call(points), pareto_reflection.batch_call(points))
+    # the scratch buffers are reused and reallocated if the number of inputs changes
+    np.testing.assert_allclose(compiled.batch_call(points[:7]), pareto_reflection.batch_call(points[:7]))
+    np.testing.assert_allclose(compiled(points[0]), pareto_reflection(points[0]))
+    assert compiled.dimension_domain == pareto_reflection.dimension_domain
+    assert compiled.dimension_codomain == pareto_reflection.dimension_codomain
+
+
+def test_compositions_are_flattened_and_masks_fused():
+    restrict = RestrictByPoint(nadir=np.array([3, 7]), restricting_point=np.array([1, 1]))
+    avoid = AvoidPoints(nadir=np.array([3, 7]), epsilon_avoiding_points=np.array([[1, 1]]), epsilon=0.2)
+    norm = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(2), potency=np.array([2]), scalar=np.ones(2))
+    pareto_reflection = ComposeReflections(ComposeReflections(restrict, avoid), norm)
+    compiled = compile_reflection(pareto_reflection)
+
+    assert flatten_reflection(pareto_reflection) == [restrict, avoid, norm]
+    assert compiled.stages == (restrict, avoid, norm)
+    assert len(compiled._kernels) == 2
+    assert compile_reflection(compiled) is compiled
+    assert compiled == pareto_reflection and hash(compiled) == hash(pareto_reflection)
+    assert pareto_reflection.dimension_domain == 2 and pareto_reflection.dimension_codomain == 1
+
+
+def test_compiled_reflection_can_be_pickled():
+    compiled = CompiledReflection(compositions()[2])
+    points = np.random.default_rng(1).uniform(-1, 2, size=(20, 2))
+    np.testing.assert_allclose(pickle.loads(pickle.dumps(compiled)).batch_call(points), compiled.batch_call(points))
+
+
+def test_compiled_reflection_raises_with_wrong_dimension():
+    compiled = compile_reflection(compositions()[0])
+    with pytest.raises(ValueError, match=r'.*must be of dimension 2!.*'):
+        compiled.batch_call(np.ones(2))
@@ -0,0 +1,43 @@
+import numpy as np
+
+from paref.interfaces.moo_algorithms.paref_moo import CompositionWithParetoReflection
+from paref.interfaces.pareto_reflections.pareto_reflection import ParetoReflection
+from paref.pareto_reflections.minimize_weighted_norm_to_utopia import MinimizeWeightedNormToUtopia
+from paref.pareto_reflections.operations.compose_reflections import ComposeReflections
+from tests.black_box_functions.evaluation_store_test import QuadraticBlackboxFunction
+
+
+class Extend(ParetoReflection):
+    # maps R^2 to R^3
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return np.append(x, x[0] + x[1])
+
+    @property
+    def dimension_codomain(self) -> int:
+        return 3
+
+    @property
+    def dimension_domain(self) -> int:
+        return 2
+
+
+def test_dimensions_of_composition_of_reflections_with_different_dimensions():
+    norm = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(3), potency=np.array([2]), scalar=np.ones(3))
+    pareto_reflection = ComposeReflections(Extend(), norm)
+
+    # the domain is the domain of the reflection applied first, the codomain the codomain of the one applied second
+    assert pareto_reflection.dimension_domain == 2
+    assert pareto_reflection.dimension_codomain == 1
+    np.testing.assert_allclose(pareto_reflection(np.array([1, 2])), norm(np.array([1, 2, 3])))
+
+
+def test_composition_with_reflections_with_different_dimensions():
+    bbf = QuadraticBlackboxFunction()
+    bbf.perform_lhc(5)
+    norm = MinimizeWeightedNormToUtopia(utopia_point=np.zeros(3), potency=np.array([2]), scalar=np.ones(3))
+    composition = CompositionWithParetoReflection(CompositionWithParetoReflection(bbf, Extend()), norm)
+
+    assert composition.dimension_target_space == 1
+    assert composition.pareto_reflection.dimension_domain == 2
+    assert composition.pareto_reflection.dimension_codomain == 1
+    np.testing.assert_allclose(composition.y.reshape(-1), [norm(Extend()(y)) for y in bbf.y])